@@ -0,0 +1,90 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from block_markdown import markdown_to_html
+
+
+# Documents sent to a worker at a time; large enough to amortise pickling
+DEFAULT_CHUNK_SIZE = 512
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _dedupe(chunk: list[str]) -> tuple[list[str], list[int]]:
+    """Split chunk into its distinct documents and, per input, an index into them."""
+    positions = {}
+    unique = []
+    indexes = []
+    for markdown in chunk:
+        index = positions.get(markdown)
+        if index is None:
+            index = positions[markdown] = len(unique)
+            unique.append(markdown)
+        indexes.append(index)
+    return unique, indexes
+
+
+def render_chunk(markdowns: list[str]) -> list[str]:
+    """Render a list of documents to HTML (the unit of work sent to pool workers)."""
+    return [markdown_to_html(markdown) for markdown in markdowns]
+
+
+def _collect(future, indexes: list[int] | None) -> list[str]:
+    rendered = future.result()
+    if indexes is None:
+        return rendered
+    return [rendered[index] for index in indexes]
+
+
+def render_many(markdowns, workers: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE, dedupe: bool = True):
+    """
+    Render many markdown documents to HTML, yielding results in input order.
+
+    Input is consumed lazily in chunks, so arbitrarily long streams run in
+    bounded memory. Each result equals markdown_to_html_node(md).to_html().
+
+    Args:
+        markdowns: Iterable of markdown strings
+        workers: Number of worker processes; 0 renders in this process
+        chunk_size: Documents per chunk (the unit of dedupe and of pool work)
+        dedupe: Render identical documents within a chunk only once
+
+    Yields:
+        One HTML string per input document
+
+    Raises:
+        ValueError: If a document has no blocks
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    chunks = _chunks(markdowns, chunk_size)
+
+    if workers <= 0:
+        for chunk in chunks:
+            if dedupe:
+                unique, indexes = _dedupe(chunk)
+                rendered = render_chunk(unique)
+                yield from [rendered[index] for index in indexes]
+            else:
+                yield from render_chunk(chunk)
+        return
+
+    # Keep a bounded window of chunks in flight so input is read lazily
+    # and results come back in order
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            unique, indexes = _dedupe(chunk) if dedupe else (chunk, None)
+            pending.append((pool.submit(render_chunk, unique), indexes))
+            if len(pending) >= workers * 2:
+                yield from _collect(*pending.popleft())
+        while pending:
+            yield from _collect(*pending.popleft())
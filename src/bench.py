@@ -0,0 +1,383 @@
+import argparse
+import contextlib
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from batch_render import render_many
+from block_markdown import BlockType, block_to_block_type, markdown_to_blocks, markdown_to_html_node, parse_blocks
+from htmlnode import escape_attribute, escape_text
+from inline_markdown import text_to_textnodes
+from main import main
+from search_index import SearchIndex, page_terms, text_runs
+from site_builder import copy_directory_contents
+
+
+WORDS = (
+    "ring hobbit shire elf dwarf wizard mountain river forest road journey shadow light "
+    "tower king sword song fellowship valley bridge gate star fire stone ship harbour "
+    "the of and a to in is was that with for on as by at from"
+).split()
+
+# Relative weight of each block kind in generated pages
+DEFAULT_MIX = {
+    "heading": 2,
+    "paragraph": 6,
+    "list": 2,
+    "ordered": 1,
+    "quote": 1,
+    "code": 1,
+    # Lists with sub-lists and fenced code, and quotes holding lists; off by default
+    # so corpora stay comparable with older results (e.g. --mix nested=2)
+    "nested": 0,
+}
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8" />
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+
+CSS = "body {\n  margin: 0 auto;\n  max-width: 800px;\n}\n\nh1, h2 {\n  color: #dda15e;\n}\n" * 20
+
+IMAGE_COUNT = 8
+
+
+class CorpusGenerator:
+    """
+    Generates a deterministic synthetic site (content/, static/ and a
+    template) for benchmarking. The same seed and options always produce
+    byte-identical files.
+    """
+
+    def __init__(self, pages: int = 200, seed: int = 0, depth: int = 2, blocks_per_page: int = 30,
+                 mix: dict[str, int] = None, link_rate: float = 0.3, image_rate: float = 0.1):
+        self.pages = pages
+        self.seed = seed
+        self.depth = depth
+        self.blocks_per_page = blocks_per_page
+        self.mix = mix or DEFAULT_MIX
+        self.link_rate = link_rate
+        self.image_rate = image_rate
+
+    def _words(self, rng: random.Random, low: int, high: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+    def _inline(self, rng: random.Random, page_urls: list[str]) -> str:
+        parts = [self._words(rng, 4, 10)]
+        if rng.random() < 0.4:
+            parts.append(f"**{self._words(rng, 1, 3)}**")
+        if rng.random() < 0.3:
+            parts.append(f"_{self._words(rng, 1, 3)}_")
+        if rng.random() < 0.2:
+            parts.append(f"`{rng.choice(WORDS)}()`")
+        if rng.random() < self.link_rate:
+            parts.append(f"[{self._words(rng, 1, 4)}]({rng.choice(page_urls)})")
+        if rng.random() < self.image_rate:
+            parts.append(f"![{self._words(rng, 1, 3)}](/images/img{rng.randrange(IMAGE_COUNT)}.png)")
+        parts.append(self._words(rng, 2, 8) + ".")
+        return " ".join(parts)
+
+    def _block(self, kind: str, rng: random.Random, page_urls: list[str]) -> str:
+        if kind == "heading":
+            return "#" * rng.randint(2, 4) + " " + self._words(rng, 2, 6)
+        if kind == "list":
+            return "\n".join("- " + self._inline(rng, page_urls) for _ in range(rng.randint(2, 6)))
+        if kind == "ordered":
+            return "\n".join(f"{i}. " + self._inline(rng, page_urls) for i in range(1, rng.randint(3, 7)))
+        if kind == "quote":
+            return "\n".join("> " + self._inline(rng, page_urls) for _ in range(rng.randint(1, 4)))
+        if kind == "nested":
+            lines = []
+            for _ in range(rng.randint(2, 4)):
+                lines.append("- " + self._inline(rng, page_urls))
+                lines.extend("  - " + self._inline(rng, page_urls) for _ in range(rng.randint(0, 3)))
+            lines += ["", "  ```", f"  {rng.choice(WORDS)} = {rng.randint(0, 999)}", "", "  ```"]
+            lines += ["", "> " + self._inline(rng, page_urls), ">"]
+            lines.extend("> 1. " + self._inline(rng, page_urls) for _ in range(rng.randint(1, 3)))
+            return "\n".join(lines)
+        if kind == "code":
+            lines = [f"    {rng.choice(WORDS)} = {rng.randint(0, 999)}" for _ in range(rng.randint(2, 8))]
+            return "```\n" + "\n".join(lines) + "\n```"
+        return "\n".join(self._inline(rng, page_urls) for _ in range(rng.randint(1, 3)))
+
+    def page_paths(self) -> list[str]:
+        """Relative paths of every generated page, e.g. s1/s0/p12/index.md."""
+        paths = []
+        for i in range(self.pages):
+            dirs = [f"s{(i // (4 ** level)) % 4}" for level in range(self.depth, 0, -1)]
+            paths.append("/".join(dirs + [f"p{i}", "index.md"]))
+        return paths
+
+    def page_markdown(self, index: int, page_urls: list[str]) -> str:
+        rng = random.Random(f"{self.seed}:{index}")
+        kinds = list(self.mix)
+        weights = [self.mix[kind] for kind in kinds]
+        blocks = [f"# Page {index} {self._words(rng, 1, 4)}"]
+        for kind in rng.choices(kinds, weights, k=self.blocks_per_page):
+            blocks.append(self._block(kind, rng, page_urls))
+        return "\n\n".join(blocks) + "\n"
+
+    def write(self, root: str) -> Path:
+        """Write the corpus under root and return root as a Path."""
+        root_path = Path(root)
+        content = root_path / "content"
+        static = root_path / "static"
+        (static / "images").mkdir(parents=True, exist_ok=True)
+
+        paths = self.page_paths()
+        page_urls = ["/" + path.rsplit("/", 1)[0] for path in paths]
+        for i, rel in enumerate(paths):
+            page = content / rel
+            page.parent.mkdir(parents=True, exist_ok=True)
+            page.write_text(self.page_markdown(i, page_urls), encoding='utf-8')
+        # The site root needs an index page too
+        (content / "index.md").write_text(self.page_markdown(self.pages, page_urls), encoding='utf-8')
+
+        (root_path / "template.html").write_text(TEMPLATE, encoding='utf-8')
+        (static / "index.css").write_text(CSS, encoding='utf-8')
+        for i in range(IMAGE_COUNT):
+            header = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR"
+            header += struct.pack(">II", 640 + i, 480 + i) + b"\x08\x06\x00\x00\x00"
+            (static / "images" / f"img{i}.png").write_bytes(header + bytes(range(256)) * 4)
+        return root_path
+
+
+def snippets(count: int, seed: int = 0) -> list[str]:
+    """
+    One-line markdown snippets like comments or descriptions. About a fifth
+    are short stock replies, so batches contain realistic duplicates.
+    """
+    rng = random.Random(f"snippets:{seed}")
+    stock = ["+1", "Thanks!", "**LGTM**", "Same here.", "_Fixed_ in the next release."]
+    result = []
+    for i in range(count):
+        roll = rng.random()
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12)))
+        if roll < 0.2:
+            result.append(rng.choice(stock))
+        elif roll < 0.35:
+            result.append(f"**{words}** see [this](/p{i % 50})")
+        elif roll < 0.45:
+            result.append(f"`{rng.choice(WORDS)}()` {words}")
+        else:
+            result.append(words)
+    return result
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    rank = max(1, min(len(ordered), math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def run_benchmark(func, warmup: int = 1, repeats: int = 5) -> dict:
+    """
+    Time func() after warmup calls and summarise the repeats.
+
+    Returns:
+        Dict of seconds: median, p95, min, mean, plus the raw samples
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 95),
+        "min": min(samples),
+        "mean": statistics.fmean(samples),
+        "samples": samples,
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the build's per-file progress output while timing."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def build_suite(root: Path, snippet_count: int = 100_000) -> dict:
+    """
+    Prepare inputs from a generated corpus and return name -> callable.
+
+    Inputs are parsed up front so each benchmark times only its own stage.
+    """
+    comments = snippets(snippet_count)
+    sources = [path.read_text(encoding='utf-8') for path in sorted((root / "content").rglob("*.md"))]
+    blocks = [block for source in sources for block in markdown_to_blocks(source)]
+    paragraphs = [block for block in blocks if block_to_block_type(block) == BlockType.PARAGRAPH]
+    trees = [markdown_to_html_node(source) for source in sources]
+    # Every text and attribute value to_html escapes, to set against the to_html time
+    nodes = [node for tree in trees for node in tree.iter_nodes()]
+    texts = [node.value for node in nodes if node.value]
+    attributes = [value for node in nodes if node.props for value in node.props.values()]
+    copy_dest = root / "bench-copy"
+    search_dest = root / "bench-search"
+    search_terms = [page_terms(text_runs(tree)) for tree in trees]
+
+    def search_index_build():
+        index = SearchIndex()
+        for number, tree in enumerate(trees):
+            index.update(str(number), f"/p{number}", "Page", page_terms(text_runs(tree)))
+        index.write(str(search_dest))
+
+    incremental = SearchIndex()
+    for number, terms in enumerate(search_terms):
+        incremental.update(str(number), f"/p{number}", "Page", terms)
+    incremental.write(str(search_dest))
+
+    # One page alternates between two versions, so every run re-indexes it
+    versions = itertools.cycle([search_terms[-1], search_terms[0]])
+
+    def search_index_update():
+        incremental.update("0", "/p0", "Page", next(versions))
+        incremental.write(str(search_dest))
+
+    def copy_static():
+        with quiet():
+            copy_directory_contents(str(root / "static"), str(copy_dest))
+
+    def full_build():
+        with quiet():
+            main([], project_root=root)
+
+    return {
+        "text_to_textnodes": lambda: [text_to_textnodes(paragraph) for paragraph in paragraphs],
+        "block_to_block_type": lambda: [block_to_block_type(block) for block in blocks],
+        # Block structure only: the old split-and-classify pass against the line parser
+        "block_split": lambda: [
+            [block_to_block_type(block) for block in markdown_to_blocks(source)] for source in sources
+        ],
+        "block_parse": lambda: [parse_blocks(source) for source in sources],
+        "markdown_to_html_node": lambda: [markdown_to_html_node(source) for source in sources],
+        "to_html": lambda: [tree.to_html() for tree in trees],
+        "html_escape": lambda: ([escape_text(text) for text in texts], [escape_attribute(value) for value in attributes]),
+        "copy_directory_contents": copy_static,
+        "main_build": full_build,
+        "snippets_one_by_one": lambda: [markdown_to_html_node(comment).to_html() for comment in comments],
+        "snippets_render_many": lambda: list(render_many(comments)),
+        "search_index_build": search_index_build,
+        "search_index_update": search_index_update,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compare medians against a saved baseline.
+
+    Returns:
+        Human-readable lines for every benchmark slower than the baseline by
+        more than threshold (a fraction, e.g. 0.10 for 10%)
+    """
+    regressions = []
+    for name, stats in results["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or base["median"] <= 0:
+            continue
+        change = stats["median"] / base["median"] - 1
+        if change > threshold:
+            regressions.append(
+                f"{name}: median {stats['median'] * 1000:.2f} ms vs baseline "
+                f"{base['median'] * 1000:.2f} ms (+{change * 100:.1f}%)"
+            )
+    return regressions
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Parse "heading=2,paragraph=6" into a block-kind weight dict."""
+    mix = {}
+    for item in value.split(","):
+        kind, _, weight = item.partition("=")
+        if kind not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown block kind: {kind}")
+        mix[kind] = int(weight)
+    return mix
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the site generator on a synthetic corpus.")
+    parser.add_argument("--pages", type=int, default=200, help="number of generated pages (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed (default: 0)")
+    parser.add_argument("--depth", type=int, default=2, help="directory nesting depth (default: 2)")
+    parser.add_argument("--blocks", type=int, default=30, help="blocks per page (default: 30)")
+    parser.add_argument("--mix", type=parse_mix, help="block weights, e.g. heading=2,paragraph=6,list=2,ordered=1,quote=1,code=1")
+    parser.add_argument("--snippets", type=int, default=100_000, help="one-line snippets for the batch benchmarks (default: 100000)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed warmup runs (default: 1)")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs (default: 5)")
+    parser.add_argument("--only", help="comma-separated benchmark names to run")
+    parser.add_argument("--output", metavar="JSON", help="write results to this file")
+    parser.add_argument("--baseline", metavar="JSON", help="compare against saved results")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regression threshold as a fraction (default: 0.10)")
+    parser.add_argument("--keep", metavar="DIR", help="generate the corpus in DIR and keep it")
+    return parser.parse_args(argv)
+
+
+def run(args: argparse.Namespace) -> int:
+    generator = CorpusGenerator(args.pages, args.seed, args.depth, args.blocks, args.mix)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = generator.write(args.keep or tmp)
+        suite = build_suite(root, args.snippets)
+        names = args.only.split(",") if args.only else list(suite)
+
+        results = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "pages": args.pages,
+                "seed": args.seed,
+                "depth": args.depth,
+                "blocks": args.blocks,
+                "snippets": args.snippets,
+                "mix": generator.mix,
+                "warmup": args.warmup,
+                "repeats": args.repeats,
+            },
+            "results": {},
+        }
+        print(f"{'benchmark':<26} {'median ms':>10} {'p95 ms':>10} {'min ms':>10}")
+        for name in names:
+            stats = run_benchmark(suite[name], args.warmup, args.repeats)
+            results["results"][name] = stats
+            print(f"{name:<26} {stats['median'] * 1000:>10.2f} {stats['p95'] * 1000:>10.2f} {stats['min'] * 1000:>10.2f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold * 100:.0f}% against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(parse_args()))
@@ -1,7 +1,16 @@
 from enum import Enum
 from htmlnode import ParentNode, LeafNode
 from textnode import text_node_to_html_node, TextNode, TextType
-from inline_markdown import text_to_textnodes
+from inline_markdown import normalize_label, resolve_reference_links, text_to_textnodes
+from syntax import BlockSyntax
+from tracing import span
+import re
+import metrics
+import syntax
+
+
+# [label]: url "optional title", on a line of its own
+DEFINITION_PATTERN = re.compile(r" {0,3}\[([^\[\]]+)\]:[ \t]*<?([^\s<>()]+)>?(?:[ \t]+(?:\"[^\"]*\"|'[^']*'|\([^()]*\)))?[ \t]*")
 
 
 class BlockType(Enum):
@@ -110,199 +119,640 @@ def block_to_block_type(block):
     return BlockType.PARAGRAPH
 
 
-def text_to_children(text):
+def extract_title(markdown: str) -> str:
+    """
+    Extract the h1 header from markdown text.
+    
+    Args:
+        markdown: The markdown content to search through
+        
+    Returns:
+        The text content of the h1 header (without the # and whitespace)
+        
+    Raises:
+        ValueError: If no h1 header is found
+    """
+    lines = markdown.split('\n')
+    for line in lines:
+        stripped_line = line.strip()
+        if stripped_line.startswith('# '):
+            # Remove "# " and any additional whitespace
+            title = stripped_line[2:].strip()
+            if title:  # Ensure title is not empty
+                return title
+    
+    raise ValueError("No h1 header found in markdown content")
+
+
+def text_to_children(text, definitions=None):
     """
     Convert text with inline markdown to a list of HTMLNode children.
     
     Args:
         text: Text string that may contain inline markdown
+        definitions: Optional reference link definitions from extract_link_definitions
     
     Returns:
         List of HTMLNode objects representing the inline markdown
     """
-    text_nodes = text_to_textnodes(text)
+    return text_nodes_to_children(text_to_text_nodes(text, definitions))
+
+
+def text_to_text_nodes(text, definitions=None):
+    """Inline-parse text into TextNodes, resolving reference links from definitions."""
+    with span("inline parse"):
+        text_nodes = text_to_textnodes(text)
+        if definitions:
+            text_nodes = resolve_reference_links(text_nodes, definitions)
+    return text_nodes
+
+
+def text_nodes_to_children(text_nodes):
+    """HTMLNode children for a list of TextNodes."""
     children = []
     for text_node in text_nodes:
+        metrics.inc("static_site_textnodes_total", text_node.text_type.value)
         children.append(text_node_to_html_node(text_node))
     return children
 
 
-def heading_to_html_node(block):
+# List item marker after its indentation: "- " or "1. " (up to 9 digits), then the item's text
+LIST_ITEM_PATTERN = re.compile(r"(-|(\d{1,9})\.)( +)(?=\S)")
+
+# ATX heading after its indentation: 1 to 6 "#", a space, then the heading's text
+HEADING_PATTERN = re.compile(r"(#{1,6}) +(\S.*)")
+
+_SPACES = re.compile(" *")
+
+# Kinds of Block that are not output blocks of their own
+DOCUMENT = "document"
+LIST_ITEM = "list_item"
+
+# Enum attribute lookups are slow, and the parser makes several per line
+_PARAGRAPH = BlockType.PARAGRAPH
+_HEADING = BlockType.HEADING
+_CODE = BlockType.CODE
+_QUOTE = BlockType.QUOTE
+_UNORDERED_LIST = BlockType.UNORDERED_LIST
+_ORDERED_LIST = BlockType.ORDERED_LIST
+_LISTS = (_UNORDERED_LIST, _ORDERED_LIST)
+
+
+def _indent(line, pos):
+    # Spaces at pos
+    if line[pos:pos + 1] != " ":
+        return 0
+    return _SPACES.match(line, pos).end() - pos
+
+
+def _expand_indent(line):
+    # Leading tabs count as 4 columns, as list item indentation is measured in columns
+    text = line.lstrip(" \t")
+    return line[:len(line) - len(text)].expandtabs(4) + text
+
+
+class Block:
     """
-    Convert a heading block to an HTMLNode.
+    One node of the block tree BlockParser builds.
     
-    Args:
-        block: Heading block text (e.g., "# Heading" or "## Heading")
-    
-    Returns:
-        ParentNode with h1-h6 tag containing inline markdown children
+    kind is a BlockType, DOCUMENT, LIST_ITEM or a registered BlockSyntax.
+    Containers (the document, quotes, lists, list items and container
+    syntaxes) have children; headings, paragraphs, code blocks and leaf
+    syntaxes have lines of text.
     """
-    # Count leading # characters to determine heading level
-    hash_count = 0
-    for char in block:
-        if char == "#":
-            hash_count += 1
-        else:
-            break
-    
-    # Extract heading text (skip # characters and space)
-    heading_text = block[hash_count + 1:].strip()
-    
-    # Create heading node with inline markdown children
-    children = text_to_children(heading_text)
-    return ParentNode(f"h{hash_count}", children)
 
+    # Heading level
+    level = 0
+    # Columns of a list item's marker and the spaces after it
+    width = 0
+    # Opening fence of a code block, and the indentation stripped from its lines
+    fence = ""
+    indent = 0
+    # Whether a list has blank lines between its items or inside them
+    loose = False
+    # Whether a blank line was seen since the container's last line
+    blank = False
+    # TextNodes of a paragraph or heading, when parsed ahead by parse_inline()
+    text_nodes = None
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.children = []
+        self.lines = []
+
+
+class QuoteSyntax(BlockSyntax):
+    """> quoted blocks"""
+
+    triggers = ">"
+    container = True
+
+    def start(self, parser, line, pos, indent):
+        parser.open(Block(_QUOTE))
+        pos += 1
+        if line.startswith(" ", pos):
+            pos += 1
+        return pos
+
+
+class ListItemSyntax(BlockSyntax):
+    """- and 1. list items, opening their list if they don't continue one"""
+
+    triggers = "-0123456789"
+    container = True
+
+    def start(self, parser, line, pos, indent):
+        match = LIST_ITEM_PATTERN.match(line, pos)
+        if match is None:
+            return None
+        marker, number, spaces = match.groups()
+        kind = _UNORDERED_LIST if number is None else _ORDERED_LIST
+        container = parser._stack[parser._matched - 1].kind
+        if container is not kind:
+            if number is not None and int(number) != 1:
+                return None
+            if container is _UNORDERED_LIST or container is _ORDERED_LIST:
+                # A different marker ends the list
+                parser._matched -= 1
+            parser.open(Block(kind))
+        item = Block(LIST_ITEM)
+        width = len(marker) + (len(spaces) if len(spaces) <= 4 else 1)
+        item.width = indent + width
+        parser.open(item)
+        pos += width
+        if not parser._start_pattern.match(line, pos):
+            # The usual item: text right after the marker
+            paragraph = Block(_PARAGRAPH)
+            paragraph.lines.append(line[pos:].strip())
+            parser.open(paragraph)
+            return len(line)
+        return pos
+
+
+class HeadingSyntax(BlockSyntax):
+    """# ATX headings"""
+
+    triggers = "#"
+
+    def start(self, parser, line, pos, indent):
+        match = HEADING_PATTERN.match(line, pos)
+        if match is None:
+            return None
+        heading = Block(_HEADING)
+        heading.level = len(match.group(1))
+        heading.lines.append(match.group(2).strip())
+        parser.open(heading)
+        # Nothing else goes on a heading's line
+        return len(line)
+
+
+class FenceSyntax(BlockSyntax):
+    """``` fenced code; a whole ```code``` block on one line is closed at once"""
+
+    triggers = "`"
+
+    def start(self, parser, line, pos, indent):
+        if not line.startswith("```", pos):
+            return None
+        text = line[pos:].rstrip()
+        length = len(text) - len(text.lstrip("`"))
+        info = text[length:]
+        code = Block(_CODE)
+        if "`" in info:
+            if len(text) < 6 or not text.endswith("```"):
+                return None
+            code.lines.append(text[3:-3])
+            parser.open(code)
+            parser._stack.pop()
+            return len(line)
+        code.fence = text[:length]
+        code.indent = indent
+        parser.open(code)
+        return len(line)
+
+
+syntax.register_block(QuoteSyntax())
+syntax.register_block(ListItemSyntax())
+syntax.register_block(HeadingSyntax())
+syntax.register_block(FenceSyntax())
+
+
+class BlockParser:
+    """
+    Builds the block structure of a document one line at a time.
+    
+    Open blocks are kept on a stack, from the document down to the block
+    the last line went into. Each line is matched once against the open
+    containers (a quote's ">", a list item's indentation), may then open
+    new blocks, and its remaining text continues the open paragraph or
+    code block or starts a new paragraph. Nothing is re-split or
+    re-scanned, so parsing is linear in the length of the document, and
+    lists, quotes and fenced code nest to any depth. Fenced code keeps
+    its blank lines, and a blank line between list items makes the list
+    loose, as in CommonMark.
+    
+    New blocks are found through the registered block syntaxes, by the
+    first character after a line's indentation: a line that starts with
+    none of their trigger characters is paragraph text, without trying
+    any of them.
+    
+    Unlike CommonMark, list items need text after their marker, ordered
+    lists start at 1, and there are no indented code blocks: indentation
+    only nests blocks inside list items.
+    """
+
+    def __init__(self):
+        self.document = Block(DOCUMENT)
+        self._stack = [self.document]
+        self._after_blank = False
+        # Open blocks the current line continued, the document included
+        self._matched = 1
+        self._starters, self._start_pattern = syntax.block_table()
+
+    @property
+    def open_blocks(self):
+        """Number of blocks still open below the document; 0 between top-level blocks."""
+        return len(self._stack) - 1
+
+    def feed(self, line):
+        """
+        Parse one line (without its newline).
+        
+        Args:
+            line: Next line of the document
+        """
+        self.feed_lines((line,))
+
+    def feed_lines(self, lines):
+        """
+        Parse lines (without their newlines) one after the other.
+        
+        Args:
+            lines: Iterable of the document's next lines
+        """
+        stack = self._stack
+        starters = self._starters
+        start_pattern = self._start_pattern
+        for line in lines:
+            if "\t" in line and not (len(stack) == 2 and stack[1].kind is _CODE):
+                line = _expand_indent(line)
+            if len(stack) == 1 or len(stack) == 2 and (stack[1].kind is _PARAGRAPH or stack[1].kind is _QUOTE):
+                # Fast paths for the top level, where most lines of most documents are
+                if not line or line.isspace():
+                    del stack[1:]
+                    continue
+                if not start_pattern.match(line):
+                    if len(stack) == 2 and stack[1].kind is _PARAGRAPH:
+                        stack[1].lines.append(line.strip())
+                    else:
+                        paragraph = Block(_PARAGRAPH)
+                        paragraph.lines.append(line.strip())
+                        self._open(1, paragraph)
+                    continue
+
+            # Match the line against the open containers
+            pos = 0
+            matched = 1
+            while matched < len(stack):
+                block = stack[matched]
+                kind = block.kind
+                if kind is LIST_ITEM:
+                    indent = _indent(line, pos)
+                    start = pos + indent
+                    if start == len(line) or line[start].isspace() and line[start:].isspace():
+                        # Blank lines stay in an item, unless it has nothing in it yet
+                        if not block.children:
+                            break
+                    elif indent >= block.width:
+                        pos += block.width
+                    else:
+                        break
+                elif kind is _QUOTE:
+                    indent = _indent(line, pos)
+                    if indent < 4 and line.startswith(">", pos + indent):
+                        pos += indent + 1
+                        if line.startswith(" ", pos):
+                            pos += 1
+                    else:
+                        break
+                elif kind is _CODE or kind is _PARAGRAPH:
+                    break
+                elif kind is not _UNORDERED_LIST and kind is not _ORDERED_LIST:
+                    # A registered syntax; leaves are continued below, like code
+                    if not kind.container:
+                        break
+                    end = kind.continue_line(block, line, pos)
+                    if end is None:
+                        break
+                    pos = end
+                # A list is continued by its items, so stays matched only if one matches or starts
+                matched += 1
+            if matched == len(stack) - 1:
+                tip = stack[-1]
+                if tip.kind is _CODE:
+                    self._code_line(tip, line[pos:])
+                    continue
+                if isinstance(tip.kind, BlockSyntax) and not tip.kind.container:
+                    end = tip.kind.continue_line(tip, line, pos)
+                    if end is not None:
+                        tip.lines.append(line[end:])
+                        continue
+
+            # Open new blocks
+            started = False
+            self._matched = matched
+            while start_pattern.match(line, pos):
+                indent = _indent(line, pos)
+                start = pos + indent
+                if indent >= 4 or start >= len(line):
+                    break
+                for candidate in starters.get(line[start], ()):
+                    end = candidate.start(self, line, start, indent)
+                    if end is not None:
+                        break
+                else:
+                    break
+                pos = end
+                started = True
+                kind = stack[-1].kind
+                if isinstance(kind, BlockSyntax) and not kind.container:
+                    # A registered leaf keeps the rest of its first line
+                    if pos < len(line):
+                        stack[-1].lines.append(line[pos:])
+                    pos = len(line)
+                if pos >= len(line):
+                    break
+            matched = self._matched
+
+            text = line[pos:]
+            if not started:
+                if not text or text.isspace():
+                    # A blank line ends paragraphs and the containers it didn't continue
+                    if stack[matched - 1].kind in _LISTS:
+                        matched -= 1
+                    del stack[matched:]
+                    for block in stack:
+                        block.blank = True
+                    self._after_blank = True
+                    continue
+                if stack[-1].kind is _PARAGRAPH:
+                    # Paragraph continuation, also lazily past unmatched containers
+                    stack[-1].lines.append(text.strip())
+                    continue
+            if text and not text.isspace():
+                paragraph = Block(_PARAGRAPH)
+                paragraph.lines.append(text.strip())
+                self._open(matched, paragraph)
+            elif self._after_blank:
+                self._clear_blank()
+
+    def open(self, block):
+        """
+        Add a block that the current line starts, for BlockSyntax.start().
+        
+        The open blocks the line didn't continue are closed, and block goes
+        into the deepest one left. It then stays open, for the next lines
+        to continue, unless it's a heading.
+        
+        Args:
+            block: The new Block
+        """
+        self._matched = self._open(self._matched, block)
+
+    def _open(self, matched, block):
+        # Close the blocks the line didn't continue and add block to the deepest one left
+        stack = self._stack
+        del stack[matched:]
+        parent = stack[-1]
+        if parent.kind in _LISTS and block.kind is not LIST_ITEM:
+            stack.pop()
+            parent = stack[-1]
+        if self._after_blank:
+            if parent.blank and parent.children:
+                if parent.kind is LIST_ITEM:
+                    stack[-2].loose = True
+                elif parent.kind in _LISTS:
+                    parent.loose = True
+            self._clear_blank()
+        parent.children.append(block)
+        if block.kind is not _HEADING:
+            stack.append(block)
+        return len(stack)
+
+    def _clear_blank(self):
+        for block in self._stack:
+            block.blank = False
+        self._after_blank = False
+
+    def _code_line(self, block, text):
+        stripped = text.lstrip(" ")
+        if len(text) - len(stripped) < 4 and stripped.startswith(block.fence) and not stripped.rstrip().strip("`"):
+            self._stack.pop()
+            return
+        strip = min(block.indent, len(text) - len(stripped))
+        block.lines.append(text[strip:])
 
-def paragraph_to_html_node(block):
+    def close(self):
+        """
+        Finish the document, closing any blocks still open (an unclosed fence runs to the end).
+        
+        Returns:
+            The document Block
+        """
+        del self._stack[1:]
+        return self.document
+
+
+def parse_blocks(markdown):
     """
-    Convert a paragraph block to an HTMLNode.
+    Parse the block structure of a markdown document.
     
     Args:
-        block: Paragraph block text
+        markdown: Raw markdown string representing a full document
     
     Returns:
-        ParentNode with p tag containing inline markdown children
+        The document Block
     """
-    # Replace newlines with spaces for paragraphs
-    paragraph_text = block.replace("\n", " ")
-    children = text_to_children(paragraph_text)
-    return ParentNode("p", children)
+    parser = BlockParser()
+    parser.feed_lines(markdown.split("\n"))
+    return parser.close()
 
 
-def code_to_html_node(block):
+def extract_link_definitions(document):
     """
-    Convert a code block to an HTMLNode.
-    Code blocks don't parse inline markdown.
+    Collect reference link definitions from a parsed document, removing them from it.
+    
+    A definition ("[label]: url", optionally followed by a quoted title,
+    which is ignored) is a paragraph line of its own, at any depth, so
+    lines of code blocks are never taken for one. Paragraphs left without
+    lines are dropped. The first definition of a label wins.
     
     Args:
-        block: Code block text (with ``` delimiters)
+        document: The document Block from parse_blocks
     
     Returns:
-        ParentNode with pre tag containing code LeafNode
+        Normalized label -> URL
     """
-    # Remove the opening and closing ```
-    # Find the first newline after opening ```
-    start_idx = block.find("\n")
-    if start_idx == -1:
-        # Single line code block
-        code_text = block[3:-3]  # Remove ``` from start and end
-    else:
-        # Multi-line code block
-        code_text = block[start_idx + 1:-3]  # Remove opening ``` and newline, closing ```
-    
-    # Create code node without inline markdown parsing
-    code_node = LeafNode("code", code_text)
-    return ParentNode("pre", [code_node])
-
-
-def quote_to_html_node(block):
+    definitions = {}
+    _collect_definitions(document, definitions)
+    return definitions
+
+
+def _collect_definitions(block, definitions):
+    children = []
+    for child in block.children:
+        if child.kind is _PARAGRAPH:
+            if any("]:" in line for line in child.lines):
+                lines = []
+                for line in child.lines:
+                    match = DEFINITION_PATTERN.fullmatch(line) if "]:" in line else None
+                    if match:
+                        definitions.setdefault(normalize_label(match.group(1)), match.group(2))
+                    else:
+                        lines.append(line)
+                if not lines:
+                    continue
+                child.lines = lines
+        elif child.children:
+            _collect_definitions(child, definitions)
+        children.append(child)
+    block.children = children
+
+
+def _inline(block, definitions):
+    if block.text_nodes is not None:
+        return text_nodes_to_children(block.text_nodes)
+    return text_to_children(" ".join(block.lines), definitions)
+
+
+def parse_inline(block, definitions=None):
     """
-    Convert a quote block to an HTMLNode.
+    Inline-parse every paragraph and heading in a block tree ahead of
+    block_to_html_node, which then only builds HTMLNodes from the
+    TextNodes. A build doesn't need this; it lets the two steps be
+    measured apart.
     
     Args:
-        block: Quote block text (each line starts with >)
-    
-    Returns:
-        ParentNode with blockquote tag containing inline markdown children
+        block: A Block from parse_blocks, e.g. the document
+        definitions: Optional reference link definitions from extract_link_definitions
     """
-    lines = block.split("\n")
-    # Remove > from start of each line and join with spaces (like paragraphs)
-    quote_lines = []
-    for line in lines:
-        if line.startswith(">"):
-            quote_lines.append(line[1:].strip())
-        else:
-            quote_lines.append(line.strip())
-    
-    quote_text = " ".join(quote_lines)
-    children = text_to_children(quote_text)
-    return ParentNode("blockquote", children)
+    for child in block.children:
+        if child.kind is _PARAGRAPH or child.kind is _HEADING:
+            child.text_nodes = text_to_text_nodes(" ".join(child.lines), definitions)
+        elif child.children:
+            parse_inline(child, definitions)
 
 
-def unordered_list_to_html_node(block):
+def block_to_html_node(block, toc=None, definitions=None):
     """
-    Convert an unordered list block to an HTMLNode.
+    Convert a parsed Block and everything in it to an HTMLNode.
     
     Args:
-        block: Unordered list block text (each line starts with - )
+        block: A Block from parse_blocks (not the document itself)
+        toc: Optional TableOfContents that collects the headings (and gives them ids)
+        definitions: Optional reference link definitions from extract_link_definitions
     
     Returns:
-        ParentNode with ul tag containing li children
+        ParentNode for the block
     """
-    lines = block.split("\n")
-    list_items = []
-    
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith("- "):
-            # Remove "- " prefix and create list item
-            item_text = stripped[2:]
-            item_children = text_to_children(item_text)
-            list_items.append(ParentNode("li", item_children))
-    
-    return ParentNode("ul", list_items)
+    kind = block.kind
+    if isinstance(kind, BlockSyntax):
+        metrics.inc("static_site_blocks_total", kind.name)
+        children = [block_to_html_node(child, toc, definitions) for child in block.children] if kind.container else None
+        return kind.to_html_node(block, children)
+    metrics.inc("static_site_blocks_total", kind.value)
+    if kind is _PARAGRAPH:
+        return ParentNode("p", _inline(block, definitions))
+    if kind is _HEADING:
+        children = _inline(block, definitions)
+        if toc is not None:
+            return ParentNode(f"h{block.level}", children, {"id": toc.add(block.level, children)})
+        return ParentNode(f"h{block.level}", children)
+    if kind is _CODE:
+        # Code blocks don't parse inline markdown; a fenced block's lines each end with a newline
+        code = "".join([line + "\n" for line in block.lines]) if block.fence else block.lines[0]
+        return ParentNode("pre", [LeafNode("code", code)])
+    if kind is _QUOTE:
+        if len(block.children) == 1 and block.children[0].kind is _PARAGRAPH:
+            # A quote of one paragraph holds its text directly
+            return ParentNode("blockquote", _inline(block.children[0], definitions))
+        children = [block_to_html_node(child, toc, definitions) for child in block.children]
+        return ParentNode("blockquote", children or [LeafNode(None, "")])
+    items = []
+    for item in block.children:
+        children = []
+        for child in item.children:
+            if child.kind is _PARAGRAPH and not block.loose:
+                # Tight list items hold their text directly
+                children.extend(_inline(child, definitions))
+            else:
+                children.append(block_to_html_node(child, toc, definitions))
+        # An item can be left empty by its link definitions
+        items.append(ParentNode("li", children or [LeafNode(None, "")]))
+    return ParentNode("ul" if kind is _UNORDERED_LIST else "ol", items)
 
 
-def ordered_list_to_html_node(block):
+def markdown_to_block_nodes(markdown, toc=None, definitions=None):
     """
-    Convert an ordered list block to an HTMLNode.
+    Convert a full markdown document into one HTMLNode per top-level block.
     
     Args:
-        block: Ordered list block text (each line starts with number. )
+        markdown: Raw markdown string representing a full document
+        toc: Optional TableOfContents that collects the headings (and gives them ids)
+        definitions: Optional reference link definitions from elsewhere, e.g.
+            earlier blocks of a streamed document; the document's own are
+            added to this dict, without replacing any
     
     Returns:
-        ParentNode with ol tag containing li children
+        List of block-level HTMLNodes in document order
     """
-    lines = block.split("\n")
-    list_items = []
-    
-    for line in lines:
-        stripped = line.strip()
-        if stripped and stripped[0].isdigit():
-            # Find the dot and space after the number
-            i = 0
-            while i < len(stripped) and stripped[i].isdigit():
-                i += 1
-            if i < len(stripped) and stripped[i] == ".":
-                # Remove number. prefix and create list item
-                item_text = stripped[i + 1:].strip()
-                item_children = text_to_children(item_text)
-                list_items.append(ParentNode("li", item_children))
-    
-    return ParentNode("ol", list_items)
+    with span("block parse"):
+        document = parse_blocks(markdown)
+        # Documents without definitions pay for one substring search
+        if "]:" in markdown:
+            found = extract_link_definitions(document)
+            if definitions is None:
+                definitions = found
+            else:
+                for label, url in found.items():
+                    definitions.setdefault(label, url)
+    return [block_to_html_node(block, toc, definitions) for block in document.children]
 
 
-def markdown_to_html_node(markdown):
+def markdown_to_html_node(markdown, toc=None):
     """
     Convert a full markdown document into a single parent HTMLNode.
     
     Args:
         markdown: Raw markdown string representing a full document
+        toc: Optional TableOfContents that collects the headings (and gives them ids)
     
     Returns:
         ParentNode (div) containing all block nodes as children
     """
-    # Split markdown into blocks
-    blocks = markdown_to_blocks(markdown)
+    # Wrap all blocks in a div
+    return ParentNode("div", markdown_to_block_nodes(markdown, toc))
+
+
+def markdown_to_html(markdown, toc=None):
+    """
+    Convert a full markdown document straight to an HTML string.
     
-    # Convert each block to HTMLNode
-    block_nodes = []
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        
-        if block_type == BlockType.HEADING:
-            block_nodes.append(heading_to_html_node(block))
-        elif block_type == BlockType.CODE:
-            block_nodes.append(code_to_html_node(block))
-        elif block_type == BlockType.QUOTE:
-            block_nodes.append(quote_to_html_node(block))
-        elif block_type == BlockType.UNORDERED_LIST:
-            block_nodes.append(unordered_list_to_html_node(block))
-        elif block_type == BlockType.ORDERED_LIST:
-            block_nodes.append(ordered_list_to_html_node(block))
-        else:  # PARAGRAPH
-            block_nodes.append(paragraph_to_html_node(block))
+    Equivalent to markdown_to_html_node(markdown).to_html() without building
+    the wrapping div node.
     
-    # Wrap all blocks in a div
-    return ParentNode("div", block_nodes)
+    Args:
+        markdown: Raw markdown string representing a full document
+        toc: Optional TableOfContents that collects the headings (and gives them ids)
+    
+    Returns:
+        HTML string wrapped in a div
+    
+    Raises:
+        ValueError: If the document has no blocks
+    """
+    block_nodes = markdown_to_block_nodes(markdown, toc)
+    if not block_nodes:
+        raise ValueError("ParentNode must have one or more children")
+    return "<div>" + "".join([node.to_html() for node in block_nodes]) + "</div>"
 
@@ -0,0 +1,70 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import metrics
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Compute the hex SHA-256 digest used as a cache key for file contents.
+
+    Args:
+        data: Raw bytes to hash
+
+    Returns:
+        Hex digest string
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class ContentCache:
+    """
+    A content-addressed blob cache stored on disk.
+
+    Entries live under <root>/<namespace>/<key[:2]>/<key> so that the build can
+    skip expensive work (compression, minification, ...) for inputs it has
+    already seen. Writes are atomic, so the cache is safe to share between
+    worker threads and processes.
+    """
+
+    def __init__(self, root: str, namespace: str):
+        self.path = Path(root) / namespace
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / key[:2] / key
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Return the cached bytes for key, or None if the entry is missing.
+        """
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            metrics.inc("static_site_cache_requests_total", (self.namespace, "miss"))
+            return None
+        self.hits += 1
+        metrics.inc("static_site_cache_requests_total", (self.namespace, "hit"))
+        return data
+
+    def put(self, key: str, data: bytes):
+        """
+        Store data under key, replacing any existing entry atomically.
+        """
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=entry.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, entry)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
@@ -0,0 +1,63 @@
+import json
+import os
+from pathlib import Path
+
+from fingerprint import HashIndex
+
+
+# Dotfiles are never served, so the manifest can live next to the site it describes
+MANIFEST_NAME = ".build-manifest.json"
+
+# Hex digest characters used in ETags
+ETAG_LENGTH = 20
+
+
+def build_manifest(output_dir: str, cache_dir: str = None, pages: dict = None) -> dict:
+    """
+    Describe every file in the generated site.
+
+    Args:
+        output_dir: Directory containing the generated site
+        cache_dir: Optional directory for the incremental hash index, so
+            files whose size and mtime are unchanged are not rehashed
+        pages: Optional page metadata index to store alongside the files,
+            {content_path: {"mtime_ns", "size", "meta"}}
+
+    Returns:
+        Manifest dict: {"files": {rel_path: {"etag", "size", "mtime"}}, "pages": {...}}
+    """
+    output_path = Path(output_dir)
+    index = HashIndex(os.path.join(cache_dir, "output-hashes.json") if cache_dir else None)
+    files = {}
+    for path in sorted(output_path.rglob("*")):
+        if not path.is_file() or path.name == MANIFEST_NAME:
+            continue
+        rel = path.relative_to(output_path).as_posix()
+        stat = path.stat()
+        digest = index.hash_file(path, rel)
+        files[rel] = {
+            "etag": f'"{digest[:ETAG_LENGTH]}"',
+            "size": stat.st_size,
+            "mtime": int(stat.st_mtime),
+        }
+    index.save()
+    return {"version": 1, "files": files, "pages": pages or {}}
+
+
+def write_build_manifest(output_dir: str, cache_dir: str = None, log=None, pages: dict = None) -> dict:
+    """Build the manifest and write it to <output_dir>/.build-manifest.json."""
+    manifest = build_manifest(output_dir, cache_dir, pages)
+    with open(Path(output_dir) / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    if log is not None:
+        log(f"Wrote build manifest for {len(manifest['files'])} files")
+    return manifest
+
+
+def load_build_manifest(output_dir: str) -> dict:
+    """Load the manifest written by write_build_manifest, or an empty one."""
+    try:
+        with open(Path(output_dir) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"version": 1, "files": {}, "pages": {}}
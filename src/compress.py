@@ -0,0 +1,150 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from build_cache import ContentCache, content_hash
+from tracing import span
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; only .gz siblings are produced without it
+    brotli = None
+
+
+# Text outputs worth precompressing; images are already compressed
+COMPRESSIBLE_SUFFIXES = {".html", ".css", ".js", ".json", ".xml", ".svg", ".txt"}
+
+# Files smaller than this gain nothing from compression once headers are counted
+MIN_COMPRESS_SIZE = 512
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    """
+    Compress data with gzip at maximum level.
+
+    The gzip header mtime is pinned to 0 so identical input always produces
+    identical output.
+    """
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def brotli_bytes(data: bytes) -> bytes:
+    """
+    Compress data with brotli at maximum quality.
+
+    Raises:
+        RuntimeError: If the brotli module is not installed
+    """
+    if brotli is None:
+        raise RuntimeError("brotli module is not installed")
+    return brotli.compress(data, quality=11)
+
+
+def available_encodings() -> list[tuple[str, callable]]:
+    """
+    Return (suffix, compressor) pairs for every encoding usable in this environment.
+    """
+    encodings = [(".gz", gzip_bytes)]
+    if brotli is not None:
+        encodings.append((".br", brotli_bytes))
+    return encodings
+
+
+def compress_file(path: Path, cache: ContentCache = None, min_size: int = MIN_COMPRESS_SIZE) -> dict:
+    """
+    Write precompressed siblings (e.g. index.html.gz) next to a single file.
+
+    Compressed output is looked up in the cache by content hash first, so
+    unchanged files are never recompressed. A sibling is only written when it
+    is actually smaller than the original.
+
+    Args:
+        path: File to compress
+        cache: Optional ContentCache holding previously compressed blobs
+        min_size: Files smaller than this many bytes are skipped
+
+    Returns:
+        Dict with "written" (list of sibling paths), "skipped" (bool) and
+        "cache_hits" (int)
+    """
+    with span("compress", path=str(path)):
+        return _compress_file(path, cache, min_size)
+
+
+def _compress_file(path: Path, cache: ContentCache, min_size: int) -> dict:
+    result = {"written": [], "skipped": False, "cache_hits": 0}
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if len(data) < min_size:
+        result["skipped"] = True
+        return result
+
+    digest = content_hash(data)
+    for suffix, compressor in available_encodings():
+        key = digest + suffix
+        compressed = cache.get(key) if cache is not None else None
+        if compressed is None:
+            compressed = compressor(data)
+            if cache is not None:
+                cache.put(key, compressed)
+        else:
+            result["cache_hits"] += 1
+
+        if len(compressed) >= len(data):
+            continue
+
+        sibling = path.with_name(path.name + suffix)
+        with open(sibling, 'wb') as f:
+            f.write(compressed)
+        # Keep the sibling's mtime in step with the original for conditional requests
+        stat = os.stat(path)
+        os.utime(sibling, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        result["written"].append(sibling)
+
+    return result
+
+
+def precompress_directory(output_dir: str, cache_dir: str = None, min_size: int = MIN_COMPRESS_SIZE, max_workers: int = None, log=None) -> dict:
+    """
+    Precompress every text file under output_dir using a pool of worker threads.
+
+    zlib and brotli release the GIL while compressing, so threads scale across
+    cores without the cost of pickling file contents to worker processes.
+
+    Args:
+        output_dir: Directory containing the generated site
+        cache_dir: Optional directory for the compressed-blob cache
+        min_size: Files smaller than this many bytes are skipped
+        max_workers: Size of the worker pool (defaults to the executor's choice)
+        log: Optional callable that receives the summary line
+
+    Returns:
+        Dict with counts of "files", "written", "skipped" and "cache_hits"
+    """
+    output_path = Path(output_dir)
+    if not output_path.is_dir():
+        raise ValueError(f"Output directory does not exist: {output_dir}")
+
+    cache = ContentCache(cache_dir, "compress") if cache_dir else None
+    files = [
+        path for path in output_path.rglob("*")
+        if path.is_file() and path.suffix in COMPRESSIBLE_SUFFIXES
+    ]
+
+    totals = {"files": len(files), "written": 0, "skipped": 0, "cache_hits": 0}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for result in pool.map(lambda path: compress_file(path, cache, min_size), files):
+            totals["written"] += len(result["written"])
+            totals["skipped"] += 1 if result["skipped"] else 0
+            totals["cache_hits"] += result["cache_hits"]
+
+    encodings = ", ".join(suffix for suffix, _ in available_encodings())
+    if log is not None:
+        log(
+            f"Precompressed {totals['files'] - totals['skipped']} files ({encodings}): "
+            f"{totals['written']} siblings written, {totals['skipped']} below {min_size} bytes, "
+            f"{totals['cache_hits']} cache hits"
+        )
+    return totals
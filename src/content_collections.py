@@ -0,0 +1,184 @@
+import bisect
+
+from htmlnode import LeafNode, ParentNode
+from toc import slugify
+
+
+# Posts per listing page
+DEFAULT_PER_PAGE = 10
+
+def page_url(rel: str) -> str:
+    """Root-relative URL of a content page ("blog/tom/index.md" -> "/blog/tom")."""
+    if rel == "index.md":
+        return "/"
+    if rel.endswith("/index.md"):
+        return "/" + rel[:-len("/index.md")]
+    return "/" + rel[:-len(".md")] + ".html"
+
+
+def _is_draft(meta: dict) -> bool:
+    return str(meta.get("draft", "")).lower() in ("true", "yes")
+
+
+class ListingPage:
+    """One generated page of a collection index, archive or tag listing."""
+
+    def __init__(self, path: str, title: str, posts: list[dict], newer: str = None, older: str = None):
+        # Output path relative to the site root, e.g. "blog/page/2/index.html"
+        self.path = path
+        self.title = title
+        # Metadata of the posts shown, newest first, each with a "url" added
+        self.posts = posts
+        # URLs of the neighbouring pages, if any
+        self.newer = newer
+        self.older = older
+
+    def key(self) -> tuple:
+        """Everything the page's HTML depends on, for change detection."""
+        return (
+            self.title, self.newer, self.older,
+            tuple((post["url"], post["title"], post["date"], post["description"]) for post in self.posts),
+        )
+
+    def to_html_node(self) -> ParentNode:
+        items = []
+        for post in self.posts:
+            children = [LeafNode("a", post["title"], {"href": post["url"]})]
+            if post["date"]:
+                children.append(LeafNode("time", post["date"]))
+            if post["description"]:
+                children.append(LeafNode("p", post["description"]))
+            items.append(ParentNode("li", children))
+        children = [LeafNode("h1", self.title)]
+        children.append(ParentNode("ul", items) if items else LeafNode("p", "No posts yet."))
+        links = []
+        if self.newer:
+            links.append(LeafNode("a", "Newer posts", {"href": self.newer, "rel": "prev"}))
+        if self.older:
+            links.append(LeafNode("a", "Older posts", {"href": self.older, "rel": "next"}))
+        if links:
+            children.append(ParentNode("nav", links))
+        return ParentNode("div", children)
+
+
+class Collection:
+    """
+    The posts under one content directory, kept sorted newest first.
+
+    The first update() sorts the posts once. Later updates move only the
+    posts whose metadata changed, with a binary search, so one edited post
+    costs O(n) list shifting instead of a full re-sort. Tag groups are built
+    in a single pass over the sorted posts, so they need no sorting of
+    their own.
+    """
+
+    def __init__(self, directory: str, title: str = None, per_page: int = DEFAULT_PER_PAGE):
+        """
+        Args:
+            directory: Content directory of the posts, e.g. "blog"
+            title: Heading of the index pages (defaults to the capitalised directory name)
+            per_page: Posts per listing page
+        """
+        if per_page < 1:
+            raise ValueError(f"per_page must be at least 1, got {per_page}")
+        self.directory = directory.strip("/")
+        self.title = title or self.directory.capitalize()
+        self.per_page = per_page
+        # Ascending (date, path) keys; iterated in reverse for newest first
+        self._keys = []
+        # Content path -> post metadata with "url" added
+        self._posts = {}
+        # Content path -> metadata as last given to update(), for change detection
+        self._source = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _key(rel: str, post: dict) -> tuple:
+        return (post["date"], rel)
+
+    def update(self, metadata: dict[str, dict]) -> int:
+        """
+        Sync the collection with the site's metadata index.
+
+        Args:
+            metadata: Content path -> page metadata for every page in the site;
+                a changed page must get a new dict, as the old ones are kept for comparison
+
+        Returns:
+            Number of posts added, changed or removed
+        """
+        prefix = self.directory + "/"
+        own_index = prefix + "index.md"
+        current = {
+            rel: meta for rel, meta in metadata.items()
+            if rel.startswith(prefix) and rel != own_index and not ("draft" in meta and _is_draft(meta))
+        }
+
+        if not self._posts:
+            # First load: one sort for the whole collection
+            self._source = current
+            self._posts = {rel: dict(meta, url=page_url(rel)) for rel, meta in current.items()}
+            self._keys = sorted(self._key(rel, post) for rel, post in self._posts.items())
+            return len(self._posts)
+
+        changes = 0
+        for rel in [rel for rel in self._posts if rel not in current]:
+            self._remove(rel)
+            changes += 1
+        for rel, meta in current.items():
+            old = self._source.get(rel)
+            if old == meta:
+                continue
+            if old is not None:
+                self._remove(rel)
+            post = self._posts[rel] = dict(meta, url=page_url(rel))
+            bisect.insort(self._keys, self._key(rel, post))
+            changes += 1
+        self._source = current
+        return changes
+
+    def _remove(self, rel: str):
+        key = self._key(rel, self._posts.pop(rel))
+        index = bisect.bisect_left(self._keys, key)
+        del self._keys[index]
+
+    def posts(self) -> list[dict]:
+        """All posts, newest first (undated posts last)."""
+        return [self._posts[rel] for _, rel in reversed(self._keys)]
+
+    def _paginate(self, base: str, title: str, posts: list[dict]) -> list[ListingPage]:
+        """Split posts into pages at base/index.html, base/page/2/index.html, ..."""
+        count = max(1, -(-len(posts) // self.per_page))
+        urls = ["/" + base] + [f"/{base}/page/{number}" for number in range(2, count + 1)]
+        pages = []
+        for number in range(count):
+            path = f"{base}/index.html" if number == 0 else f"{base}/page/{number + 1}/index.html"
+            pages.append(ListingPage(
+                path, title if number == 0 else f"{title} (page {number + 1})",
+                posts[number * self.per_page:(number + 1) * self.per_page],
+                newer=urls[number - 1] if number > 0 else None,
+                older=urls[number + 1] if number + 1 < count else None,
+            ))
+        return pages
+
+    def listing_pages(self) -> list[ListingPage]:
+        """
+        Every generated page: the paginated index and archive of the
+        collection, plus a paginated listing per tag under <directory>/tags/.
+        """
+        posts = self.posts()
+        pages = self._paginate(self.directory, self.title, posts)
+
+        # One pass over the sorted posts keeps every tag group sorted too
+        by_tag = {}
+        for post in posts:
+            for tag in post.get("tags") or []:
+                slug = slugify(tag)
+                if slug:
+                    by_tag.setdefault(slug, (tag, []))[1].append(post)
+        for slug in sorted(by_tag):
+            tag, tagged = by_tag[slug]
+            pages.extend(self._paginate(f"{self.directory}/tags/{slug}", f"{self.title} tagged {tag}", tagged))
+        return pages
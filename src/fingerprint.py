@@ -0,0 +1,225 @@
+import json
+import os
+import posixpath
+import re
+import shutil
+from pathlib import Path
+
+from build_cache import content_hash
+import metrics
+
+
+# Static assets that get content-hashed names and can be cached forever
+FINGERPRINT_SUFFIXES = {
+    ".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico", ".woff", ".woff2",
+}
+
+# Number of hex digest characters embedded in fingerprinted file names
+HASH_LENGTH = 10
+
+MANIFEST_NAME = "asset-manifest.json"
+
+URL_ATTR_PATTERN = re.compile(r'\b(href|src)="([^"]*)"')
+# url(...) in a stylesheet, optionally quoted
+CSS_URL_PATTERN = re.compile(r"""url\(\s*(['"]?)([^'"()\s]+)\1\s*\)""")
+
+
+class HashIndex:
+    """
+    Incremental file hasher.
+
+    Remembers (size, mtime_ns, digest) per path in a JSON file so unchanged
+    assets are not re-read and re-hashed on the next build. copy2 preserves
+    mtimes, so entries stay valid even though the output directory is
+    recreated on every build.
+    """
+
+    def __init__(self, index_path: str = None):
+        self.index_path = Path(index_path) if index_path else None
+        self.entries = {}
+        self.rehashed = 0
+        if self.index_path and self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def hash_file(self, path: Path, key: str) -> str:
+        """
+        Return the content hash of path, reusing the stored digest when the
+        file's size and mtime are unchanged.
+        """
+        stat = os.stat(path)
+        entry = self.entries.get(key)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            metrics.inc("static_site_cache_requests_total", ("asset-hashes", "hit"))
+            return entry[2]
+        metrics.inc("static_site_cache_requests_total", ("asset-hashes", "miss"))
+
+        with open(path, 'rb') as f:
+            digest = content_hash(f.read())
+        self.entries[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        self.rehashed += 1
+        return digest
+
+    def save(self):
+        if self.index_path is None:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+
+
+def fingerprinted_name(name: str, digest: str) -> str:
+    """
+    Insert a digest before the file extension (index.css -> index.<hash>.css).
+    """
+    stem, dot, suffix = name.rpartition(".")
+    if not dot:
+        return f"{name}.{digest[:HASH_LENGTH]}"
+    return f"{stem}.{digest[:HASH_LENGTH]}.{suffix}"
+
+
+def fingerprint_assets(output_dir: str, cache_dir: str = None, log=None) -> dict[str, str]:
+    """
+    Copy static assets in output_dir to content-hashed names.
+
+    The original files stay in place, so references the build can't
+    rewrite (relative URLs in pages, scripts building URLs) keep working.
+    Stylesheets are hashed last, after their url(...) references have been
+    rewritten to the hashed names of the assets they point at.
+
+    Writes the resulting manifest to asset-manifest.json in output_dir.
+
+    Args:
+        output_dir: Directory the static files were copied into
+        cache_dir: Optional directory for the incremental hash index
+        log: Optional callable that receives the summary line
+
+    Returns:
+        Manifest mapping root-relative URLs to their fingerprinted URLs,
+        e.g. {"/index.css": "/index.0123456789.css"}
+    """
+    output_path = Path(output_dir)
+    if not output_path.is_dir():
+        raise ValueError(f"Output directory does not exist: {output_dir}")
+
+    index = HashIndex(os.path.join(cache_dir, "asset-hashes.json") if cache_dir else None)
+    assets = [
+        path for path in sorted(output_path.rglob("*"))
+        if path.is_file() and path.suffix.lower() in FINGERPRINT_SUFFIXES
+    ]
+    manifest = {}
+    # Stylesheets refer to the other assets, so they need the others' hashed names
+    for path in sorted(assets, key=lambda path: path.suffix.lower() == ".css"):
+        rel = path.relative_to(output_path).as_posix()
+        url = "/" + rel
+        css = None
+        if path.suffix.lower() == ".css":
+            with open(path, 'r', encoding='utf-8') as f:
+                original = f.read()
+            css = rewrite_css_urls(original, url, manifest)
+        if css is not None and css != original:
+            data = css.encode('utf-8')
+            hashed_path = path.with_name(fingerprinted_name(path.name, content_hash(data)))
+            with open(hashed_path, 'wb') as f:
+                f.write(data)
+        else:
+            hashed_path = path.with_name(fingerprinted_name(path.name, index.hash_file(path, rel)))
+            shutil.copy2(path, hashed_path)
+        manifest[url] = "/" + hashed_path.relative_to(output_path).as_posix()
+    index.save()
+
+    with open(output_path / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    if log is not None:
+        log(f"Fingerprinted {len(manifest)} assets ({index.rehashed} rehashed)")
+    return manifest
+
+
+def rewrite_url(url: str, manifest: dict[str, str]) -> str:
+    """
+    Map a root-relative asset URL through the manifest, keeping any query
+    string or fragment. URLs not in the manifest are returned unchanged.
+    """
+    if not url.startswith("/"):
+        return url
+    cut = len(url)
+    for sep in ("?", "#"):
+        idx = url.find(sep)
+        if idx != -1 and idx < cut:
+            cut = idx
+    hashed = manifest.get(url[:cut])
+    if hashed is None:
+        return url
+    return hashed + url[cut:]
+
+
+def rewrite_css_urls(css: str, stylesheet_url: str, manifest: dict[str, str]) -> str:
+    """
+    Rewrite the url(...) references of a stylesheet through the manifest.
+
+    Relative references are resolved against the stylesheet's own URL and
+    stay relative; absolute URLs, data: URIs and assets not in the
+    manifest are left as written.
+
+    Args:
+        css: The stylesheet's text
+        stylesheet_url: Root-relative URL of the stylesheet, e.g. "/css/site.css"
+        manifest: Asset manifest built so far
+
+    Returns:
+        The stylesheet with every known asset referenced by its hashed name
+    """
+    if not manifest or "url(" not in css:
+        return css
+    base = posixpath.dirname(stylesheet_url)
+
+    def replace(match):
+        quote, url = match.groups()
+        if ":" in url or url.startswith(("//", "#")):
+            return match.group(0)
+        absolute = url if url.startswith("/") else posixpath.normpath(posixpath.join(base, url))
+        hashed = rewrite_url(absolute, manifest)
+        if hashed == absolute:
+            return match.group(0)
+        if not url.startswith("/"):
+            hashed = posixpath.relpath(hashed, base)
+        return f"url({quote}{hashed}{quote})"
+
+    return CSS_URL_PATTERN.sub(replace, css)
+
+
+def rewrite_html_urls(html: str, manifest: dict[str, str]) -> str:
+    """
+    Rewrite every href="..." and src="..." attribute in an HTML string (such as
+    the page template) through the manifest.
+    """
+    if not manifest:
+        return html
+    return URL_ATTR_PATTERN.sub(
+        lambda match: f'{match.group(1)}="{rewrite_url(match.group(2), manifest)}"',
+        html,
+    )
+
+
+def rewrite_node_urls(node, manifest: dict[str, str]):
+    """
+    Rewrite href/src props of every node in an HTMLNode tree through the manifest.
+
+    Args:
+        node: Root HTMLNode (e.g. the result of markdown_to_html_node)
+        manifest: Asset manifest from fingerprint_assets
+
+    Returns:
+        The same node, modified in place
+    """
+    if not manifest:
+        return node
+    for child in node.iter_nodes():
+        props = child.props
+        if not props:
+            continue
+        for attr in ("href", "src"):
+            if attr in props:
+                props[attr] = rewrite_url(props[attr], manifest)
+    return node
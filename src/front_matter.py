@@ -0,0 +1,225 @@
+from datetime import date, datetime, timezone
+from itertools import chain
+
+from htmlnode import escape_attribute
+from inline_markdown import text_to_textnodes
+
+
+# Opens and closes a front matter block on the first line of a page
+DELIMITER = "---"
+
+# Fields every page has, so templates can always use their placeholders
+STANDARD_FIELDS = {"title": "", "date": "", "tags": [], "description": ""}
+
+# Fields whose comma-separated values are always read as lists
+LIST_FIELDS = {"tags"}
+
+# Fields read with parse_date()
+DATE_FIELDS = {"date"}
+
+# The two forms parse_date() writes dates in
+DATE_FORMAT = "%Y-%m-%d"
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def parse_date(value) -> str:
+    """
+    Check a front matter date and write it in a form that sorts as a string.
+
+    "2024-05-01" is kept as is. Dates with a time, in any ISO 8601 form
+    ("2024-05-01T10:00:00+02:00", "2024-05-01 10:00"), become UTC
+    "2024-05-01T08:00:00Z"; times without an offset are taken as UTC. An
+    empty value means the page is undated.
+
+    Raises:
+        ValueError: If value is not such a date
+    """
+    if value == "":
+        return value
+    try:
+        if not isinstance(value, str):
+            raise ValueError
+        if len(value) == 10:
+            return date.fromisoformat(value).strftime(DATE_FORMAT)
+        parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        raise ValueError(f"Invalid date: {value!r} (expected YYYY-MM-DD or an ISO 8601 date and time)") from None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime(DATETIME_FORMAT)
+
+
+def parse_front_matter(lines) -> dict:
+    """
+    Parse simple "key: value" front matter lines.
+
+    Values may be quoted, and "[a, b]" (or, for tags, "a, b") is read as a
+    list. Dates are checked and normalized by parse_date(). Blank lines
+    and lines starting with # are ignored.
+
+    Args:
+        lines: Iterable of front matter lines, without the --- delimiters
+
+    Returns:
+        Dict of lower-cased keys to str or list[str] values
+
+    Raises:
+        ValueError: If a line is not "key: value" or a date is invalid
+    """
+    metadata = {}
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        key, colon, value = stripped.partition(":")
+        key = key.strip().lower()
+        if not colon or not key:
+            raise ValueError(f"Invalid front matter line: {stripped}")
+        value = value.strip()
+        if value.startswith("[") and value.endswith("]"):
+            value = [_unquote(item.strip()) for item in value[1:-1].split(",") if item.strip()]
+        elif key in LIST_FIELDS:
+            value = [_unquote(item.strip()) for item in value.split(",") if item.strip()]
+        else:
+            value = _unquote(value)
+        if key in DATE_FIELDS:
+            value = parse_date(value)
+        metadata[key] = value
+    return metadata
+
+
+def _plain_text(text: str) -> str:
+    # The text of a heading without its markup, as TableOfContents records it
+    try:
+        return "".join(node.text for node in text_to_textnodes(text))
+    except ValueError:
+        return text
+
+
+def _find_title(lines) -> str | None:
+    # The first "# " line with text outside fenced code; only for
+    # read_metadata, rendering takes the title from the parsed headings
+    fence = None
+    for line in lines:
+        stripped = line.strip()
+        if fence is not None:
+            if stripped.startswith(fence) and not stripped.strip("`"):
+                fence = None
+        elif stripped.startswith("```"):
+            length = len(stripped) - len(stripped.lstrip("`"))
+            # ```code``` on one line opens nothing
+            if "`" not in stripped[length:]:
+                fence = stripped[:length]
+        elif stripped.startswith("# "):
+            title = stripped[2:].strip()
+            if title:
+                return _plain_text(title)
+    return None
+
+
+def complete_metadata(metadata: dict, title: str | None) -> dict:
+    """
+    Fill in a page's title and the standard fields (title, date, tags,
+    description) missing from its front matter.
+
+    Args:
+        metadata: Front matter dict, updated in place
+        title: Text of the page's first h1, used when the front matter has no title
+
+    Returns:
+        metadata
+
+    Raises:
+        ValueError: If neither the front matter nor the page has a title
+    """
+    if not metadata.get("title"):
+        if title is None:
+            raise ValueError("No h1 header found in markdown content")
+        metadata["title"] = title
+    for field, default in STANDARD_FIELDS.items():
+        metadata.setdefault(field, list(default) if isinstance(default, list) else default)
+    return metadata
+
+
+def split_front_matter(markdown: str) -> tuple[dict, str]:
+    """
+    Separate a page's front matter from its markdown body.
+
+    Returns:
+        (front matter dict, body); pages without front matter get an empty
+        dict and the markdown unchanged
+
+    Raises:
+        ValueError: If the front matter is not closed or has an invalid line
+    """
+    if not markdown.startswith(DELIMITER):
+        return {}, markdown
+    lines = markdown.split("\n")
+    if lines[0].strip() != DELIMITER:
+        return {}, markdown
+    for end in range(1, len(lines)):
+        if lines[end].strip() == DELIMITER:
+            return parse_front_matter(lines[1:end]), "\n".join(lines[end + 1:])
+    raise ValueError("Front matter is not closed with ---")
+
+
+def _read_metadata(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        if first.strip() == DELIMITER:
+            front = []
+            for line in f:
+                if line.strip() == DELIMITER:
+                    break
+                front.append(line)
+            else:
+                raise ValueError("Front matter is not closed with ---")
+            metadata = parse_front_matter(front)
+            rest = f
+        else:
+            metadata = {}
+            rest = chain([first], f)
+        title = None if metadata.get("title") else _find_title(rest)
+    return complete_metadata(metadata, title)
+
+
+def read_metadata(path: str) -> dict:
+    """
+    Read a page's metadata without parsing its body.
+
+    Reading stops at the end of the front matter when it has a title, or
+    else at the first h1, so listing pages can be built without reading
+    whole documents.
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If the page has no title or invalid front matter; the
+            message starts with path
+    """
+    try:
+        return _read_metadata(path)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
+
+
+def placeholder_values(metadata: dict) -> dict[str, str]:
+    """
+    Template placeholder values for a page's metadata.
+
+    Keys become capitalised placeholder names ("date" -> {{ Date }},
+    "cover_image" -> {{ CoverImage }}) and lists are joined with ", ".
+    Values are escaped for HTML text and double-quoted attributes, so
+    they can fill <title> as well as content="..."; {{ Content }} and
+    {{ TOC }}, which are already HTML, are added by the caller unescaped.
+    """
+    values = {}
+    for key, value in metadata.items():
+        name = "".join(part.capitalize() for part in key.replace("-", "_").split("_"))
+        values[name] = escape_attribute(", ".join(value) if isinstance(value, list) else str(value))
+    return values
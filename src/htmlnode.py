@@ -1,5 +1,39 @@
+import metrics
+
+
+def escape_text(text: str) -> str:
+    """
+    Escape &, < and > for use as HTML text.
+    
+    Most text has none of them, and then costs three substring scans and
+    is returned as is; otherwise each character present costs one
+    str.replace, which in CPython beats str.translate or a regex.
+    """
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(value: str) -> str:
+    """Escape a value for a double-quoted HTML attribute: as escape_text(), and also "."""
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    return value
+
+
 class HTMLNode:
     def __init__(self, tag: str = None, value: str = None, children: list["HTMLNode"] = None, props: dict[str, str] = None):
+        metrics.inc("static_site_htmlnodes_created_total")
         self.tag = tag
         self.value = value
         self.children = children
@@ -11,7 +45,16 @@ class HTMLNode:
     def props_to_html(self) -> str:
         if self.props is None or not self.props:
             return ""
-        return " " + " ".join([f'{key}="{value}"' for key, value in self.props.items()])
+        return " " + " ".join([f'{key}="{escape_attribute(value)}"' for key, value in self.props.items()])
+
+    def iter_nodes(self):
+        """Yield this node and all of its descendants in document order."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.children:
+                stack.extend(reversed(node.children))
 
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
@@ -22,18 +65,23 @@ class LeafNode(HTMLNode):
         super().__init__(tag, value, None, props)
     
     def to_html(self):
-        if self.tag is None:
-            if self.value is None:
+        value = self.value
+        if value is None:
+            if self.tag is None:
                 raise ValueError("LeafNode must have a value or a tag")
-            return self.value
-        # Handle self-closing tags (like img)
-        if self.tag == "img":
-            if self.value is None or self.value == "":
+            # Handle self-closing tags (like img)
+            if self.tag == "img":
                 return f"<{self.tag}{self.props_to_html()}>"
-            return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
-        if self.value is None:
             raise ValueError("LeafNode must have a value")
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+        # Checked here as well so that text with nothing to escape, nearly all of it, skips the call
+        if "&" in value or "<" in value or ">" in value:
+            value = escape_text(value)
+        if self.tag is None:
+            return value
+        if self.tag == "img" and value == "":
+            return f"<{self.tag}{self.props_to_html()}>"
+        props = self.props_to_html() if self.props else ""
+        return f"<{self.tag}{props}>{value}</{self.tag}>"
 
 class ParentNode(HTMLNode):
     def __init__(self, tag: str = None, children: list["HTMLNode"] = None, props: dict[str, str] = None):
@@ -45,5 +93,6 @@ class ParentNode(HTMLNode):
         if self.children is None or len(self.children) == 0:
             raise ValueError("ParentNode must have one or more children")
         
-        children_html = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
\ No newline at end of file
+        children_html = "".join([child.to_html() for child in self.children])
+        props = self.props_to_html() if self.props else ""
+        return f"<{self.tag}{props}>{children_html}</{self.tag}>"
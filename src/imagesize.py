@@ -0,0 +1,172 @@
+import json
+import os
+import struct
+from pathlib import Path
+
+import metrics
+
+
+# Bytes needed to read the dimensions of every non-JPEG format we support
+HEADER_SIZE = 32
+
+# JPEG start-of-frame markers that carry the image dimensions
+JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF,
+}
+
+
+def _jpeg_size(f) -> tuple[int, int] | None:
+    """Walk JPEG segment headers until a start-of-frame marker is found."""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        # Standalone markers have no length field
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            continue
+        header = f.read(2)
+        if len(header) < 2:
+            return None
+        length = struct.unpack(">H", header)[0]
+        if marker in JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def probe_image(path: str) -> tuple[int, int] | None:
+    """
+    Read an image's width and height from its header bytes.
+
+    Supports PNG, GIF, WebP (lossy, lossless and extended) and JPEG. Only the
+    header is read; JPEG files are walked segment by segment without loading
+    the compressed image data.
+
+    Args:
+        path: Path to the image file
+
+    Returns:
+        (width, height) tuple, or None if the format is not recognised
+    """
+    with open(path, 'rb') as f:
+        head = f.read(HEADER_SIZE)
+
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8 " and len(head) >= 30:
+                width, height = struct.unpack("<HH", head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L" and len(head) >= 25:
+                bits = int.from_bytes(head[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X" and len(head) >= 30:
+                width = int.from_bytes(head[24:27], "little") + 1
+                height = int.from_bytes(head[27:30], "little") + 1
+                return width, height
+            return None
+
+        if head[:2] == b"\xff\xd8":
+            return _jpeg_size(f)
+
+    return None
+
+
+class ImageSizeCache:
+    """
+    Memoises probe_image results for images under a static directory.
+
+    Entries are keyed by path and mtime, so every image is read once no matter
+    how many pages reference it, and a changed image is probed again. The
+    cache can optionally be persisted between builds.
+    """
+
+    def __init__(self, static_dir: str, index_path: str = None):
+        self.static_dir = Path(static_dir)
+        # Image paths are resolved and must stay under here
+        self._root = self.static_dir.resolve()
+        self.index_path = Path(index_path) if index_path else None
+        self.entries = {}
+        self.probes = 0
+        if self.index_path and self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def dimensions(self, url: str) -> tuple[int, int] | None:
+        """
+        Return (width, height) for a root-relative image URL such as
+        "/images/tom.png", or None for remote, missing or unknown images
+        and for URLs that lead out of the static directory.
+        """
+        if not url.startswith("/") or url.startswith("//"):
+            return None
+        path = (self._root / url.split("?", 1)[0].split("#", 1)[0].lstrip("/")).resolve()
+        if not path.is_relative_to(self._root):
+            return None
+        rel = path.relative_to(self._root).as_posix()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        entry = self.entries.get(rel)
+        if entry is not None and entry[0] == mtime:
+            metrics.inc("static_site_cache_requests_total", ("image-sizes", "hit"))
+            return tuple(entry[1]) if entry[1] else None
+
+        metrics.inc("static_site_cache_requests_total", ("image-sizes", "miss"))
+        self.probes += 1
+        try:
+            size = probe_image(path)
+        except OSError:
+            size = None
+        self.entries[rel] = [mtime, list(size) if size else None]
+        return size
+
+    def save(self):
+        if self.index_path is None:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+
+
+def add_image_dimensions(node, cache: ImageSizeCache):
+    """
+    Add width/height, loading="lazy" and decoding="async" to every <img> in
+    an HTMLNode tree so browsers can reserve space before the image loads.
+
+    Must run before asset URLs are fingerprinted, since sizes are looked up
+    by the original static path.
+
+    Args:
+        node: Root HTMLNode (e.g. the result of markdown_to_html_node)
+        cache: ImageSizeCache for the site's static directory
+
+    Returns:
+        The same node, modified in place
+    """
+    for child in node.iter_nodes():
+        if child.tag != "img" or not child.props:
+            continue
+        size = cache.dimensions(child.props.get("src", ""))
+        if size is not None:
+            child.props["width"] = str(size[0])
+            child.props["height"] = str(size[1])
+        child.props["loading"] = "lazy"
+        child.props["decoding"] = "async"
+    return node
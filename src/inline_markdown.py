@@ -1,6 +1,73 @@
 import re
+import metrics
+import syntax
 from textnode import TextNode, TextType
 
+# Compiled once at import rather than looked up in re's cache on every call
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+# [text][label], [text][] and [text], optionally as images; never followed by "(" or ":"
+REFERENCE_PATTERN = re.compile(r"(!?)\[([^\[\]]+)\](?:\[([^\[\]]*)\])?(?![(:])")
+
+
+def normalize_label(label: str) -> str:
+    """Reference labels match case-insensitively, with runs of whitespace collapsed."""
+    return " ".join(label.split()).lower()
+
+
+def resolve_reference_links(nodes, definitions):
+    """
+    Turn reference-style links and images in TEXT nodes into LINK and IMAGE nodes.
+    
+    [text][label], [text][] and [text] become links when the label (or,
+    for the last two, the text) is defined; anything else is left as
+    written. This runs on the nodes text_to_textnodes made, so brackets
+    in code spans are never resolved. Each reference costs one dict lookup.
+    
+    Args:
+        nodes: List of TextNode objects
+        definitions: Normalized label -> URL, from extract_link_definitions
+    
+    Returns:
+        New list of TextNode objects with every resolvable reference as a link or image
+    """
+    if not definitions:
+        return nodes
+    new_nodes = []
+    for node in nodes:
+        text = node.text
+        if node.text_type != TextType.TEXT or "[" not in text:
+            new_nodes.append(node)
+            continue
+        # Start of the text not yet in a node
+        done = 0
+        for match in REFERENCE_PATTERN.finditer(text):
+            bang, label_text, label = match.groups()
+            url = definitions.get(normalize_label(label or label_text))
+            if url is None:
+                continue
+            if match.start() > done:
+                new_nodes.append(TextNode(text[done:match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(label_text, TextType.IMAGE if bang else TextType.LINK, url))
+            done = match.end()
+        if done == 0:
+            new_nodes.append(node)
+        elif done < len(text):
+            new_nodes.append(TextNode(text[done:], TextType.TEXT))
+    return new_nodes
+
+
+def has_unresolved_references(text, definitions):
+    """Whether text has anything that would be a reference link if its label were defined."""
+    if "[" not in text:
+        return False
+    for match in REFERENCE_PATTERN.finditer(text):
+        _, label_text, label = match.groups()
+        if normalize_label(label or label_text) not in definitions:
+            return True
+    return False
+
+
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     """
     Split TextType.TEXT nodes by a delimiter and convert delimited sections to the specified text_type.
@@ -61,8 +128,8 @@ def extract_markdown_images(text):
     Returns:
         List of tuples, each containing (alt_text, url)
     """
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
+    metrics.inc("static_site_regex_invocations_total", "extract_markdown_images")
+    matches = IMAGE_PATTERN.findall(text)
     return matches
 
 
@@ -76,8 +143,8 @@ def extract_markdown_links(text):
     Returns:
         List of tuples, each containing (anchor_text, url)
     """
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
+    metrics.inc("static_site_regex_invocations_total", "extract_markdown_links")
+    matches = LINK_PATTERN.findall(text)
     return matches
 
 
@@ -185,27 +252,99 @@ def split_nodes_link(old_nodes):
     return new_nodes
 
 
+class ImageSyntax(syntax.InlineSyntax):
+    """![alt](url)"""
+
+    triggers = "!"
+
+    def match(self, text, pos):
+        metrics.inc("static_site_regex_invocations_total", "ImageSyntax.match")
+        match = IMAGE_PATTERN.match(text, pos)
+        if match is None:
+            return None
+        return TextNode(match.group(1), TextType.IMAGE, match.group(2)), match.end()
+
+
+class LinkSyntax(syntax.InlineSyntax):
+    """[anchor](url)"""
+
+    triggers = "["
+
+    def match(self, text, pos):
+        metrics.inc("static_site_regex_invocations_total", "LinkSyntax.match")
+        match = LINK_PATTERN.match(text, pos)
+        if match is None:
+            return None
+        return TextNode(match.group(1), TextType.LINK, match.group(2)), match.end()
+
+
+class DelimiterSyntax(syntax.InlineSyntax):
+    """Text between two delimiters, e.g. **bold**; the text inside is not parsed further."""
+
+    def __init__(self, delimiter: str, text_type):
+        self.delimiter = delimiter
+        self.node_type = text_type
+        self.triggers = delimiter[0]
+
+    def match(self, text, pos):
+        delimiter = self.delimiter
+        if not text.startswith(delimiter, pos):
+            return None
+        start = pos + len(delimiter)
+        end = text.find(delimiter, start)
+        if end == -1:
+            raise ValueError(f"Invalid markdown: unmatched delimiter '{delimiter}'")
+        return TextNode(text[start:end], self.node_type), end + len(delimiter)
+
+
+syntax.register_inline(ImageSyntax())
+syntax.register_inline(LinkSyntax())
+syntax.register_inline(DelimiterSyntax("**", TextType.BOLD))
+syntax.register_inline(DelimiterSyntax("_", TextType.ITALIC))
+syntax.register_inline(DelimiterSyntax("`", TextType.CODE))
+
+
 def text_to_textnodes(text):
     """
     Convert raw markdown text into a list of TextNode objects.
     
-    Processes images, links, bold, italic, and code markdown syntax.
+    Scans the text once, left to right, jumping between the trigger
+    characters of the registered inline syntaxes (images, links, bold,
+    italic, code and any extensions); at each one the syntaxes for that
+    character are tried in registration order. What a syntax matches is
+    not parsed further, so "**a _b_**" is bold "a _b_".
     
     Args:
         text: Raw markdown text string
     
     Returns:
         List of TextNode objects with appropriate types
-    """
-    # Start with a single TEXT node containing the entire text
-    nodes = [TextNode(text, TextType.TEXT)]
     
-    # Process in order: images, links, then delimiters (bold, italic, code)
-    # Images and links are processed first because they're more complex
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    Raises:
+        ValueError: If a delimiter has no closing match
+    """
+    triggers, pattern = syntax.inline_table()
+    found = pattern.search(text) if pattern is not None else None
+    if found is None:
+        return [TextNode(text, TextType.TEXT)]
     
+    nodes = []
+    # Start of the text not yet in a node
+    done = 0
+    while found is not None:
+        pos = found.start()
+        for candidate in triggers[text[pos]]:
+            result = candidate.match(text, pos)
+            if result is not None:
+                break
+        else:
+            found = pattern.search(text, pos + 1)
+            continue
+        if pos > done:
+            nodes.append(TextNode(text[done:pos], TextType.TEXT))
+        node, done = result
+        nodes.append(node)
+        found = pattern.search(text, done)
+    if done < len(text) or not nodes:
+        nodes.append(TextNode(text[done:], TextType.TEXT))
     return nodes
@@ -0,0 +1,194 @@
+import posixpath
+import re
+from urllib.parse import unquote, urlsplit
+
+
+# Anything that makes a root-relative URL need full parsing: a query,
+# fragment, escape, repeated slash or dot segment
+_NEEDS_PARSING = re.compile(r"[?#%\\]|//|/\.\.?(?:/|$)")
+
+
+def collect_links(node) -> list[str]:
+    """Every href/src in an HTMLNode tree, in document order."""
+    urls = []
+    for child in node.iter_nodes():
+        props = child.props
+        if not props:
+            continue
+        for attr in ("href", "src"):
+            if attr in props:
+                urls.append(props[attr])
+    return urls
+
+
+def page_directory(page: str) -> str:
+    """URL directory relative links on an output page resolve against ("blog/tom/index.html" -> "/blog/tom/")."""
+    directory = posixpath.dirname(page)
+    return f"/{directory}/" if directory else "/"
+
+
+def link_target(url: str, directory: str = "/") -> str | None:
+    """
+    Normalise an internal link to a root-relative URL path.
+
+    Args:
+        url: href or src as written in the page
+        directory: URL directory of the page, for relative links
+
+    Returns:
+        The path, keeping a trailing "/" (e.g. "/blog/tom", "/blog/"), or
+        None for external links, mailto: and the like, and bare "#fragment"s
+    """
+    if url[:1] == "/" and url[1:2] != "/" and not _NEEDS_PARSING.search(url):
+        # Plain root-relative path, the common case: already normalised
+        return url
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    path = unquote(parts.path)
+    if not path.startswith("/"):
+        path = directory + path
+    normalized = posixpath.normpath(path)
+    if normalized.startswith("//"):
+        # normpath keeps a leading "//"
+        normalized = "/" + normalized.lstrip("/")
+    if path.endswith("/") and normalized != "/":
+        normalized += "/"
+    return normalized
+
+
+def page_targets(page: str) -> tuple[str, ...]:
+    """
+    Link targets the server resolves to an output file
+    ("blog/index.html" -> "/blog/index.html", "/blog/", "/blog").
+    """
+    if page == "index.html":
+        return ("/index.html", "/")
+    if page.endswith("/index.html"):
+        directory = "/" + page[:-len("/index.html")]
+        return ("/" + page, directory + "/", directory)
+    return ("/" + page,)
+
+
+class LinkGraph:
+    """
+    Internal links between output pages, checked against the built files.
+
+    The graph keeps each page's link targets and, per target, the pages
+    linking to it. update() re-indexes a page only when its links changed,
+    and check() re-checks only those pages plus the pages linking to files
+    that appeared or disappeared since the last check, so an incremental
+    build costs O(changed links) rather than O(all links).
+    """
+
+    def __init__(self):
+        # Output page -> list of URLs as written
+        self._urls = {}
+        # Output page -> {url: target} for its internal links
+        self._targets = {}
+        # Target -> set of output pages linking to it
+        self._inbound = {}
+        # Output page -> broken URLs, as of the last check()
+        self._broken = {}
+        # Pages to re-check on the next check()
+        self._dirty = set()
+        # Output files at the last check()
+        self._files = frozenset()
+        # Every target that resolves to one of those files
+        self._valid = set()
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def update(self, page: str, urls: list[str]):
+        """
+        Record the links of one output page.
+
+        Args:
+            page: Output path relative to the site root, e.g. "blog/tom/index.html"
+            urls: Every href/src on the page, e.g. from collect_links()
+        """
+        old = self._urls.get(page)
+        if old is urls or old == urls:
+            return
+        self._unlink(page)
+        directory = page_directory(page)
+        targets = {}
+        for url in urls:
+            target = link_target(url, directory)
+            if target is not None:
+                targets[url] = target
+                self._inbound.setdefault(target, set()).add(page)
+        self._urls[page] = urls
+        self._targets[page] = targets
+        self._dirty.add(page)
+
+    def _unlink(self, page: str):
+        for target in self._targets.pop(page, {}).values():
+            linking = self._inbound.get(target)
+            if linking is not None:
+                linking.discard(page)
+                if not linking:
+                    del self._inbound[target]
+        self._urls.pop(page, None)
+        self._broken.pop(page, None)
+        self._dirty.discard(page)
+
+    def prune(self, pages):
+        """Forget every page not in pages (e.g. deleted since the last build)."""
+        keep = set(pages)
+        for page in [page for page in self._targets if page not in keep]:
+            self._unlink(page)
+
+    def check(self, files) -> dict[str, list[str]]:
+        """
+        Find links that don't resolve to an output file.
+
+        Args:
+            files: Every servable file, relative to the site root
+
+        Returns:
+            Output page -> its broken URLs, for pages with any, in page order
+        """
+        files = frozenset(files)
+        if files != self._files:
+            # Only links to files that appeared or disappeared can change state
+            for rel in files - self._files:
+                for target in page_targets(rel):
+                    self._valid.add(target)
+                    self._dirty.update(self._inbound.get(target, ()))
+            for rel in self._files - files:
+                for target in page_targets(rel):
+                    self._valid.discard(target)
+                    self._dirty.update(self._inbound.get(target, ()))
+            self._files = files
+        valid = self._valid
+        for page in self._dirty:
+            broken = [url for url, target in self._targets[page].items() if target not in valid]
+            if broken:
+                self._broken[page] = broken
+            else:
+                self._broken.pop(page, None)
+        self._dirty.clear()
+        return {page: self._broken[page] for page in sorted(self._broken)}
+
+    def orphans(self, pages) -> list[str]:
+        """
+        Pages no other page links to. The home page is never an orphan.
+
+        Args:
+            pages: Output pages to consider, e.g. the content pages of a build
+        """
+        orphans = []
+        for page in pages:
+            if page == "index.html":
+                continue
+            linked = False
+            for target in page_targets(page):
+                linking = self._inbound.get(target)
+                if linking and (len(linking) > 1 or page not in linking):
+                    linked = True
+                    break
+            if not linked:
+                orphans.append(page)
+        return sorted(orphans)
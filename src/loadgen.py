@@ -0,0 +1,125 @@
+import argparse
+import http.client
+import math
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (0.0 if empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, min(len(ordered), math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def run_load(base_url: str, paths: list[str], concurrency: int = 8, requests: int = 1000,
+             headers: dict[str, str] = None) -> dict:
+    """
+    Drive an HTTP server with keep-alive connections and measure throughput.
+
+    Each worker thread holds one persistent connection and cycles through
+    paths until the shared request budget is used up.
+
+    Args:
+        base_url: e.g. "http://127.0.0.1:8888"
+        paths: URL paths to request in round-robin order
+        concurrency: Number of concurrent connections
+        requests: Total number of requests to send
+        headers: Extra request headers (e.g. Accept-Encoding)
+
+    Returns:
+        Dict with requests, errors, seconds, rps, p50_ms, p99_ms, bytes and statuses
+    """
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    headers = headers or {}
+    remaining = [requests]
+    lock = threading.Lock()
+    latencies = []
+    statuses = {}
+    totals = {"errors": 0, "bytes": 0}
+
+    def worker(worker_id: int):
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local_latencies = []
+        local_statuses = {}
+        local_bytes = 0
+        local_errors = 0
+        i = worker_id
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            path = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+                continue
+            local_latencies.append(time.perf_counter() - start)
+            local_statuses[response.status] = local_statuses.get(response.status, 0) + 1
+            local_bytes += len(body)
+        conn.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+            totals["bytes"] += local_bytes
+            totals["errors"] += local_errors
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": totals["errors"],
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "bytes": totals["bytes"],
+        "statuses": statuses,
+    }
+
+
+def print_load_report(result: dict):
+    print(
+        f"{result['requests']} requests in {result['seconds']:.2f}s: {result['rps']:.0f} req/s, "
+        f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+        f"{result['bytes']:,} bytes, {result['errors']} errors, statuses {result['statuses']}"
+    )
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Keep-alive HTTP load generator.")
+    parser.add_argument("base_url", help='server to load, e.g. "http://127.0.0.1:8888"')
+    parser.add_argument("paths", nargs="*", default=["/"], help="URL paths to request (default: /)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="concurrent connections (default: 8)")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="total requests (default: 2000)")
+    parser.add_argument("-H", "--header", action="append", default=[], help='extra header, e.g. "Accept-Encoding: gzip"')
+    args = parser.parse_args(argv)
+
+    headers = {}
+    for header in args.header:
+        name, _, value = header.partition(":")
+        headers[name.strip()] = value.strip()
+    print_load_report(run_load(args.base_url, args.paths, args.concurrency, args.requests, headers))
+
+
+if __name__ == "__main__":
+    main()
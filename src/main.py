@@ -1,84 +1,18 @@
-import os
-import sys
-import shutil
+import argparse
 from pathlib import Path
-from block_markdown import markdown_to_html_node
+from block_markdown import extract_title
+from content_collections import DEFAULT_PER_PAGE, Collection
+from memory_report import build_memory_report, print_memory_report, write_memory_report
+from page_profile import PageProfiler
+from search_index import SearchIndex
+from site_builder import Site, copy_directory_contents, render_markdown_page
+from template import Template
+import metrics
+import tracing
 
-
-def extract_title(markdown: str) -> str:
-    """
-    Extract the h1 header from markdown text.
-    
-    Args:
-        markdown: The markdown content to search through
-        
-    Returns:
-        The text content of the h1 header (without the # and whitespace)
-        
-    Raises:
-        ValueError: If no h1 header is found
-    """
-    lines = markdown.split('\n')
-    for line in lines:
-        stripped_line = line.strip()
-        if stripped_line.startswith('# '):
-            # Remove "# " and any additional whitespace
-            title = stripped_line[2:].strip()
-            if title:  # Ensure title is not empty
-                return title
-    
-    raise ValueError("No h1 header found in markdown content")
-
-
-def copy_directory_contents(src_dir: str, dest_dir: str):
-    """
-    Recursively copy all contents from source directory to destination directory.
-    First deletes all contents of destination directory to ensure a clean copy.
-    
-    Args:
-        src_dir: Source directory path
-        dest_dir: Destination directory path
-    """
-    # Convert to Path objects for easier manipulation
-    src_path = Path(src_dir)
-    dest_path = Path(dest_dir)
-    
-    # Check if source directory exists
-    if not src_path.exists():
-        raise ValueError(f"Source directory does not exist: {src_dir}")
-    
-    if not src_path.is_dir():
-        raise ValueError(f"Source path is not a directory: {src_dir}")
-    
-    # Delete destination directory contents if it exists
-    if dest_path.exists():
-        print(f"Deleting contents of {dest_dir}...")
-        shutil.rmtree(dest_path)
-    
-    # Create destination directory
-    dest_path.mkdir(parents=True, exist_ok=True)
-    print(f"Created destination directory: {dest_dir}")
-    
-    # Recursively copy all files and directories
-    def copy_recursive(src: Path, dest: Path):
-        """Helper function to recursively copy files and directories."""
-        for item in src.iterdir():
-            src_item = src / item.name
-            dest_item = dest / item.name
-            
-            if src_item.is_file():
-                # Copy file
-                shutil.copy2(src_item, dest_item)
-                print(f"Copied file: {dest_item}")
-            elif src_item.is_dir():
-                # Create directory and recurse
-                dest_item.mkdir(parents=True, exist_ok=True)
-                print(f"Created directory: {dest_item}")
-                copy_recursive(src_item, dest_item)
-    
-    # Start recursive copy
-    copy_recursive(src_path, dest_path)
-    print(f"Successfully copied all contents from {src_dir} to {dest_dir}")
+# extract_title, copy_directory_contents and the two generators below were
+# the build's entry points before it moved to Site; they stay importable
+# from main for scripts written against them.
 
 
 def generate_page(from_path: str, template_path: str, dest_path: str, basepath: str = "/"):
@@ -87,57 +21,25 @@ def generate_page(from_path: str, template_path: str, dest_path: str, basepath:
     
     Args:
         from_path: Path to the markdown file
-        template_path: Path to the HTML template file  
+        template_path: Path to the HTML template file
         dest_path: Path where the generated HTML file should be written
         basepath: Base path for the site (e.g., "/" or "/REPO_NAME/")
     """
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-    
-    # Read markdown file
     with open(from_path, 'r', encoding='utf-8') as f:
         markdown_content = f.read()
-    
-    # Read template file
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
-    
-    # Convert markdown to HTML
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
-    
-    # Extract title from markdown
-    title = extract_title(markdown_content)
-    
-    # Replace placeholders in template
-    final_html = template_content.replace("{{ Title }}", title)
-    final_html = final_html.replace("{{ Content }}", html_content)
-    
-    # Replace href="/ and src="/ with basepath
-    # Ensure basepath ends with / for proper replacement
-    if not basepath.endswith("/"):
-        basepath = basepath + "/"
-    
-    # Replace href="/ with href="{basepath}
-    final_html = final_html.replace('href="/', f'href="{basepath}')
-    # Replace src="/ with src="{basepath}
-    final_html = final_html.replace('src="/', f'src="{basepath}')
-    
-    # Create destination directory if it doesn't exist
-    dest_dir = os.path.dirname(dest_path)
-    if dest_dir:
-        os.makedirs(dest_dir, exist_ok=True)
-    
-    # Write final HTML to destination
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(final_html)
-    
-    print(f"Page generated successfully at {dest_path}")
+    html = render_markdown_page(markdown_content, Template.from_file(template_path, basepath=basepath))
+    dest = Path(dest_path)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_text(html, encoding='utf-8')
 
 
 def generate_pages_recursive(dir_path_content: str, template_path: str, dest_dir_path: str, basepath: str = "/"):
     """
     Recursively generate HTML pages from all markdown files in the content directory.
     
+    Only the pages are written; Site.build() also copies static files,
+    fingerprints assets and writes listings, sitemaps and feeds.
+    
     Args:
         dir_path_content: Path to the content directory containing markdown files
         template_path: Path to the HTML template file
@@ -145,104 +47,102 @@ def generate_pages_recursive(dir_path_content: str, template_path: str, dest_dir
         basepath: Base path for the site (e.g., "/" or "/REPO_NAME/")
     """
     content_path = Path(dir_path_content)
-    template_path_obj = Path(template_path)
-    dest_path = Path(dest_dir_path)
-    
-    # Verify content directory exists
-    if not content_path.exists():
-        raise ValueError(f"Content directory does not exist: {dir_path_content}")
-    
     if not content_path.is_dir():
-        raise ValueError(f"Content path is not a directory: {dir_path_content}")
-    
-    # Verify template exists
-    if not template_path_obj.exists():
-        raise ValueError(f"Template file does not exist: {template_path}")
-    
-    # Read template once (it's the same for all pages)
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
-    
-    # Ensure basepath ends with / for proper replacement
-    if not basepath.endswith("/"):
-        basepath = basepath + "/"
-    
-    # Recursively walk through content directory
-    def process_directory(current_content_dir: Path, current_dest_dir: Path):
-        """Recursively process directories and generate HTML from markdown files."""
-        # Ensure destination directory exists
-        current_dest_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Process all items in current directory
-        for item in current_content_dir.iterdir():
-            content_item = current_content_dir / item.name
-            
-            if content_item.is_file() and content_item.suffix == '.md':
-                # Found a markdown file, generate HTML
-                # Replace .md extension with .html
-                dest_file = current_dest_dir / (content_item.stem + '.html')
-                
-                # Read markdown file
-                with open(content_item, 'r', encoding='utf-8') as f:
-                    markdown_content = f.read()
-                
-                # Convert markdown to HTML
-                html_node = markdown_to_html_node(markdown_content)
-                html_content = html_node.to_html()
-                
-                # Extract title from markdown
-                title = extract_title(markdown_content)
-                
-                # Replace placeholders in template
-                final_html = template_content.replace("{{ Title }}", title)
-                final_html = final_html.replace("{{ Content }}", html_content)
-                
-                # Replace href="/ and src="/ with basepath
-                final_html = final_html.replace('href="/', f'href="{basepath}')
-                final_html = final_html.replace('src="/', f'src="{basepath}')
-                
-                # Write final HTML to destination
-                with open(dest_file, 'w', encoding='utf-8') as f:
-                    f.write(final_html)
-                
-                print(f"Generated: {dest_file}")
-                
-            elif content_item.is_dir():
-                # Found a directory, recurse into it
-                dest_subdir = current_dest_dir / item.name
-                process_directory(content_item, dest_subdir)
-    
-    # Start recursive processing
-    process_directory(content_path, dest_path)
-    print(f"Successfully generated all pages from {dir_path_content} to {dest_dir_path}")
+        raise ValueError(f"Content directory does not exist: {dir_path_content}")
+    # Static files are copied into the destination first, so image sizes are read from there
+    site = Site(content_path, dest_dir_path, template_path, dest_dir_path, basepath=basepath)
+    for page in sorted(content_path.rglob("*.md")):
+        dest = Path(dest_dir_path) / page.relative_to(content_path).with_suffix(".html")
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_text(site.render_page(page), encoding='utf-8')
 
 
-def main():
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    """Parse the build's command line options."""
+    parser = argparse.ArgumentParser(description="Build the static site into docs/.")
+    parser.add_argument("basepath", nargs="?", default="/", help='base path for the site (e.g. "/" or "/REPO_NAME/")')
+    parser.add_argument("--minify", action="store_true", help="minify the HTML template and copied CSS")
+    parser.add_argument("--trace", metavar="OUT_JSON", help="write a Chrome/Perfetto trace of the build stages")
+    parser.add_argument("--profile-pages", action="store_true", help="report the slowest pages and cProfile a sample of them")
+    parser.add_argument("--profile-top", type=int, default=10, metavar="N", help="number of slowest pages to report (default: 10)")
+    parser.add_argument("--profile-sample", type=int, default=3, metavar="N", help="number of slowest pages to cProfile (default: 3)")
+    parser.add_argument("--profile-dir", metavar="DIR", help="where to write .prof files (default: .cache/profiles)")
+    parser.add_argument("--memory-report", metavar="OUT_JSON", help="measure per-stage memory on the largest pages and write a JSON report")
+    parser.add_argument("--metrics-textfile", metavar="PATH", help="write build counters as a node-exporter textfile (e.g. .../static_site.prom)")
+    parser.add_argument("--memory-pages", type=int, default=3, metavar="N", help="number of largest pages to measure (default: 3)")
+    parser.add_argument("--memory-workers", type=int, default=0, metavar="N", help="worker processes to measure pages in, each reporting its peak RSS (default: 0, in-process)")
+    parser.add_argument("--collection", action="append", metavar="DIR", help="content directory to generate index, archive and tag pages for (default: blog, if it exists)")
+    parser.add_argument("--per-page", type=int, default=DEFAULT_PER_PAGE, metavar="N", help=f"posts per generated listing page (default: {DEFAULT_PER_PAGE})")
+    parser.add_argument("--site-url", metavar="URL", help="absolute URL the site is published at (e.g. https://example.com/REPO_NAME/); enables sitemaps, feeds and robots.txt")
+    parser.add_argument("--author", metavar="NAME", help="author named in collection feeds (default: the collection's title)")
+    parser.add_argument("--search", action="store_true", help="write a sharded client-side search index to search/")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] = None, project_root: Path = None):
     # Get basepath from CLI argument, default to "/"
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
+    args = parse_args(argv)
+    basepath = args.basepath
     print(f"Using basepath: {basepath}")
+    tracer = tracing.enable() if args.trace else None
     
-    # Get project root
-    project_root = Path(__file__).parent.parent
+    # Get project root (overridable so benchmarks can build a generated site)
+    if project_root is None:
+        project_root = Path(__file__).parent.parent
+    project_root = Path(project_root)
     
     # Use docs directory for output (GitHub Pages)
     output_dir = project_root / "docs"
-    if output_dir.exists():
-        print(f"Deleting docs directory: {output_dir}")
-        shutil.rmtree(output_dir)
-    
-    # Copy static files to docs directory
-    static_dir = project_root / "static"
-    print("Starting static file copy...")
-    copy_directory_contents(str(static_dir), str(output_dir))
-    print("Static file copy complete!")
-    
-    # Generate all pages recursively from markdown files
     content_dir = project_root / "content"
-    template_path = project_root / "template.html"
-    
-    print("Starting page generation...")
-    generate_pages_recursive(str(content_dir), str(template_path), str(output_dir), basepath)
+    cache_dir = project_root / ".cache"
+    directories = args.collection
+    if directories is None:
+        directories = ["blog"] if (content_dir / "blog").is_dir() else []
+    site = Site(
+        content_dir, project_root / "static", project_root / "template.html", output_dir,
+        basepath=basepath, cache_dir=cache_dir, minify=args.minify, log=print,
+        collections=[Collection(directory, per_page=args.per_page) for directory in directories],
+        search=SearchIndex() if args.search else None, site_url=args.site_url,
+        author=args.author,
+    )
+    
+    page_profiler = None
+    if args.profile_pages:
+        profile_dir = args.profile_dir or str(cache_dir / "profiles")
+        page_profiler = PageProfiler(args.profile_top, args.profile_sample, profile_dir)
+    
+    print("Starting site build...")
+    result = site.build(page_profiler=page_profiler)
+    if result.minify_stats is not None:
+        result.minify_stats.report(print)
+    for stage, seconds in result.timings.items():
+        print(f"{stage}: {seconds * 1000:.1f} ms")
+    print(f"Built {len(result.pages)} pages, {len(result.changed)} files changed, {len(result.removed)} removed")
+    if result.broken_links or result.orphans:
+        broken = sum(len(urls) for urls in result.broken_links.values())
+        print(f"Found {broken} broken links and {len(result.orphans)} orphan pages")
+    
+    if args.memory_report:
+        # tracemalloc slows everything down, so it only runs on the largest pages
+        print("Starting memory report...")
+        report = build_memory_report(str(content_dir), pages=args.memory_pages, workers=args.memory_workers)
+        print_memory_report(report)
+        write_memory_report(report, args.memory_report)
+        print(f"Wrote memory report to {args.memory_report}")
+    
+    if args.metrics_textfile:
+        metrics.write_textfile(args.metrics_textfile)
+        print(f"Wrote build metrics to {args.metrics_textfile}")
+    
+    if tracer is not None:
+        tracer.write(args.trace)
+        tracing.disable()
+        print(f"Wrote build trace to {args.trace}")
+    
+    if not result.ok:
+        for path, message in result.errors:
+            print(f"Error: {path}: {message}")
+        raise ValueError(f"{len(result.errors)} pages failed to render")
     print("Site generation complete!")
 
 
@@ -0,0 +1,219 @@
+import json
+import os
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from block_markdown import block_to_html_node, extract_link_definitions, parse_blocks, parse_inline
+from front_matter import split_front_matter
+from htmlnode import ParentNode
+
+try:
+    import resource
+except ImportError:  # not available on Windows; RSS figures are reported as None
+    resource = None
+
+
+# Keep tracemalloc's own bookkeeping out of the allocation-site listings
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+]
+
+
+def peak_rss_kb() -> int | None:
+    """Return the process's peak resident set size in KiB, if known."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def current_rss_kb() -> int | None:
+    """Return the process's current resident set size in KiB (Linux only)."""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def _difference(after: int | None, before: int | None) -> int | None:
+    return after - before if after is not None and before is not None else None
+
+
+def measure_stage(name: str, func, top_sites: int = 10) -> tuple[object, dict]:
+    """
+    Run func() between two tracemalloc snapshots.
+
+    The result is kept alive until the second snapshot, so the retained
+    figure shows how much memory the stage's output (TextNode lists,
+    ParentNode trees, HTML strings) holds on to. RSS is recorded as the
+    change over the stage, and as how far the stage raised the process's
+    peak: the peak itself only ever grows, so it can't be compared
+    between stages.
+
+    Returns:
+        (func's result, stage record dict)
+    """
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    base_current, _ = tracemalloc.get_traced_memory()
+    rss_before = current_rss_kb()
+    peak_rss_before = peak_rss_kb()
+
+    result = func()
+
+    current, peak = tracemalloc.get_traced_memory()
+    rss_after = current_rss_kb()
+    peak_rss_after = peak_rss_kb()
+    after = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    sites = after.compare_to(before, "lineno")[:top_sites]
+    record = {
+        "stage": name,
+        "pid": os.getpid(),
+        "retained_bytes": current - base_current,
+        "peak_bytes": peak - base_current,
+        "rss_kb": rss_after,
+        "rss_delta_kb": _difference(rss_after, rss_before),
+        "peak_rss_growth_kb": _difference(peak_rss_after, peak_rss_before),
+        "top_sites": [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+            }
+            for stat in sites
+            if stat.size_diff > 0
+        ],
+    }
+    return result, record
+
+
+def measure_page(markdown: str, top_sites: int = 10) -> list[dict]:
+    """
+    Measure memory for each render stage of a single markdown document.
+
+    Stages are the ones markdown_to_html_node runs, with inline parsing
+    split out of building the tree: parse_blocks (with link definitions
+    taken out), text_to_textnodes over every paragraph and heading (the
+    TextNode lists), block_to_html_node (the ParentNode tree) and to_html
+    (the output string). tracemalloc is started if it isn't running
+    already.
+
+    Returns:
+        List of stage records in pipeline order
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        def parse():
+            document = parse_blocks(markdown)
+            definitions = extract_link_definitions(document) if "]:" in markdown else None
+            return document, definitions
+        (document, definitions), blocks_record = measure_stage("parse_blocks", parse, top_sites)
+        _, inline_record = measure_stage(
+            "text_to_textnodes", lambda: parse_inline(document, definitions), top_sites,
+        )
+        html_node, tree_record = measure_stage(
+            "block_to_html_node",
+            lambda: ParentNode("div", [block_to_html_node(block, None, definitions) for block in document.children]),
+            top_sites,
+        )
+        html, html_record = measure_stage("to_html", html_node.to_html, top_sites)
+        del html, html_node, document
+    finally:
+        if started:
+            tracemalloc.stop()
+    return [blocks_record, inline_record, tree_record, html_record]
+
+
+def largest_pages(content_dir: str, count: int) -> list[Path]:
+    """Return the count largest markdown files under content_dir."""
+    pages = [path for path in Path(content_dir).rglob("*.md") if path.is_file()]
+    pages.sort(key=lambda path: path.stat().st_size, reverse=True)
+    return pages[:count]
+
+
+def measure_file(path: str, content_dir: str, top_sites: int = 10) -> dict:
+    """
+    Measure one page file; the unit of work sent to pool workers.
+
+    Returns:
+        Page entry of the report, with the pid and peak RSS of the process
+        that measured it
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        markdown = f.read()
+    return {
+        "path": Path(path).relative_to(content_dir).as_posix(),
+        "bytes": len(markdown.encode('utf-8')),
+        # Only the body goes through the markdown stages, as in a build
+        "stages": measure_page(split_front_matter(markdown)[1], top_sites),
+        "pid": os.getpid(),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def build_memory_report(content_dir: str, pages: int = 3, top_sites: int = 10, workers: int = 0) -> dict:
+    """
+    Measure per-stage memory on the largest pages of a site.
+
+    Args:
+        content_dir: Directory containing the markdown sources
+        pages: How many of the largest pages to measure
+        top_sites: Allocation sites to keep per stage
+        workers: Number of worker processes to spread the pages over; 0
+            measures them in this process
+
+    Returns:
+        Report dict with one entry per measured page, and per process that
+        measured pages its pid, pages and peak RSS under "workers"
+
+    Raises:
+        ValueError: If a page has invalid front matter
+    """
+    paths = [str(path) for path in largest_pages(content_dir, pages)]
+    if workers <= 0:
+        entries = [measure_file(path, content_dir, top_sites) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(measure_file, paths, [content_dir] * len(paths), [top_sites] * len(paths)))
+
+    by_pid = {}
+    for entry in entries:
+        worker = by_pid.setdefault(entry["pid"], {"pid": entry["pid"], "pages": [], "peak_rss_kb": None})
+        worker["pages"].append(entry["path"])
+        if entry["peak_rss_kb"] is not None:
+            worker["peak_rss_kb"] = max(worker["peak_rss_kb"] or 0, entry["peak_rss_kb"])
+    return {
+        "pid": os.getpid(),
+        "pages": entries,
+        "workers": list(by_pid.values()),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def print_memory_report(report: dict, sites: int = 3):
+    """Print per-stage memory figures and the top allocation sites."""
+    for page in report["pages"]:
+        print(f"Memory for {page['path']} ({page['bytes']:,} bytes of markdown):")
+        for stage in page["stages"]:
+            line = f"  {stage['stage']:<22} retained {stage['retained_bytes']:>10,} B  peak {stage['peak_bytes']:>10,} B"
+            if stage["rss_delta_kb"] is not None:
+                line += f"  rss {stage['rss_kb']} KiB ({stage['rss_delta_kb']:+} KiB)"
+            if stage["peak_rss_growth_kb"] is not None:
+                line += f"  peak rss +{stage['peak_rss_growth_kb']} KiB"
+            print(line)
+            for site in stage["top_sites"][:sites]:
+                print(f"      {site['size_diff']:>10,} B in {site['count_diff']:>6,} blocks  {site['site']}")
+    for worker in report["workers"]:
+        print(f"Worker {worker['pid']}: {len(worker['pages'])} pages, peak RSS {worker['peak_rss_kb']} KiB")
+    print(f"Process peak RSS: {report['peak_rss_kb']} KiB")
+
+
+def write_memory_report(report: dict, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
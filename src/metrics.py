@@ -0,0 +1,95 @@
+import os
+
+
+# name -> (help text, label names)
+METRICS = {
+    "static_site_pages_rendered_total": ("Markdown pages rendered to HTML.", ()),
+    "static_site_blocks_total": ("Markdown blocks parsed, by block type.", ("type",)),
+    "static_site_textnodes_total": ("TextNodes produced by inline parsing, by text type.", ("type",)),
+    "static_site_htmlnodes_created_total": ("HTMLNode objects created.", ()),
+    "static_site_regex_invocations_total": ("Regex scans for inline images and links.", ("function",)),
+    "static_site_read_bytes_total": ("Markdown bytes read.", ()),
+    "static_site_written_bytes_total": ("HTML bytes written.", ()),
+    "static_site_cache_requests_total": ("Build cache lookups.", ("cache", "result")),
+    "static_site_static_files_total": ("Static files seen by the copy stage.", ("outcome",)),
+}
+
+# Counters live in one flat dict keyed by (metric, label values) so the hot
+# path is a single dict update with no locking or object allocation. Updates
+# from worker threads are not locked either; a rare lost increment is an
+# acceptable price for leaving counting on in production.
+_counters = {}
+
+
+def inc(name: str, labels=(), amount: int = 1):
+    """
+    Add amount to a counter.
+
+    Args:
+        name: Metric name from METRICS
+        labels: Label value (str) for single-label metrics, or a tuple of
+            values in the order of the metric's label names
+        amount: Increment
+    """
+    key = (name, labels)
+    _counters[key] = _counters.get(key, 0) + amount
+
+
+def get(name: str, labels=()) -> int:
+    return _counters.get((name, labels), 0)
+
+
+def reset():
+    """Zero every counter (used in tests)."""
+    _counters.clear()
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_textfile() -> str:
+    """
+    Render all counters in the Prometheus text exposition format read by
+    the node-exporter textfile collector.
+    """
+    lines = []
+    for name, (help_text, label_names) in METRICS.items():
+        samples = sorted(
+            ((labels,) if isinstance(labels, str) else labels, value)
+            for (metric, labels), value in _counters.items()
+            if metric == name
+        )
+        if not samples and not label_names:
+            samples = [((), 0)]
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for values, value in samples:
+            labels = ",".join(
+                f'{label_name}="{_escape_label(label)}"' for label_name, label in zip(label_names, values)
+            )
+            lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str):
+    """
+    Write the counters to a node-exporter textfile.
+
+    The file is written to a temporary name and renamed into place, so the
+    collector never scrapes a half-written file.
+    """
+    # tempfile pulls in random and shutil, so keep it off the render path
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(render_textfile())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
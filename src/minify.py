@@ -0,0 +1,222 @@
+import os
+import re
+from pathlib import Path
+
+from build_cache import ContentCache, content_hash
+
+
+# Elements whose contents are whitespace-sensitive and must be left untouched
+PRESERVE_TAGS = ("pre", "code", "textarea", "script", "style")
+
+# Whitespace next to these tags never affects rendering, so it can be dropped
+BLOCK_TAGS = {
+    "!doctype", "html", "head", "body", "title", "meta", "link", "base", "script", "style",
+    "article", "section", "nav", "header", "footer", "main", "aside", "div", "p",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "blockquote", "pre", "hr", "br",
+    "table", "thead", "tbody", "tfoot", "tr", "td", "th", "figure", "figcaption", "form",
+}
+
+HTML_TOKEN_PATTERN = re.compile(
+    r"<!--.*?-->"
+    r"|<(" + "|".join(PRESERVE_TAGS) + r")\b[^>]*>.*?</\1\s*>"
+    r"|<[^>]+>",
+    re.S | re.I,
+)
+TAG_NAME_PATTERN = re.compile(r"<\s*/?\s*([!a-zA-Z][\w:-]*)")
+START_TAG_PATTERN = re.compile(
+    r"<([a-zA-Z][\w:-]*)"
+    r"((?:\s+[^\s=/>\"']+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'=<>`]+))?)*)"
+    r"\s*/?\s*>$"
+)
+ATTRIBUTE_PATTERN = re.compile(r"([^\s=/>\"']+)(?:\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s\"'=<>`]+))?")
+# Values that can be written without quotes; a trailing "/" is excluded so it
+# can't be mistaken for a self-closing marker
+UNQUOTED_VALUE_PATTERN = re.compile(r"[A-Za-z0-9_.:,#+/-]*[A-Za-z0-9_.:,#+-]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+CSS_TOKEN_PATTERN = re.compile(
+    r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')"
+    r"|(/\*.*?\*/)"
+    r"|(\s+)"
+    r"|([^\"'/\s]+|/)",
+    re.S,
+)
+# Whitespace before or after these characters is insignificant in CSS
+CSS_TIGHT_BEFORE = set("{};,>")
+CSS_TIGHT_AFTER = set("{};,>:(")
+
+
+def _tag_name(tag: str) -> str:
+    match = TAG_NAME_PATTERN.match(tag)
+    return match.group(1).lower() if match else ""
+
+
+def minify_tag(tag: str) -> str:
+    """
+    Minify a single start tag: collapse whitespace, drop quotes from values
+    that don't need them and drop the redundant "/" on void elements.
+
+    Tags that don't parse cleanly are only whitespace-collapsed.
+    """
+    match = START_TAG_PATTERN.match(tag)
+    if not match:
+        return WHITESPACE_PATTERN.sub(" ", tag).replace("< ", "<").replace(" >", ">")
+
+    parts = ["<", match.group(1)]
+    for attr in ATTRIBUTE_PATTERN.finditer(match.group(2)):
+        name, value = attr.group(1), attr.group(2)
+        parts.append(" " + name)
+        if value is None:
+            continue
+        if value[0] in "\"'":
+            inner = value[1:-1]
+            if UNQUOTED_VALUE_PATTERN.fullmatch(inner):
+                value = inner
+        parts.append("=" + value)
+    parts.append(">")
+    return "".join(parts)
+
+
+def minify_html(html: str) -> str:
+    """
+    Minify an HTML document.
+
+    Runs of whitespace collapse to one space, whitespace next to block-level
+    tags is removed, comments are dropped and attribute quoting is relaxed
+    where it is safe. <pre>, <code>, <textarea>, <script> and <style> elements
+    are copied through verbatim.
+
+    Args:
+        html: HTML source (for example the page template)
+
+    Returns:
+        Minified HTML string
+    """
+    # Tokenize into ("text" | "tag" | "raw", value, tag_name) triples
+    tokens = []
+    pos = 0
+    for match in HTML_TOKEN_PATTERN.finditer(html):
+        if match.start() > pos:
+            tokens.append(("text", WHITESPACE_PATTERN.sub(" ", html[pos:match.start()]), ""))
+        token = match.group(0)
+        pos = match.end()
+        if token.startswith("<!--"):
+            continue
+        if match.group(1):
+            tokens.append(("raw", token, match.group(1).lower()))
+        elif token.startswith("</") or token.startswith("<!"):
+            tokens.append(("tag", WHITESPACE_PATTERN.sub(" ", token).replace(" >", ">"), _tag_name(token)))
+        else:
+            tokens.append(("tag", minify_tag(token), _tag_name(token)))
+    if pos < len(html):
+        tokens.append(("text", WHITESPACE_PATTERN.sub(" ", html[pos:]), ""))
+
+    out = []
+    for i, (kind, value, name) in enumerate(tokens):
+        if kind != "text":
+            out.append(value)
+            continue
+        prev_name = tokens[i - 1][2] if i > 0 else "!doctype"
+        next_name = tokens[i + 1][2] if i + 1 < len(tokens) else "!doctype"
+        if prev_name in BLOCK_TAGS:
+            value = value.lstrip(" ")
+        if next_name in BLOCK_TAGS:
+            value = value.rstrip(" ")
+        if value:
+            out.append(value)
+    return "".join(out)
+
+
+def minify_css(css: str) -> str:
+    """
+    Minify a stylesheet by dropping comments and insignificant whitespace.
+
+    Strings are preserved verbatim and /*! ... */ license comments are kept.
+    """
+    out = []
+    pending_space = False
+    for string, comment, space, other in CSS_TOKEN_PATTERN.findall(css):
+        if comment:
+            if comment.startswith("/*!"):
+                out.append(comment)
+            else:
+                pending_space = True
+            continue
+        if space:
+            pending_space = True
+            continue
+        token = string or other.replace(";}", "}")
+        if pending_space and out:
+            last = out[-1][-1]
+            if last not in CSS_TIGHT_AFTER and token[0] not in CSS_TIGHT_BEFORE:
+                out.append(" ")
+        pending_space = False
+        # The last declaration in a block doesn't need its semicolon
+        if token[0] == "}" and out and out[-1].endswith(";") and not string:
+            out[-1] = out[-1][:-1]
+        out.append(token)
+    return "".join(out)
+
+
+class MinifyStats:
+    """Accumulates bytes before/after minification per file type."""
+
+    def __init__(self):
+        self.by_type = {}
+
+    def add(self, suffix: str, before: int, after: int):
+        entry = self.by_type.setdefault(suffix, [0, 0, 0])
+        entry[0] += 1
+        entry[1] += before
+        entry[2] += after
+
+    def report(self, log):
+        """
+        Report the bytes saved, one line per file type.
+
+        Args:
+            log: Callable that receives each line
+        """
+        for suffix, (count, before, after) in sorted(self.by_type.items()):
+            saved = before - after
+            percent = (saved / before * 100) if before else 0.0
+            log(
+                f"Minified {count} {suffix} files: {before:,} -> {after:,} bytes "
+                f"(saved {saved:,}, {percent:.1f}%)"
+            )
+
+
+def minify_static_css(output_dir: str, cache_dir: str = None, stats: MinifyStats = None) -> int:
+    """
+    Minify every .css file under output_dir in place.
+
+    Results are cached by content hash so unchanged stylesheets are not
+    minified again. The original mtime is restored so incremental hashing
+    downstream still sees the file as unchanged.
+
+    Returns:
+        Number of stylesheets minified
+    """
+    cache = ContentCache(cache_dir, "minify") if cache_dir else None
+    count = 0
+    for path in sorted(Path(output_dir).rglob("*.css")):
+        if not path.is_file():
+            continue
+        with open(path, 'rb') as f:
+            original = f.read()
+        key = content_hash(original) + ".css"
+        minified = cache.get(key) if cache is not None else None
+        if minified is None:
+            minified = minify_css(original.decode('utf-8')).encode('utf-8')
+            if cache is not None:
+                cache.put(key, minified)
+
+        stat = os.stat(path)
+        with open(path, 'wb') as f:
+            f.write(minified)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        if stats is not None:
+            stats.add(".css", len(original), len(minified))
+        count += 1
+    return count
@@ -0,0 +1,100 @@
+import cProfile
+from pathlib import Path
+
+
+class PageProfiler:
+    """
+    Collects per-page build measurements and reports the slowest pages.
+
+    Each record is a plain dict (path, seconds, bytes_in, bytes_out, nodes),
+    so records taken inside pool workers can be returned to the parent and
+    combined with merge().
+    """
+
+    def __init__(self, top_n: int = 10, sample: int = 3, output_dir: str = None):
+        self.top_n = top_n
+        self.sample = sample
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.records = []
+
+    def record(self, path: str, seconds: float, bytes_in: int, bytes_out: int, nodes: int):
+        self.records.append({
+            "path": path,
+            "seconds": seconds,
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "nodes": nodes,
+        })
+
+    def merge(self, records: list[dict]):
+        """Add records collected by another profiler (e.g. in a worker)."""
+        self.records.extend(records)
+
+    def slowest(self, n: int = None) -> list[dict]:
+        """Return the n slowest page records, slowest first."""
+        n = self.top_n if n is None else n
+        return sorted(self.records, key=lambda record: record["seconds"], reverse=True)[:n]
+
+    def report(self, log):
+        """
+        Report a summary line and a table of the slowest pages.
+
+        Args:
+            log: Callable that receives each line
+        """
+        total = sum(record["seconds"] for record in self.records)
+        log(f"Profiled {len(self.records)} pages in {total * 1000:.1f} ms")
+        log(f"{'ms':>10} {'bytes in':>10} {'bytes out':>10} {'nodes':>8}  page")
+        for record in self.slowest():
+            log(
+                f"{record['seconds'] * 1000:>10.2f} {record['bytes_in']:>10,} "
+                f"{record['bytes_out']:>10,} {record['nodes']:>8,}  {record['path']}"
+            )
+
+    def capture_profiles(self, render, log=None) -> list[Path]:
+        """
+        Re-render the sampled slowest pages under cProfile.
+
+        Pages are only profiled after the timed pass has identified them,
+        so the profiler's overhead never distorts the timings themselves.
+
+        Args:
+            render: Callable taking a page path and rendering it
+            log: Optional callable that receives a line for every file written
+
+        Returns:
+            Paths of the .prof files written
+        """
+        if self.output_dir is None or self.sample <= 0:
+            return []
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for record in self.slowest(self.sample):
+            prof_path = self.output_dir / (profile_name(record["path"]) + ".prof")
+            profile_page(render, record["path"], str(prof_path))
+            written.append(prof_path)
+            if log is not None:
+                log(f"Wrote profile: {prof_path}")
+        return written
+
+
+def profile_name(page_path: str) -> str:
+    """Turn a relative page path into a flat file name (blog/a/index.md -> blog__a__index)."""
+    parts = [part for part in Path(page_path).with_suffix("").parts if part not in ("/", "..", ".")]
+    return "__".join(parts) or "page"
+
+
+def profile_page(render, page_path: str, prof_path: str):
+    """
+    Run render(page_path) under cProfile and dump the stats to prof_path.
+
+    Self-contained so it can be submitted to a worker pool directly.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        render(page_path)
+    finally:
+        profiler.disable()
+    profiler.dump_stats(prof_path)
+
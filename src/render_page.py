@@ -0,0 +1,114 @@
+import os
+import sys
+
+# This command is spawned once per preview, so interpreter startup dominates
+# its run time. It imports only the parser and the template (no site walker,
+# caches or pathlib) and parses its few options by hand, since argparse
+# alone costs more to import than rendering a typical page.
+
+USAGE = """usage: render_page.py [-h] [--template PATH] [--basepath PATH] [-o OUT] MARKDOWN
+
+Render one markdown file with the page template.
+
+positional arguments:
+  MARKDOWN         markdown file to render ("-" for stdin)
+
+options:
+  -h, --help       show this help message and exit
+  --template PATH  page template (default: template.html in the project root)
+  --basepath PATH  base path for the site (default: /)
+  -o, --output OUT write the page to OUT instead of stdout
+"""
+
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "template.html")
+
+VALUE_OPTIONS = {"--template": "template", "--basepath": "basepath", "-o": "output", "--output": "output"}
+
+
+def render_file(markdown: str, template_path: str = DEFAULT_TEMPLATE, basepath: str = "/") -> str:
+    """
+    Render a markdown document into a complete page.
+
+    Produces the same HTML as a site build of the page, without image
+    dimensions or fingerprinted asset URLs (both need the built site).
+
+    Raises:
+        ValueError: If the page has no title, invalid front matter or no blocks
+    """
+    from block_markdown import markdown_to_html
+    from front_matter import complete_metadata, placeholder_values, split_front_matter
+    from template import Template, apply_basepath
+    from toc import TableOfContents
+
+    template = Template.from_file(template_path, basepath=basepath)
+    metadata, body = split_front_matter(markdown)
+    toc = TableOfContents()
+    content = apply_basepath(markdown_to_html(body, toc), basepath)
+    values = placeholder_values(complete_metadata(metadata, toc.title()))
+    values["Content"] = content
+    values["TOC"] = toc.to_html()
+    return template.render(values)
+
+
+def parse_args(argv: list[str]) -> dict:
+    """
+    Parse the command line.
+
+    Raises:
+        ValueError: On unknown options, missing values or a missing MARKDOWN
+    """
+    options = {"template": DEFAULT_TEMPLATE, "basepath": "/", "output": None, "source": None, "help": False}
+    args = iter(argv)
+    for arg in args:
+        if arg in ("-h", "--help"):
+            options["help"] = True
+        elif arg in VALUE_OPTIONS:
+            value = next(args, None)
+            if value is None:
+                raise ValueError(f"argument {arg}: expected one argument")
+            options[VALUE_OPTIONS[arg]] = value
+        elif arg.startswith("-") and arg != "-":
+            raise ValueError(f"unrecognized arguments: {arg}")
+        elif options["source"] is None:
+            options["source"] = arg
+        else:
+            raise ValueError(f"unrecognized arguments: {arg}")
+    if options["source"] is None and not options["help"]:
+        raise ValueError("the following arguments are required: MARKDOWN")
+    return options
+
+
+def main(argv: list[str] = None) -> int:
+    try:
+        options = parse_args(sys.argv[1:] if argv is None else argv)
+    except ValueError as e:
+        sys.stderr.write(f"{USAGE.splitlines()[0]}\nrender_page.py: error: {e}\n")
+        return 2
+    if options["help"]:
+        sys.stdout.write(USAGE)
+        return 0
+
+    try:
+        if options["source"] == "-":
+            markdown = sys.stdin.read()
+        else:
+            with open(options["source"], 'r', encoding='utf-8') as f:
+                markdown = f.read()
+        page = render_file(markdown, options["template"], options["basepath"])
+    except OSError as e:
+        sys.stderr.write(f"render_page.py: error: {e}\n")
+        return 1
+    except ValueError as e:
+        sys.stderr.write(f"render_page.py: error: {options['source']}: {e}\n")
+        return 1
+
+    if options["output"] is None:
+        sys.stdout.write(page)
+    else:
+        with open(options["output"], 'w', encoding='utf-8') as f:
+            f.write(page)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+import argparse
+import os
+import posixpath
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+import metrics
+from server import StaticSiteHandler, StaticSiteServer
+from site_builder import render_markdown_page
+from template import Template
+
+
+# Default budget for rendered pages kept in memory
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class _Flight:
+    """A render in progress that other requests for the same key can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class RenderCache:
+    """
+    Size-bounded LRU of rendered pages with request coalescing.
+
+    Keys include the source file's mtime, so an edited page misses and its
+    stale entry ages out of the LRU. When several threads miss on the same
+    key at once, only the first renders; the rest wait for its result.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_render(self, key, render) -> bytes:
+        """
+        Return the cached value for key, calling render() on a miss.
+
+        Args:
+            key: Hashable cache key, e.g. (path, mtime_ns)
+            render: Zero-argument callable returning the page bytes
+
+        Raises:
+            BaseException: Whatever render() raised, for the leader and
+                every request coalesced onto it
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.inc("static_site_cache_requests_total", ("render", "hit"))
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+                metrics.inc("static_site_cache_requests_total", ("render", "miss"))
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = render()
+        except BaseException as e:
+            # Including KeyboardInterrupt and SystemExit, so nothing is
+            # cached and waiters don't get a value that was never made
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None:
+                    self._store(key, flight.value)
+            flight.done.set()
+        return flight.value
+
+    def _store(self, key, value: bytes):
+        # Called with the lock held
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+
+class RenderHandler(StaticSiteHandler):
+    """
+    Renders content/ markdown per request; anything that isn't a page is
+    served from the static directory by StaticSiteHandler.
+    """
+
+    server_version = "static-site-render"
+
+    def resolve_page(self, url_path: str) -> Path | None:
+        """Map a URL path to the markdown file it renders from, or None."""
+        path = posixpath.normpath(unquote(url_path))
+        parts = [part for part in path.split("/") if part]
+        if any(part.startswith(".") for part in parts):
+            return None
+        content = self.server.content_dir
+        if parts and parts[-1].endswith(".html"):
+            stem = parts[-1][:-len(".html")]
+            candidates = [content.joinpath(*parts[:-1], stem + ".md")]
+        else:
+            candidates = [content.joinpath(*parts, "index.md")]
+        for candidate in candidates:
+            if candidate.is_file():
+                return candidate
+        return None
+
+    def serve(self, send_body: bool):
+        url_path = urlsplit(self.path).path
+        page = self.resolve_page(url_path)
+        if page is None:
+            super().serve(send_body)
+            return
+
+        try:
+            mtime_ns = page.stat().st_mtime_ns
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+        rel = page.relative_to(self.server.content_dir).as_posix()
+        try:
+            body = self.server.cache.get_or_render((rel, mtime_ns), lambda: self.server.render(page))
+        except (OSError, ValueError) as e:
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Could not render {rel}: {e}")
+            return
+
+        etag = f'W/"{len(body):x}-{mtime_ns:x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+class RenderServer(StaticSiteServer):
+    """
+    Threaded keep-alive server that renders pages on demand.
+
+    The template is compiled once at startup; rendered pages are kept in a
+    RenderCache keyed by content path and mtime.
+    """
+
+    handler_class = RenderHandler
+
+    def __init__(self, address, content_dir: str, template_path: str, static_dir: str, basepath: str = "/",
+                 cache_bytes: int = DEFAULT_CACHE_BYTES, quiet: bool = False):
+        self.content_dir = Path(content_dir)
+        self.template = Template.from_file(template_path, basepath=basepath)
+        self.cache = RenderCache(cache_bytes)
+        super().__init__(address, static_dir, quiet=quiet)
+
+    def render(self, page: Path) -> bytes:
+        with open(page, 'r', encoding='utf-8') as f:
+            markdown_content = f.read()
+        return render_markdown_page(markdown_content, self.template).encode('utf-8')
+
+
+def main(argv: list[str] = None):
+    project_root = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description="Render content/ pages on demand over HTTP.")
+    parser.add_argument("basepath", nargs="?", default="/", help='base path for the site (e.g. "/" or "/REPO_NAME/")')
+    parser.add_argument("--content", default=str(project_root / "content"), help="markdown directory (default: content)")
+    parser.add_argument("--static", default=str(project_root / "static"), help="static file directory (default: static)")
+    parser.add_argument("--template", default=str(project_root / "template.html"), help="page template (default: template.html)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8888, help="port to listen on (default: 8888)")
+    parser.add_argument("--cache-mb", type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024), help="rendered page cache size in MiB (default: 64)")
+    parser.add_argument("--quiet", action="store_true", help="don't log each request")
+    args = parser.parse_args(argv)
+
+    for directory in (args.content, args.static):
+        if not os.path.isdir(directory):
+            raise ValueError(f"Directory does not exist: {directory}")
+    server = RenderServer(
+        (args.host, args.port), args.content, args.template, args.static,
+        basepath=args.basepath, cache_bytes=args.cache_mb * 1024 * 1024, quiet=args.quiet,
+    )
+    print(f"Rendering {args.content} on http://{args.host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        cache = server.cache
+        print(f"Render cache: {cache.hits} hits, {cache.misses} misses, {cache.coalesced} coalesced, "
+              f"{cache.evictions} evictions, {len(cache)} pages ({cache.size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
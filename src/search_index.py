@@ -0,0 +1,275 @@
+import heapq
+import json
+import re
+from pathlib import Path
+
+
+# Directory of the index inside the output directory
+INDEX_DIR = "search"
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Too common to be worth an index entry (they still count for positions)
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i if in into is it its "
+    "not of on or she so than that the their then there they this to was we were which "
+    "will with you".split()
+)
+
+# Terms are sharded by this many leading characters
+DEFAULT_PREFIX_LENGTH = 2
+
+# Documents (url, title) per docs/<n>.json file
+DOCS_PER_SHARD = 1000
+
+HEADING_TAGS = frozenset(f"h{level}" for level in range(1, 7))
+
+# Leaf tags from text_node_to_html_node whose text is indexed: TEXT, BOLD and ITALIC
+TEXT_TAGS = frozenset((None, "b", "i"))
+
+_SHARD_NAME = re.compile(r"[a-z0-9]+")
+
+
+def text_runs(node) -> list[tuple[str, bool]]:
+    """(text, in heading) for every text, bold and italic run in an HTMLNode tree, in document order."""
+    runs = []
+    stack = [(node, False)]
+    while stack:
+        current, heading = stack.pop()
+        if current.children:
+            heading = heading or current.tag in HEADING_TAGS
+            stack.extend((child, heading) for child in reversed(current.children))
+        elif current.tag in TEXT_TAGS and current.value:
+            runs.append((current.value, heading))
+    return runs
+
+
+def page_terms(runs) -> dict[str, list[int]]:
+    """
+    Tokenize a page's text runs into postings.
+
+    Returns:
+        term -> [occurrences in headings, position, position, ...], with
+        positions counted over every token, stopwords included
+    """
+    terms = {}
+    position = 0
+    for text, heading in runs:
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            if len(token) > 1 and token not in STOPWORDS:
+                posting = terms.get(token)
+                if posting is None:
+                    posting = terms[token] = [0]
+                if heading:
+                    posting[0] += 1
+                posting.append(position)
+            position += 1
+    return terms
+
+
+def shard_name(term: str, prefix_length: int = DEFAULT_PREFIX_LENGTH) -> str:
+    """Shard of a term: its prefix, or "_" and the prefix's UTF-8 hex if that isn't [a-z0-9]."""
+    prefix = term[:prefix_length]
+    if _SHARD_NAME.fullmatch(prefix):
+        return prefix
+    return "_" + prefix.encode('utf-8').hex()
+
+
+def _encode(doc: int, posting: list[int]) -> str:
+    # JSON for one posting, with positions delta-encoded so they stay short
+    encoded = [doc] + posting[:2]
+    for index in range(2, len(posting)):
+        encoded.append(posting[index] - posting[index - 1])
+    return "[" + ",".join(map(str, encoded)) + "]"
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class SearchIndex:
+    """
+    An inverted index of page text, written as prefix-sharded JSON for
+    client-side search.
+
+    Files under search/ in the output directory:
+
+    - index.json: {"version", "prefix_length", "docs_per_shard", "documents", "shards"}
+    - docs/<n>.json: [[url, title] or null, ...] for document ids
+      n * docs_per_shard onwards
+    - <shard>.json: {term: [[doc id, heading hits, position, delta, ...], ...]}
+      for every term whose shard_name() is <shard>
+
+    A browser fetches index.json once, then only the shards of the query
+    terms and the docs files of the hits. Pages are indexed incrementally:
+    update() touches only the terms a page gained, lost or changed, and
+    write() re-serializes only the shards those terms live in.
+    """
+
+    def __init__(self, prefix_length: int = DEFAULT_PREFIX_LENGTH):
+        if prefix_length < 1:
+            raise ValueError(f"prefix_length must be at least 1, got {prefix_length}")
+        self.prefix_length = prefix_length
+        # Page -> document id
+        self._ids = {}
+        # Document id -> [url, title], or None for a free id
+        self._docs = []
+        # Freed document ids, reused lowest first
+        self._free = []
+        # Page -> its terms, as given to update()
+        self._terms = {}
+        # Term -> {document id: posting encoded as JSON}; shards are
+        # serialized by joining these, so an edit re-encodes only its own postings
+        self._postings = {}
+        # Term -> '"term":[postings]' JSON, for terms unchanged since the last write()
+        self._fragments = {}
+        # Terms whose postings are no longer in document id order
+        self._unsorted = set()
+        # Shard name -> its terms
+        self._shard_terms = {}
+        # Shard name -> serialized JSON, for shards unchanged since the last write()
+        self._shards = {}
+        self._dirty_shards = set()
+        # Files of shards that became empty, deleted by the next write()
+        self._stale = set()
+        # Docs file number -> serialized JSON
+        self._doc_files = {}
+        self._dirty_docs = set()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def update(self, page: str, url: str, title: str, terms: dict[str, list[int]]):
+        """
+        Index one page, replacing what was indexed for it before.
+
+        Args:
+            page: Stable key of the page, e.g. its content path
+            url: Root-relative URL of the page
+            title: Title shown in results
+            terms: Postings from page_terms(); pass the same dict again for
+                an unchanged page and nothing is re-indexed
+        """
+        doc = self._ids.get(page)
+        if doc is None:
+            doc = heapq.heappop(self._free) if self._free else len(self._docs)
+            if doc == len(self._docs):
+                self._docs.append(None)
+            self._ids[page] = doc
+        if self._docs[doc] != [url, title]:
+            self._docs[doc] = [url, title]
+            self._dirty_docs.add(doc // DOCS_PER_SHARD)
+
+        old = self._terms.get(page)
+        if old is terms:
+            return
+        old = old or {}
+        for term in old:
+            if term not in terms:
+                self._remove_posting(term, doc)
+        for term, posting in terms.items():
+            if old.get(term) != posting:
+                name = shard_name(term, self.prefix_length)
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    self._shard_terms.setdefault(name, set()).add(term)
+                elif doc not in postings and doc < next(reversed(postings)):
+                    self._unsorted.add(term)
+                postings[doc] = _encode(doc, posting)
+                self._fragments.pop(term, None)
+                self._dirty_shards.add(name)
+        self._terms[page] = terms
+
+    def _remove_posting(self, term: str, doc: int):
+        name = shard_name(term, self.prefix_length)
+        postings = self._postings[term]
+        del postings[doc]
+        self._fragments.pop(term, None)
+        if not postings:
+            del self._postings[term]
+            self._unsorted.discard(term)
+            self._shard_terms[name].discard(term)
+        self._dirty_shards.add(name)
+
+    def remove(self, page: str):
+        """Drop a page from the index."""
+        doc = self._ids.pop(page, None)
+        if doc is None:
+            return
+        for term in self._terms.pop(page, {}):
+            self._remove_posting(term, doc)
+        self._docs[doc] = None
+        self._dirty_docs.add(doc // DOCS_PER_SHARD)
+        heapq.heappush(self._free, doc)
+
+    def prune(self, pages):
+        """Drop every page not in pages (e.g. deleted since the last build)."""
+        keep = set(pages)
+        for page in [page for page in self._ids if page not in keep]:
+            self.remove(page)
+
+    def _fragment(self, term: str) -> str:
+        fragment = self._fragments.get(term)
+        if fragment is None:
+            postings = self._postings[term]
+            if term in self._unsorted:
+                postings = self._postings[term] = dict(sorted(postings.items()))
+                self._unsorted.discard(term)
+            fragment = self._fragments[term] = _dumps(term) + ":[" + ",".join(postings.values()) + "]"
+        return fragment
+
+    def _serialize(self):
+        for name in self._dirty_shards:
+            terms = self._shard_terms.get(name)
+            if terms:
+                self._shards[name] = "{" + ",".join([self._fragment(term) for term in sorted(terms)]) + "}"
+            else:
+                self._shard_terms.pop(name, None)
+                if self._shards.pop(name, None) is not None:
+                    self._stale.add(f"{name}.json")
+        self._dirty_shards.clear()
+        for number in self._dirty_docs:
+            docs = self._docs[number * DOCS_PER_SHARD:(number + 1) * DOCS_PER_SHARD]
+            if any(docs):
+                self._doc_files[number] = _dumps(docs)
+            else:
+                if self._doc_files.pop(number, None) is not None:
+                    self._stale.add(f"docs/{number}.json")
+        self._dirty_docs.clear()
+
+    def write(self, directory: str) -> dict:
+        """
+        Write the index files into directory.
+
+        Returns:
+            Dict with "shards" and "bytes" written, and "largest" shard size in bytes
+        """
+        self._serialize()
+        root = Path(directory)
+        (root / "docs").mkdir(parents=True, exist_ok=True)
+        for name in self._stale:
+            (root / name).unlink(missing_ok=True)
+        self._stale.clear()
+        sizes = []
+        for name, text in self._shards.items():
+            data = text.encode('utf-8')
+            (root / f"{name}.json").write_bytes(data)
+            sizes.append(len(data))
+        for number, text in self._doc_files.items():
+            data = text.encode('utf-8')
+            (root / "docs" / f"{number}.json").write_bytes(data)
+            sizes.append(len(data))
+        meta = _dumps({
+            "version": 1,
+            "prefix_length": self.prefix_length,
+            "docs_per_shard": DOCS_PER_SHARD,
+            "documents": len(self._ids),
+            "shards": sorted(self._shards),
+        }).encode('utf-8')
+        (root / "index.json").write_bytes(meta)
+        return {
+            "shards": len(self._shards),
+            "bytes": sum(sizes) + len(meta),
+            "largest": max(sizes[:len(self._shards)], default=0),
+        }
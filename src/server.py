@@ -0,0 +1,286 @@
+import argparse
+import email.utils
+import mimetypes
+import os
+import posixpath
+import re
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from build_manifest import MANIFEST_NAME, load_build_manifest
+
+
+# Precompressed sibling suffixes in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Fingerprinted assets (name.<10 hex>.ext) never change, so they can be cached forever
+FINGERPRINT_PATTERN = re.compile(r"\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    codings = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single-range "bytes=" header into an inclusive (start, end).
+
+    Returns:
+        (start, end), or None when the range can't be satisfied
+
+    Raises:
+        ValueError: If the header is malformed or asks for multiple ranges
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or (not match.group(1) and not match.group(2)):
+        raise ValueError(f"Unsupported range: {header}")
+    start_text, end_text = match.groups()
+    if not start_text:
+        # Suffix range: the last N bytes
+        length = int(end_text)
+        if length == 0:
+            return None
+        return max(0, size - length), size - 1
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class StaticSiteHandler(BaseHTTPRequestHandler):
+    """
+    Serves a generated site with keep-alive, precompressed variants,
+    conditional GETs and byte ranges.
+
+    The server instance provides a root (Path) attribute and a
+    current_manifest() method returning the build manifest (dict).
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and sendfile body go out as separate writes; without this,
+    # Nagle plus delayed ACKs stalls every keep-alive response by ~40 ms
+    disable_nagle_algorithm = True
+    server_version = "static-site"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self.serve(send_body=True)
+
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def resolve(self, url_path: str) -> str | None:
+        """Map a URL path to a site-relative file path, or None if there is no such file."""
+        path = posixpath.normpath(unquote(url_path))
+        parts = [part for part in path.split("/") if part]
+        # Refuse traversal and dotfiles such as the build manifest
+        if any(part.startswith(".") for part in parts):
+            return None
+        rel = "/".join(parts)
+        root = self.server.root
+        candidates = [rel + "/index.html" if rel else "index.html"] if url_path.endswith("/") else [rel, rel + "/index.html"]
+        for candidate in candidates:
+            if (root / candidate).is_file():
+                return candidate
+        return None
+
+    def choose_encoding(self, rel: str) -> tuple[str, str | None]:
+        """Pick the best precompressed sibling the client accepts."""
+        accepted = parse_accept_encoding(self.headers.get("Accept-Encoding", ""))
+        for coding, suffix in ENCODINGS:
+            if accepted.get(coding, 0) > 0 and (self.server.root / (rel + suffix)).is_file():
+                return rel + suffix, coding
+        return rel, None
+
+    def has_variants(self, rel: str) -> bool:
+        return any((self.server.root / (rel + suffix)).is_file() for _, suffix in ENCODINGS)
+
+    def etag_for(self, rel: str, stat: os.stat_result) -> str:
+        entry = self.server.current_manifest().get("files", {}).get(rel)
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime"] == int(stat.st_mtime):
+            return entry["etag"]
+        # Not in the manifest (or stale): fall back to a weak validator
+        return f'W/"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+    def not_modified(self, etag: str, mtime: float) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            weak = etag[2:] if etag.startswith("W/") else etag
+            return "*" in tags or etag in tags or weak in tags or ("W/" + weak) in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+    def serve(self, send_body: bool):
+        url_path = urlsplit(self.path).path
+        rel = self.resolve(url_path)
+        if rel is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+
+        range_header = self.headers.get("Range")
+        # Ranges address the identity representation, so skip compression for them
+        served, coding = (rel, None) if range_header else self.choose_encoding(rel)
+        file_path = self.server.root / served
+        try:
+            f = open(file_path, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+
+        with f:
+            stat = os.fstat(f.fileno())
+            etag = self.etag_for(served, stat)
+            content_type = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+                content_type += "; charset=utf-8"
+
+            headers = {
+                "ETag": etag,
+                "Last-Modified": email.utils.formatdate(stat.st_mtime, usegmt=True),
+                "Cache-Control": IMMUTABLE_CACHE_CONTROL if FINGERPRINT_PATTERN.search(rel) else REVALIDATE_CACHE_CONTROL,
+                "Accept-Ranges": "bytes",
+            }
+            if coding is not None or self.has_variants(rel):
+                headers["Vary"] = "Accept-Encoding"
+
+            if self.not_modified(etag, stat.st_mtime):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+
+            start, end = 0, stat.st_size - 1
+            status = HTTPStatus.OK
+            if range_header and self.headers.get("If-Range", etag) == etag:
+                try:
+                    byte_range = parse_range(range_header, stat.st_size)
+                except ValueError:
+                    byte_range = (0, stat.st_size - 1)
+                if byte_range is None:
+                    self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", f"bytes */{stat.st_size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                start, end = byte_range
+                if (start, end) != (0, stat.st_size - 1):
+                    status = HTTPStatus.PARTIAL_CONTENT
+                    headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+
+            length = max(0, end - start + 1)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(length))
+            if coding is not None:
+                self.send_header("Content-Encoding", coding)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+
+            if send_body and length:
+                self.send_file(f, start, length)
+
+    def send_file(self, f, offset: int, count: int):
+        """Send count bytes of f from offset, with zero-copy sendfile when possible."""
+        self.wfile.flush()
+        if hasattr(os, "sendfile"):
+            out_fd = self.connection.fileno()
+            while count > 0:
+                sent = os.sendfile(out_fd, f.fileno(), offset, count)
+                if sent == 0:
+                    break
+                offset += sent
+                count -= sent
+            return
+        f.seek(offset)
+        remaining = count
+        while remaining > 0:
+            chunk = f.read(min(remaining, 64 * 1024))
+            if not chunk:
+                break
+            self.wfile.write(chunk)
+            remaining -= len(chunk)
+
+
+class StaticSiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+    handler_class = StaticSiteHandler
+
+    def __init__(self, address, root: str, quiet: bool = False):
+        self.root = Path(root)
+        self._manifest_mtime = self._manifest_stat()
+        self.manifest = load_build_manifest(root)
+        self.quiet = quiet
+        super().__init__(address, self.handler_class)
+
+    def _manifest_stat(self) -> int | None:
+        try:
+            return (self.root / MANIFEST_NAME).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def current_manifest(self) -> dict:
+        """The build manifest, reloaded whenever a rebuild has rewritten it."""
+        mtime = self._manifest_stat()
+        if mtime != self._manifest_mtime:
+            self.manifest = load_build_manifest(str(self.root))
+            self._manifest_mtime = mtime
+        return self.manifest
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Serve the generated site.")
+    parser.add_argument("root", nargs="?", default="docs", help="directory to serve (default: docs)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8888, help="port to listen on (default: 8888)")
+    parser.add_argument("--quiet", action="store_true", help="don't log each request")
+    args = parser.parse_args(argv)
+
+    if not Path(args.root).is_dir():
+        raise ValueError(f"Site directory does not exist: {args.root}")
+    server = StaticSiteServer((args.host, args.port), args.root, quiet=args.quiet)
+    print(f"Serving {args.root} on http://{args.host}:{server.server_port}/ "
+          f"({len(server.manifest['files'])} files in manifest)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
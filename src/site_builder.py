@@ -0,0 +1,570 @@
+import contextlib
+import os
+import shutil
+import time
+from pathlib import Path
+from block_markdown import markdown_to_html_node
+from build_manifest import load_build_manifest, write_build_manifest
+from compress import precompress_directory
+from content_collections import Collection, page_url
+from fingerprint import fingerprint_assets, rewrite_node_urls
+from front_matter import complete_metadata, placeholder_values, read_metadata, split_front_matter
+from imagesize import ImageSizeCache, add_image_dimensions
+from linkcheck import LinkGraph, collect_links
+from minify import MinifyStats, minify_static_css
+from page_profile import PageProfiler
+from search_index import INDEX_DIR, SearchIndex, page_terms, text_runs
+from sitemap import FEED_ENTRIES, SitemapWriter, date_timestamp, url_path, write_feed, write_robots
+from template import Template, apply_basepath, basepath_url
+from toc import TableOfContents
+import metrics
+from tracing import span
+
+
+def copy_directory_contents(src_dir: str, dest_dir: str, log=None):
+    """
+    Recursively copy all contents from source directory to destination directory.
+    First deletes all contents of destination directory to ensure a clean copy.
+    
+    Args:
+        src_dir: Source directory path
+        dest_dir: Destination directory path
+        log: Optional callable that receives a progress line for every file
+    """
+    log = log or _quiet
+    # Convert to Path objects for easier manipulation
+    src_path = Path(src_dir)
+    dest_path = Path(dest_dir)
+    
+    # Check if source directory exists
+    if not src_path.exists():
+        raise ValueError(f"Source directory does not exist: {src_dir}")
+    
+    if not src_path.is_dir():
+        raise ValueError(f"Source path is not a directory: {src_dir}")
+    
+    # Delete destination directory contents if it exists
+    if dest_path.exists():
+        log(f"Deleting contents of {dest_dir}...")
+        shutil.rmtree(dest_path)
+    
+    # Create destination directory
+    dest_path.mkdir(parents=True, exist_ok=True)
+    log(f"Created destination directory: {dest_dir}")
+    
+    # Recursively copy all files and directories
+    def copy_recursive(src: Path, dest: Path):
+        """Helper function to recursively copy files and directories."""
+        for item in src.iterdir():
+            src_item = src / item.name
+            dest_item = dest / item.name
+            
+            if src_item.is_file():
+                # Copy file
+                shutil.copy2(src_item, dest_item)
+                metrics.inc("static_site_static_files_total", "copied")
+                log(f"Copied file: {dest_item}")
+            elif src_item.is_dir():
+                # Create directory and recurse
+                dest_item.mkdir(parents=True, exist_ok=True)
+                log(f"Created directory: {dest_item}")
+                copy_recursive(src_item, dest_item)
+            else:
+                # Sockets, FIFOs and dangling symlinks can't be copied
+                metrics.inc("static_site_static_files_total", "skipped")
+                log(f"Skipped: {src_item}")
+    
+    # Start recursive copy
+    copy_recursive(src_path, dest_path)
+    log(f"Successfully copied all contents from {src_dir} to {dest_dir}")
+
+
+def render_markdown_page(markdown_content: str, template: Template, asset_manifest: dict = None, image_sizes: ImageSizeCache = None, page_stats: dict = None, metadata: dict = None, links: list = None, text: list = None) -> str:
+    """
+    Render markdown into a complete HTML page using a compiled template.
+    
+    Front matter fields are available to the template as placeholders
+    ({{ Title }}, {{ Date }}, {{ Tags }}, {{ Description }}, ...), and
+    {{ TOC }} is a nested list of links to the page's h2-h6 headings.
+    
+    Args:
+        markdown_content: The markdown source of the page, with optional front matter
+        template: Compiled page template
+        asset_manifest: Optional fingerprinted asset manifest used to rewrite href/src URLs
+        image_sizes: Optional ImageSizeCache used to add width/height to local images
+        page_stats: Optional dict that receives the page's HTMLNode count under "nodes"
+        metadata: Optional dict that receives the page's metadata
+        links: Optional list that receives every href/src in the page body, before fingerprinting
+        text: Optional list that receives (text, in heading) for every text, bold and italic run in the body
+        
+    Returns:
+        The final HTML for the page
+    """
+    page_meta, body = split_front_matter(markdown_content)
+    
+    # Convert markdown to HTML; headings get ids and a TOC entry as they are built
+    toc = TableOfContents()
+    html_node = markdown_to_html_node(body, toc)
+    # Without a front matter title, the page's first h1 is its title
+    complete_metadata(page_meta, toc.title())
+    if metadata is not None:
+        metadata.update(page_meta)
+    if image_sizes is not None:
+        # Sizes are looked up by the original path, so this runs before fingerprinting
+        add_image_dimensions(html_node, image_sizes)
+    if links is not None:
+        links.extend(collect_links(html_node))
+    if text is not None:
+        text.extend(text_runs(html_node))
+    rewrite_node_urls(html_node, asset_manifest)
+    if page_stats is not None:
+        page_stats["nodes"] = sum(1 for _ in html_node.iter_nodes())
+    with span("to_html"):
+        html_content = apply_basepath(html_node.to_html(), template.basepath)
+    
+    # Replace placeholders in template
+    with span("template fill"):
+        values = placeholder_values(page_meta)
+        values["Content"] = html_content
+        values["TOC"] = toc.to_html()
+        final_html = template.render(values)
+    metrics.inc("static_site_pages_rendered_total")
+    return final_html
+
+
+def _quiet(message: str):
+    pass
+
+
+class BuildResult:
+    """What a Site.build() call did."""
+
+    def __init__(self):
+        # Output paths relative to the output directory, e.g. "blog/tom/index.html"
+        self.pages = []
+        # Output files that are new or whose bytes differ from the previous build
+        self.changed = []
+        # Output files from the previous build that no longer exist
+        self.removed = []
+        # (content path, message) for every page that failed to render
+        self.errors = []
+        # Content path -> metadata for every page rendered
+        self.metadata = {}
+        # Output path -> internal links on it that don't resolve to an output file
+        self.broken_links = {}
+        # Content pages no other page links to
+        self.orphans = []
+        # What SearchIndex.write() returned, if the site has a search index
+        self.search_stats = None
+        # Seconds spent in each stage, in the order the stages ran
+        self.timings = {}
+        self.asset_manifest = {}
+        self.minify_stats = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.timings.values())
+
+
+class Site:
+    """
+    An in-process site builder.
+
+    The compiled template, asset manifest, image sizes and rendered pages
+    are kept between calls, so a long-running service can rebuild or render
+    single pages without paying for startup work again. Pages are re-rendered
+    only when their source, the template or the asset manifest changes.
+
+    A Site is not safe to use from several threads at once.
+    """
+
+    def __init__(self, content_dir: str, static_dir: str, template_path: str, output_dir: str,
+                 basepath: str = "/", cache_dir: str = None, minify: bool = False, log=None,
+                 collections: list[Collection] = None, search: SearchIndex = None, site_url: str = None,
+                 author: str = None):
+        """
+        Args:
+            content_dir: Directory of markdown pages
+            static_dir: Directory copied verbatim into the output
+            template_path: Path to the HTML template file
+            output_dir: Directory the site is built into (deleted on every build)
+            basepath: Base path for the site (e.g., "/" or "/REPO_NAME/")
+            cache_dir: Optional directory for persistent build caches
+            minify: Whether to minify the template's markup and copied CSS
+            log: Optional callable that receives progress lines; silent by default
+            collections: Optional Collections to generate index, archive and tag pages for
+            search: Optional SearchIndex of page text, written to search/ in the output
+            site_url: Absolute URL of the published site (including any base path);
+                when set, builds write sitemaps, a feed per collection and robots.txt
+            author: Optional author named in the feeds; posts can override it with
+                an "author" front matter field
+        """
+        self.content_dir = Path(content_dir)
+        self.static_dir = Path(static_dir)
+        self.template_path = Path(template_path)
+        self.output_dir = Path(output_dir)
+        self.basepath = basepath
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.minify = minify
+        self.log = log or _quiet
+        self.collections = collections or []
+        self.search = search
+        self.site_url = site_url.rstrip("/") + "/" if site_url else None
+        self.author = author
+        # Internal links of every page, kept between builds so only changed pages are re-checked
+        self.links = LinkGraph()
+        self.asset_manifest = None
+        index_path = self.cache_dir / "image-sizes.json" if self.cache_dir else None
+        self.image_sizes = ImageSizeCache(str(self.static_dir), index_path=index_path)
+        self._template = None
+        self._template_key = None
+        # content path -> (mtime_ns, size, html, metadata, links, search terms)
+        self._pages = {}
+        # listing output path -> (ListingPage.key(), html, links)
+        self._listings = {}
+        # Content-relative path -> {"mtime_ns", "size", "meta"}; seeded from
+        # the last build manifest so unchanged pages are never re-read
+        self._metadata = None
+
+    @property
+    def template(self) -> Template:
+        """The compiled template, recompiled when the template file changes."""
+        stat = os.stat(self.template_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._template is None or key != self._template_key:
+            self._template = Template.from_file(
+                str(self.template_path), basepath=self.basepath,
+                asset_manifest=self.asset_manifest, minify=self.minify,
+            )
+            self._template_key = key
+            self._pages.clear()
+            self._listings.clear()
+        return self._template
+
+    def _resolve(self, path: str) -> Path:
+        page = Path(path)
+        if not page.is_absolute():
+            page = self.content_dir / page
+        return page
+
+    def render_string(self, markdown: str) -> str:
+        """
+        Render markdown into a complete HTML page.
+
+        Raises:
+            ValueError: If the markdown has no h1 header
+        """
+        return render_markdown_page(markdown, self.template, self.asset_manifest, self.image_sizes)
+
+    def render_page(self, path: str) -> str:
+        """
+        Render one content page, reusing the previous result if neither the
+        page nor the template changed since it was last rendered.
+
+        Args:
+            path: Markdown file, absolute or relative to the content directory
+
+        Raises:
+            OSError: If the page can't be read
+            ValueError: If the page has no h1 header
+        """
+        return self._render(self._resolve(path))[0]
+
+    def _render(self, page: Path, page_stats: dict = None) -> tuple[str, int, dict, list[str], dict]:
+        """
+        Render page, returning its HTML, the number of markdown bytes read,
+        its metadata, its links and its search terms (None without a search index).
+        """
+        template = self.template
+        stat = page.stat()
+        cached = self._pages.get(page)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size) and page_stats is None:
+            metrics.inc("static_site_cache_requests_total", ("pages", "hit"))
+            return cached[2], 0, cached[3], cached[4], cached[5]
+        metrics.inc("static_site_cache_requests_total", ("pages", "miss"))
+        with span("read"):
+            with open(page, 'r', encoding='utf-8') as f:
+                markdown_content = f.read()
+        metadata = {}
+        links = []
+        text = [] if self.search is not None else None
+        html = render_markdown_page(
+            markdown_content, template, self.asset_manifest, self.image_sizes, page_stats, metadata, links, text,
+        )
+        terms = page_terms(text) if text is not None else None
+        self._pages[page] = (stat.st_mtime_ns, stat.st_size, html, metadata, links, terms)
+        if page.is_relative_to(self.content_dir):
+            self._metadata_index()[page.relative_to(self.content_dir).as_posix()] = {
+                "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "meta": metadata,
+            }
+        return html, stat.st_size, metadata, links, terms
+
+    def _metadata_index(self) -> dict:
+        if self._metadata is None:
+            self._metadata = dict(load_build_manifest(str(self.output_dir)).get("pages", {}))
+        return self._metadata
+
+    def metadata(self) -> dict[str, dict]:
+        """
+        Metadata for every content page, keyed by path relative to the
+        content directory, in path order.
+
+        Pages unchanged since they were last rendered or read (by this Site
+        or the build that wrote the output directory's manifest) are not
+        opened; the rest are read only up to the end of their front matter
+        or first h1. Pages whose metadata can't be read are left out.
+        """
+        index = self._metadata_index()
+        current = {}
+        for page in sorted(self.content_dir.rglob("*.md")):
+            rel = page.relative_to(self.content_dir).as_posix()
+            try:
+                stat = page.stat()
+                entry = index.get(rel)
+                if entry is None or (entry["mtime_ns"], entry["size"]) != (stat.st_mtime_ns, stat.st_size):
+                    metrics.inc("static_site_cache_requests_total", ("metadata", "miss"))
+                    entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "meta": read_metadata(page)}
+                else:
+                    metrics.inc("static_site_cache_requests_total", ("metadata", "hit"))
+            except (OSError, ValueError):
+                continue
+            current[rel] = entry
+        # Forget pages that have been deleted
+        self._metadata = current
+        return {rel: entry["meta"] for rel, entry in current.items()}
+
+    @contextlib.contextmanager
+    def _stage(self, result: BuildResult, name: str):
+        start = time.perf_counter()
+        with span(name):
+            yield
+        result.timings[name] = time.perf_counter() - start
+
+    def build(self, page_profiler: PageProfiler = None) -> BuildResult:
+        """
+        Build the whole site into the output directory.
+
+        Pages that fail to render are reported in the result's errors and
+        skipped; the rest of the site is still built.
+
+        Args:
+            page_profiler: Optional PageProfiler that records timings for every page
+
+        Returns:
+            BuildResult describing the build
+        """
+        result = BuildResult()
+        previous_manifest = load_build_manifest(str(self.output_dir))
+        previous = previous_manifest["files"]
+        if self._metadata is None:
+            self._metadata = dict(previous_manifest.get("pages", {}))
+        cache_dir = str(self.cache_dir) if self.cache_dir else None
+
+        with self._stage(result, "static copy"):
+            if self.output_dir.exists():
+                self.log(f"Deleting output directory: {self.output_dir}")
+                shutil.rmtree(self.output_dir)
+            copy_directory_contents(str(self.static_dir), str(self.output_dir), log=self.log)
+
+        if self.minify:
+            result.minify_stats = MinifyStats()
+            # Minify before fingerprinting so asset hashes reflect the shipped bytes
+            with self._stage(result, "minify css"):
+                minify_static_css(str(self.output_dir), cache_dir=cache_dir, stats=result.minify_stats)
+
+        # Give static assets content-hashed names so they can be cached immutably
+        with self._stage(result, "fingerprint"):
+            asset_manifest = fingerprint_assets(str(self.output_dir), cache_dir=cache_dir, log=self.log)
+        if asset_manifest != self.asset_manifest:
+            # Pages and the template embed fingerprinted URLs
+            self.asset_manifest = asset_manifest
+            self._template = None
+        result.asset_manifest = asset_manifest
+
+        # Sitemap entries are streamed to disk as pages are written
+        sitemap = None
+        if self.site_url:
+            sitemap = SitemapWriter(str(self.output_dir), self.site_url, cache_dir=cache_dir)
+
+        with self._stage(result, "pages"):
+            self._build_pages(result, page_profiler, sitemap)
+        self.image_sizes.save()
+
+        if self.collections:
+            with self._stage(result, "collections"):
+                self._build_collections(result, sitemap)
+
+        if sitemap is not None:
+            with self._stage(result, "sitemap"):
+                self._finish_sitemap(result, sitemap)
+
+        if self.search is not None:
+            with self._stage(result, "search"):
+                self.search.prune(result.metadata)
+                result.search_stats = self.search.write(str(self.output_dir / INDEX_DIR))
+            self.log(
+                f"Wrote search index: {len(self.search)} pages in {result.search_stats['shards']} shards, "
+                f"{result.search_stats['bytes']} bytes"
+            )
+
+        # Write .gz/.br siblings so the origin can serve precompressed files
+        with self._stage(result, "precompress"):
+            precompress_directory(str(self.output_dir), cache_dir=cache_dir, log=self.log)
+
+        # Record ETags for every output file so the server can answer conditional requests
+        with self._stage(result, "manifest"):
+            pages = {rel: self._metadata[rel] for rel in result.metadata}
+            files = write_build_manifest(str(self.output_dir), cache_dir=cache_dir, log=self.log, pages=pages)["files"]
+
+        with self._stage(result, "links"):
+            self._check_links(result, files)
+        result.changed = [rel for rel, entry in files.items() if previous.get(rel, {}).get("etag") != entry["etag"]]
+        result.removed = sorted(set(previous) - set(files))
+        return result
+
+    def _lastmod(self, rel: str) -> float | None:
+        entry = self._metadata_index().get(rel)
+        return entry["mtime_ns"] / 1e9 if entry is not None else None
+
+    def _build_pages(self, result: BuildResult, page_profiler: PageProfiler = None, sitemap: SitemapWriter = None):
+        if not self.content_dir.is_dir():
+            raise ValueError(f"Content directory does not exist: {self.content_dir}")
+        template = self.template
+
+        with span("discovery", dir=str(self.content_dir)):
+            pages = sorted(path for path in self.content_dir.rglob("*.md") if path.is_file())
+
+        for page in pages:
+            rel = page.relative_to(self.content_dir)
+            dest_file = self.output_dir / rel.with_suffix(".html")
+            page_stats = {} if page_profiler is not None else None
+            start = time.perf_counter()
+            with span("page", path=str(page)):
+                try:
+                    final_html, bytes_read, metadata, links, terms = self._render(page, page_stats)
+                except (OSError, ValueError) as e:
+                    result.errors.append((rel.as_posix(), str(e)))
+                    self.log(f"Failed: {page}: {e}")
+                    continue
+                with span("write"):
+                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    with open(dest_file, 'w', encoding='utf-8') as f:
+                        f.write(final_html)
+                metrics.inc("static_site_read_bytes_total", amount=bytes_read)
+                metrics.inc("static_site_written_bytes_total", amount=dest_file.stat().st_size)
+
+            size = len(final_html.encode('utf-8'))
+            if page_profiler is not None:
+                page_profiler.record(
+                    rel.as_posix(), time.perf_counter() - start, bytes_read, size, page_stats["nodes"],
+                )
+            if result.minify_stats is not None:
+                result.minify_stats.add(".html", size + template.minify_savings, size)
+            output_rel = dest_file.relative_to(self.output_dir).as_posix()
+            result.pages.append(output_rel)
+            result.metadata[rel.as_posix()] = metadata
+            self.links.update(output_rel, links)
+            if sitemap is not None:
+                sitemap.add(url_path(output_rel), self._lastmod(rel.as_posix()))
+            if terms is not None:
+                url = basepath_url(page_url(rel.as_posix()), template.basepath)
+                self.search.update(rel.as_posix(), url, metadata["title"], terms)
+            self.log(f"Generated: {dest_file}")
+
+        if page_profiler is not None:
+            page_profiler.report(self.log)
+            page_profiler.capture_profiles(lambda page_path: self.render_string(
+                (self.content_dir / page_path).read_text(encoding='utf-8')
+            ), log=self.log)
+
+    def _build_collections(self, result: BuildResult, sitemap: SitemapWriter = None):
+        written = set(result.pages)
+        for collection in self.collections:
+            changes = collection.update(result.metadata)
+            listings = collection.listing_pages()
+            rendered = 0
+            for listing in listings:
+                if listing.path in written:
+                    self.log(f"Skipped: {listing.path} (a content page renders there)")
+                    continue
+                final_html, links = self._render_listing(listing)
+                dest_file = self.output_dir / listing.path
+                dest_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(dest_file, 'w', encoding='utf-8') as f:
+                    f.write(final_html)
+                result.pages.append(listing.path)
+                written.add(listing.path)
+                self.links.update(listing.path, links)
+                if sitemap is not None:
+                    sitemap.add(url_path(listing.path))
+                rendered += 1
+            self.log(
+                f"Collection {collection.directory}: {len(collection)} posts, {changes} changed, "
+                f"{rendered} listing pages"
+            )
+
+    def _render_listing(self, listing) -> tuple[str, list[str]]:
+        """Render a ListingPage to its HTML and links, reusing the last result if nothing on it changed."""
+        template = self.template
+        key = listing.key()
+        cached = self._listings.get(listing.path)
+        if cached is not None and cached[0] == key:
+            metrics.inc("static_site_cache_requests_total", ("listings", "hit"))
+            return cached[1], cached[2]
+        metrics.inc("static_site_cache_requests_total", ("listings", "miss"))
+        node = listing.to_html_node()
+        links = collect_links(node)
+        rewrite_node_urls(node, self.asset_manifest)
+        values = placeholder_values({"title": listing.title, "date": "", "tags": [], "description": ""})
+        values["Content"] = apply_basepath(node.to_html(), template.basepath)
+        values["TOC"] = ""
+        final_html = template.render(values)
+        self._listings[listing.path] = (key, final_html, links)
+        return final_html, links
+
+    def _finish_sitemap(self, result: BuildResult, sitemap: SitemapWriter):
+        shards = sitemap.close()
+        self.log(
+            f"Wrote sitemap: {sitemap.urls} URLs in {len(shards)} files ({sitemap.unchanged} unchanged)"
+        )
+        sources = {page_url(rel): rel for rel in result.metadata}
+        for collection in self.collections:
+            entries = []
+            for post in collection.posts()[:FEED_ENTRIES]:
+                source = sources.get(post["url"])
+                updated = date_timestamp(post["date"]) if post["date"] else None
+                if updated is None:
+                    updated = self._lastmod(source) if source else 0
+                author = post.get("author")
+                entries.append({
+                    "title": post["title"], "url": self.site_url + post["url"].lstrip("/"),
+                    "updated": updated, "summary": post["description"],
+                    "author": ", ".join(author) if isinstance(author, list) else author,
+                })
+            feed = self.output_dir / collection.directory / "feed.xml"
+            feed.parent.mkdir(parents=True, exist_ok=True)
+            write_feed(
+                str(feed), collection.title, self.site_url + f"{collection.directory}/feed.xml",
+                self.site_url + collection.directory, entries, author=self.author,
+            )
+            self.log(f"Wrote feed: {feed}")
+        if write_robots(str(self.output_dir / "robots.txt"), self.site_url + "sitemap.xml"):
+            self.log("Wrote robots.txt")
+
+    def _check_links(self, result: BuildResult, files: dict):
+        self.links.prune(result.pages)
+        # Pages link to assets by their original names; fingerprinting rewrites them afterwards
+        servable = set(files)
+        servable.update(url.lstrip("/") for url in result.asset_manifest)
+        result.broken_links = self.links.check(servable)
+        content_pages = [Path(rel).with_suffix(".html").as_posix() for rel in result.metadata]
+        result.orphans = self.links.orphans(content_pages)
+        for page, urls in result.broken_links.items():
+            for url in urls:
+                self.log(f"Broken link: {page} -> {url}")
+        for page in result.orphans:
+            self.log(f"Orphan page: {page}")
@@ -0,0 +1,242 @@
+import calendar
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+from front_matter import DATE_FORMAT, DATETIME_FORMAT
+
+
+# Limits of one sitemap file, from the sitemaps.org protocol
+MAX_URLS = 50_000
+MAX_BYTES = 50 * 1024 * 1024
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+SITEMAP_INDEX = "sitemap.xml"
+
+URLSET_HEADER = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'.encode('utf-8')
+URLSET_FOOTER = b"</urlset>\n"
+
+# Posts in a collection's feed
+FEED_ENTRIES = 20
+
+
+def w3c_datetime(timestamp: float) -> str:
+    """Format a Unix timestamp as a UTC W3C/RFC 3339 datetime, as sitemaps and Atom use."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+
+def url_path(rel: str) -> str:
+    """Root-relative URL of an output file ("blog/tom/index.html" -> "/blog/tom/")."""
+    if rel == "index.html":
+        return "/"
+    if rel.endswith("/index.html"):
+        return "/" + rel[:-len("index.html")]
+    return "/" + rel
+
+
+def date_timestamp(date: str) -> float | None:
+    """
+    Unix timestamp of a front matter date, as front_matter.parse_date()
+    writes them ("YYYY-MM-DD" is midnight UTC), or None if it isn't one.
+    """
+    for date_format in (DATE_FORMAT, DATETIME_FORMAT):
+        try:
+            return float(calendar.timegm(time.strptime(date, date_format)))
+        except ValueError:
+            pass
+    return None
+
+
+def _place(source: Path, dest: Path):
+    # Hard link when possible: shards can be tens of megabytes
+    try:
+        os.link(source, dest)
+    except OSError:
+        shutil.copy2(source, dest)
+
+
+class SitemapWriter:
+    """
+    Streams sitemap entries to disk as pages are produced.
+
+    Entries go straight into sitemap-<n>.xml files, each closed at
+    max_urls entries or max_bytes, and close() writes the sitemap.xml
+    index. Memory use is one entry, whatever the number of URLs.
+
+    With a cache_dir, shards are streamed into the cache and only replace
+    the cached copy when their bytes changed, so unchanged shards keep
+    their file (and mtime) across builds; the output gets a hard link.
+    """
+
+    def __init__(self, output_dir: str, site_url: str, max_urls: int = MAX_URLS, max_bytes: int = MAX_BYTES,
+                 cache_dir: str = None):
+        """
+        Args:
+            output_dir: Directory the site is built into
+            site_url: Absolute URL of the site root, e.g. "https://example.com/blog/"
+            max_urls: Entries per sitemap file
+            max_bytes: Bytes per sitemap file
+            cache_dir: Optional directory to keep shards in between builds
+        """
+        if max_bytes < len(URLSET_HEADER) + len(URLSET_FOOTER):
+            raise ValueError(f"max_bytes is too small for a sitemap: {max_bytes}")
+        self.output_dir = Path(output_dir)
+        self.site_url = site_url.rstrip("/")
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) / "sitemap" if cache_dir else None
+        # (file name, newest lastmod or None) of every finished shard
+        self.shards = []
+        # Shards whose bytes matched the cached copy
+        self.unchanged = 0
+        self.urls = 0
+        self._digests = {}
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                with open(self.cache_dir / "digests.json", 'r', encoding='utf-8') as f:
+                    self._digests = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self._digests = {}
+        self._file = None
+
+    def _start_shard(self):
+        self._name = f"sitemap-{len(self.shards) + 1}.xml"
+        directory = self.cache_dir if self.cache_dir is not None else self.output_dir
+        self._path = directory / (self._name + ".tmp" if self.cache_dir is not None else self._name)
+        self._file = open(self._path, 'wb')
+        self._hash = hashlib.sha256()
+        self._count = 0
+        self._size = 0
+        self._lastmod = None
+        self._write(URLSET_HEADER)
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._hash.update(data)
+        self._size += len(data)
+
+    def _finish_shard(self):
+        self._write(URLSET_FOOTER)
+        self._file.close()
+        self._file = None
+        if self.cache_dir is not None:
+            cached = self.cache_dir / self._name
+            digest = self._hash.hexdigest()
+            if self._digests.get(self._name) == digest and cached.is_file():
+                os.remove(self._path)
+                self.unchanged += 1
+            else:
+                os.replace(self._path, cached)
+                self._digests[self._name] = digest
+            _place(cached, self.output_dir / self._name)
+        self.shards.append((self._name, self._lastmod))
+
+    def add(self, path: str, lastmod: float = None):
+        """
+        Add one URL.
+
+        Args:
+            path: Root-relative URL path of the page, e.g. "/blog/tom/"
+            lastmod: Optional Unix timestamp of the page's last change
+        """
+        entry = f"<url><loc>{escape(self.site_url + path)}</loc>"
+        if lastmod is not None:
+            entry += f"<lastmod>{w3c_datetime(lastmod)}</lastmod>"
+        data = (entry + "</url>\n").encode('utf-8')
+        if self._file is not None and (
+            self._count >= self.max_urls or self._size + len(data) + len(URLSET_FOOTER) > self.max_bytes
+        ):
+            self._finish_shard()
+        if self._file is None:
+            self._start_shard()
+        self._write(data)
+        self._count += 1
+        self.urls += 1
+        if lastmod is not None and (self._lastmod is None or lastmod > self._lastmod):
+            self._lastmod = lastmod
+
+    def close(self) -> list[str]:
+        """
+        Finish the last shard and write the sitemap.xml index.
+
+        Returns:
+            File names of the shards, in order
+        """
+        if self._file is not None:
+            self._finish_shard()
+        names = {name for name, _ in self.shards}
+        if self.cache_dir is not None:
+            # Forget shards beyond the last one, e.g. after pages were deleted
+            self._digests = {name: digest for name, digest in self._digests.items() if name in names}
+            with open(self.cache_dir / "digests.json", 'w', encoding='utf-8') as f:
+                json.dump(self._digests, f)
+        with open(self.output_dir / SITEMAP_INDEX, 'w', encoding='utf-8') as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n')
+            for name, lastmod in self.shards:
+                f.write(f"<sitemap><loc>{escape(self.site_url)}/{name}</loc>")
+                if lastmod is not None:
+                    f.write(f"<lastmod>{w3c_datetime(lastmod)}</lastmod>")
+                f.write("</sitemap>\n")
+            f.write("</sitemapindex>\n")
+        return [name for name, _ in self.shards]
+
+
+def write_feed(path: str, title: str, feed_url: str, site_url: str, entries: list[dict], author: str = None):
+    """
+    Write an Atom feed.
+
+    Atom requires an author for every entry, so the feed has one: author,
+    or the feed title when none is configured. Entries with their own
+    "author" list it as well.
+
+    Args:
+        path: File to write, e.g. <output>/blog/feed.xml
+        title: Feed title
+        feed_url: Absolute URL of the feed itself
+        site_url: Absolute URL of the page the feed belongs to
+        entries: Newest first, each {"title", "url" (absolute), "updated"
+            (Unix timestamp) and optionally "summary" and "author"}
+        author: Optional name of the feed's author
+    """
+    # A feed without entries was last updated now, not in 1970
+    updated = max((entry["updated"] for entry in entries), default=None)
+    if updated is None:
+        updated = time.time()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n')
+        f.write(f"<title>{escape(title)}</title>\n")
+        f.write(f'<link href={quoteattr(site_url)}/>\n<link rel="self" href={quoteattr(feed_url)}/>\n')
+        f.write(f"<id>{escape(feed_url)}</id>\n<updated>{w3c_datetime(updated)}</updated>\n")
+        f.write(f"<author><name>{escape(author or title)}</name></author>\n")
+        for entry in entries:
+            f.write(
+                f'<entry><title>{escape(entry["title"])}</title><link href={quoteattr(entry["url"])}/>'
+                f'<id>{escape(entry["url"])}</id>'
+            )
+            f.write(f"<updated>{w3c_datetime(entry['updated'])}</updated>")
+            if entry.get("author"):
+                f.write(f"<author><name>{escape(entry['author'])}</name></author>")
+            if entry.get("summary"):
+                f.write(f"<summary>{escape(entry['summary'])}</summary>")
+            f.write("</entry>\n")
+        f.write("</feed>\n")
+
+
+def write_robots(path: str, sitemap_url: str) -> bool:
+    """
+    Write a robots.txt allowing everything and pointing at the sitemap,
+    unless the site already has one.
+
+    Returns:
+        Whether the file was written
+    """
+    if os.path.exists(path):
+        return False
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"User-agent: *\nAllow: /\n\nSitemap: {sitemap_url}\n")
+    return True
@@ -0,0 +1,213 @@
+import sys
+
+
+# Bytes read from stdin at a time in NUL-delimited mode
+READ_SIZE = 64 * 1024
+
+
+def _renderer():
+    # Imported on first use so --help and argument errors return immediately
+    from block_markdown import markdown_to_block_nodes, markdown_to_html
+    return markdown_to_block_nodes, markdown_to_html
+
+
+def iter_blocks(lines):
+    """
+    Yield markdown blocks from an iterable of lines as soon as each one ends.
+
+    A BlockParser follows the document's block structure, so a top-level
+    block ends once no block is left open (after a heading or a closing
+    fence, or at a blank line after a paragraph) or when a line starts the
+    next one. A blank line between list items or inside a fence doesn't
+    end anything, so rendering the blocks one by one gives the same HTML
+    as rendering the whole document at once.
+    """
+    from block_markdown import BlockParser
+    parser = BlockParser()
+    blocks = parser.document.children
+    buffer = []
+    for line in lines:
+        count = len(blocks)
+        parser.feed(line[:-1] if line.endswith("\n") else line)
+        if len(blocks) > count and buffer:
+            # The line started a new top-level block, so the one before it is complete
+            yield "".join(buffer)
+            buffer = []
+        if parser.open_blocks or not line.isspace():
+            buffer.append(line)
+        if buffer and not parser.open_blocks:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_document(lines, out) -> int:
+    """
+    Render one markdown document from lines to out, writing each block as
+    soon as the blank line after it has been read.
+
+    Reference link definitions carry over from block to block. A block
+    with a reference that isn't defined yet may use a definition further
+    down, so it and every block after it are held back and rendered at the
+    end, with all of the document's definitions: the output is always
+    the same as rendering the whole document at once.
+
+    Args:
+        lines: Iterable of lines, e.g. sys.stdin
+        out: Text stream for the HTML
+
+    Returns:
+        Number of blocks rendered
+
+    Raises:
+        ValueError: If the document has no blocks or contains invalid markdown
+    """
+    markdown_to_block_nodes, _ = _renderer()
+    from inline_markdown import has_unresolved_references
+    definitions = {}
+    held = []
+    count = 0
+
+    def write(nodes):
+        nonlocal count
+        if not nodes:
+            return
+        if count == 0:
+            out.write("<div>")
+        out.write("".join([node.to_html() for node in nodes]))
+        out.flush()
+        count += len(nodes)
+
+    for block in iter_blocks(lines):
+        nodes = markdown_to_block_nodes(block, definitions=definitions)
+        if held or has_unresolved_references(block, definitions):
+            held.append(block)
+        else:
+            write(nodes)
+    for block in held:
+        write(markdown_to_block_nodes(block, definitions=definitions))
+    if count == 0:
+        raise ValueError("ParentNode must have one or more children")
+    out.write("</div>")
+    out.flush()
+    return count
+
+
+def iter_nul_delimited(stream):
+    """Yield NUL-terminated documents (bytes) from a binary stream as they arrive."""
+    pending = []
+    while True:
+        chunk = stream.read1(READ_SIZE) if hasattr(stream, "read1") else stream.read(READ_SIZE)
+        if not chunk:
+            break
+        parts = chunk.split(b"\0")
+        if len(parts) == 1:
+            pending.append(chunk)
+            continue
+        yield b"".join(pending + [parts[0]])
+        yield from parts[1:-1]
+        pending = [parts[-1]]
+    # A final document doesn't need a terminator
+    if any(pending):
+        yield b"".join(pending)
+
+
+def iter_length_prefixed(stream):
+    """
+    Yield documents (bytes) framed as "<byte length>\\n<bytes>".
+
+    Raises:
+        ValueError: If a frame header is malformed or the stream ends mid-document
+    """
+    while True:
+        header = stream.readline()
+        if not header:
+            return
+        try:
+            length = int(header)
+        except ValueError:
+            raise ValueError(f"Invalid frame header: {header!r}")
+        data = stream.read(length)
+        if len(data) != length:
+            raise ValueError(f"Stream ended after {len(data)} of {length} bytes")
+        yield data
+
+
+def filter_documents(documents, out, framing: str, err=None) -> int:
+    """
+    Render every document and write the HTML to out with the same framing.
+
+    A document that fails to render produces an empty result (keeping
+    output aligned with input) and an error line on err.
+
+    Args:
+        documents: Iterable of markdown documents as bytes
+        out: Binary stream for the results
+        framing: "nul" or "length"
+        err: Text stream for errors (defaults to sys.stderr)
+
+    Returns:
+        Number of documents that failed to render
+    """
+    _, markdown_to_html = _renderer()
+    err = err or sys.stderr
+    failures = 0
+    for index, document in enumerate(documents):
+        try:
+            html = markdown_to_html(document.decode('utf-8')).encode('utf-8')
+        except (UnicodeDecodeError, ValueError) as e:
+            failures += 1
+            err.write(f"document {index}: {e}\n")
+            html = b""
+        if framing == "nul":
+            out.write(html + b"\0")
+        else:
+            out.write(b"%d\n" % len(html) + html)
+        out.flush()
+    return failures
+
+
+USAGE = """usage: stream_filter.py [-h] [-0 | --length-prefixed]
+
+Render markdown from stdin to HTML on stdout.
+
+options:
+  -h, --help         show this help message and exit
+  -0, --null         read and write NUL-terminated documents
+  --length-prefixed  read and write documents framed as "<byte length>\\n<bytes>"
+"""
+
+FRAMING_FLAGS = {"-0": "nul", "--null": "nul", "--length-prefixed": "length"}
+
+
+def main(argv: list[str] = None) -> int:
+    # Options are parsed by hand: importing argparse costs more than rendering a small page
+    argv = sys.argv[1:] if argv is None else argv
+    if "-h" in argv or "--help" in argv:
+        sys.stdout.write(USAGE)
+        return 0
+    unknown = [arg for arg in argv if arg not in FRAMING_FLAGS]
+    framings = {FRAMING_FLAGS[arg] for arg in argv if arg in FRAMING_FLAGS}
+    if unknown or len(framings) > 1:
+        if unknown:
+            message = f"unrecognized arguments: {' '.join(unknown)}"
+        else:
+            message = "-0 and --length-prefixed are mutually exclusive"
+        sys.stderr.write(f"{USAGE.splitlines()[0]}\nstream_filter.py: error: {message}\n")
+        return 2
+    framing = framings.pop() if framings else None
+
+    try:
+        if framing is None:
+            stream_document(sys.stdin, sys.stdout)
+            return 0
+        reader = iter_nul_delimited if framing == "nul" else iter_length_prefixed
+        return 1 if filter_documents(reader(sys.stdin.buffer), sys.stdout.buffer, framing) else 0
+    except ValueError as e:
+        sys.stderr.write(f"stream_filter.py: error: {e}\n")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
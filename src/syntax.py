@@ -0,0 +1,186 @@
+import re
+
+from textnode import TEXT_RENDERERS
+
+
+class BlockSyntax:
+    """
+    A block-level syntax, e.g. tables or admonitions.
+
+    Subclass it, set triggers and implement start() and to_html_node(),
+    then register an instance with register_block(). The parser offers a
+    line to start() only when its first character after indentation is
+    one of the triggers, so a syntax costs nothing on lines that can't
+    start it.
+
+    A leaf block (container = False) keeps the text of its lines in
+    block.lines. A container holds other blocks: the rest of each of its
+    lines is parsed as usual, inside the container.
+    """
+
+    # Label of the block in metrics, e.g. "table"
+    name = None
+    # Characters that can start the block, after up to 3 spaces of indentation
+    triggers = ""
+    container = False
+
+    def start(self, parser, line: str, pos: int, indent: int) -> int | None:
+        """
+        Open the block if line starts it.
+
+        Args:
+            parser: The BlockParser; add the block with parser.open(Block(self))
+            line: The line
+            pos: Position of the trigger character in line
+            indent: Spaces before it
+
+        Returns:
+            Where the block's content starts in line (len(line) if the line
+            is used up), or None, without opening anything, if line doesn't
+            start the block
+        """
+        raise NotImplementedError
+
+    def continue_line(self, block, line: str, pos: int) -> int | None:
+        """
+        Whether a line continues the open block. By default blocks are one line long.
+
+        Args:
+            block: The open Block
+            line: The line
+            pos: Where the line's text starts, after the prefixes of the blocks around this one
+
+        Returns:
+            Where the block's content starts in line, or None to close the block
+        """
+        return None
+
+    def to_html_node(self, block, children):
+        """
+        HTMLNode for a parsed block.
+
+        Args:
+            block: The Block
+            children: HTMLNodes of a container's blocks; None for a leaf
+        """
+        raise NotImplementedError
+
+
+class InlineSyntax:
+    """
+    An inline syntax, e.g. footnote references or strikethrough.
+
+    Subclass it, set triggers and implement match(), then register an
+    instance with register_inline(). Inline parsing looks only at the
+    trigger characters of the registered syntaxes, so text without any of
+    them is a single TextNode whatever is registered. A syntax whose nodes
+    need their own HTML sets text_type to an Enum member of its own and
+    implements to_html_node().
+    """
+
+    # Characters the syntax starts with
+    triggers = ""
+    # Text type of the nodes match() makes, when it isn't a TextType
+    text_type = None
+
+    def match(self, text: str, pos: int):
+        """
+        Parse the syntax at a trigger character.
+
+        Args:
+            text: The inline text
+            pos: Position of the trigger character in text
+
+        Returns:
+            Tuple of (TextNode, position after the syntax), or None if the
+            syntax doesn't start at pos
+
+        Raises:
+            ValueError: If the syntax starts at pos but is invalid
+        """
+        raise NotImplementedError
+
+    def to_html_node(self, text_node):
+        """HTMLNode for a TextNode of this syntax's text_type."""
+        raise NotImplementedError
+
+
+# Trigger character -> syntaxes, tried in registration order
+_block_syntaxes = {}
+_inline_syntaxes = {}
+
+# Dispatch tables derived from the above, rebuilt after every change
+_block_table = None
+_inline_table = None
+
+
+def _add(table: dict, syntax):
+    if not syntax.triggers:
+        raise ValueError(f"{type(syntax).__name__} has no trigger characters")
+    for char in dict.fromkeys(syntax.triggers):
+        table.setdefault(char, []).append(syntax)
+
+
+def register_block(syntax: BlockSyntax):
+    """Add a block syntax, tried after those registered before it with the same trigger."""
+    global _block_table
+    _add(_block_syntaxes, syntax)
+    _block_table = None
+
+
+def register_inline(syntax: InlineSyntax):
+    """Add an inline syntax, tried after those registered before it with the same trigger."""
+    global _inline_table
+    _add(_inline_syntaxes, syntax)
+    if syntax.text_type is not None:
+        TEXT_RENDERERS[syntax.text_type] = syntax.to_html_node
+    _inline_table = None
+
+
+def unregister(syntax):
+    """Remove a block or inline syntax."""
+    global _block_table, _inline_table
+    for table in (_block_syntaxes, _inline_syntaxes):
+        for char in list(table):
+            table[char] = [other for other in table[char] if other is not syntax]
+            if not table[char]:
+                del table[char]
+    if isinstance(syntax, InlineSyntax) and syntax.text_type is not None:
+        TEXT_RENDERERS.pop(syntax.text_type, None)
+    _block_table = None
+    _inline_table = None
+
+
+def _char_class(chars) -> str:
+    return "[" + "".join(re.escape(char) for char in sorted(chars)) + "]"
+
+
+def block_table() -> tuple[dict, re.Pattern]:
+    """
+    Returns:
+        Tuple of (trigger character -> tuple of block syntaxes, pattern
+        matching lines that could start a block after some indentation, or
+        are blank)
+    """
+    global _block_table
+    if _block_table is None:
+        starters = {char: tuple(syntaxes) for char, syntaxes in _block_syntaxes.items()}
+        if starters:
+            pattern = re.compile(r"[ \t]*(?:" + _char_class(starters) + "|$)")
+        else:
+            pattern = re.compile(r"[ \t]*$")
+        _block_table = (starters, pattern)
+    return _block_table
+
+
+def inline_table() -> tuple[dict, re.Pattern | None]:
+    """
+    Returns:
+        Tuple of (trigger character -> tuple of inline syntaxes, pattern
+        finding the next trigger character, or None if nothing is registered)
+    """
+    global _inline_table
+    if _inline_table is None:
+        triggers = {char: tuple(syntaxes) for char, syntaxes in _inline_syntaxes.items()}
+        _inline_table = (triggers, re.compile(_char_class(triggers)) if triggers else None)
+    return _inline_table
@@ -0,0 +1,88 @@
+import re
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ (\w+) \}\}")
+
+
+def apply_basepath(html: str, basepath: str) -> str:
+    """
+    Point root-relative href="/ and src="/ URLs at the site's basepath.
+
+    Args:
+        html: HTML string to rewrite
+        basepath: Base path for the site (e.g., "/" or "/REPO_NAME/")
+
+    Returns:
+        HTML with root-relative URLs prefixed by basepath
+    """
+    # Ensure basepath ends with / for proper replacement
+    if not basepath.endswith("/"):
+        basepath = basepath + "/"
+    if basepath == "/":
+        return html
+    html = html.replace('href="/', f'href="{basepath}')
+    return html.replace('src="/', f'src="{basepath}')
+
+
+def basepath_url(url: str, basepath: str) -> str:
+    """Point one root-relative URL (e.g. "/blog/tom") at the site's basepath, as apply_basepath does in HTML."""
+    if not basepath.endswith("/"):
+        basepath = basepath + "/"
+    if basepath == "/" or not url.startswith("/"):
+        return url
+    return basepath + url[1:]
+
+
+class Template:
+    """
+    A page template compiled once per build.
+
+    Everything that is the same for every page (asset URL rewriting, the
+    basepath and optional minification) is applied to the template source up
+    front, which leaves render() with a single join over the pre-split parts.
+    """
+
+    def __init__(self, source: str, basepath: str = "/", asset_manifest: dict = None, minify: bool = False):
+        # The rewriter and minifier are imported only when used, which keeps
+        # single-page renders from loading the build pipeline's modules
+        if asset_manifest:
+            from fingerprint import rewrite_html_urls
+            source = rewrite_html_urls(source, asset_manifest)
+        source = apply_basepath(source, basepath)
+        original_size = self._static_size(source)
+        if minify:
+            from minify import minify_html
+            source = minify_html(source)
+        self.basepath = basepath
+        self.source = source
+        # Even indices are literal text, odd indices are placeholder names
+        self.parts = PLACEHOLDER_PATTERN.split(source)
+        # Bytes removed from every page by minifying the template
+        self.minify_savings = original_size - self._static_size(source)
+
+    @staticmethod
+    def _static_size(source: str) -> int:
+        return sum(len(part.encode('utf-8')) for part in PLACEHOLDER_PATTERN.split(source)[::2])
+
+    @classmethod
+    def from_file(cls, template_path: str, **options) -> "Template":
+        """Read and compile a template file."""
+        with open(template_path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), **options)
+
+    def render(self, values: dict[str, str]) -> str:
+        """
+        Fill the template's {{ Name }} placeholders.
+
+        Args:
+            values: Mapping of placeholder name to replacement text; unknown
+                placeholders are left in place
+
+        Returns:
+            The rendered page
+        """
+        parts = self.parts[:]
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = values[name] if name in values else "{{ " + name + " }}"
+        return "".join(parts)
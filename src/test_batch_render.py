@@ -0,0 +1,65 @@
+import unittest
+
+from batch_render import render_many
+from block_markdown import markdown_to_html, markdown_to_html_node
+
+
+DOCS = [
+    "hello **world**",
+    "# Title\n\n- a\n- b",
+    "hello **world**",
+    "```\ncode\n```",
+    "> quote with [link](/x)",
+    "hello **world**",
+]
+
+
+class TestMarkdownToHtml(unittest.TestCase):
+    def test_matches_node_rendering(self):
+        for doc in DOCS:
+            self.assertEqual(markdown_to_html(doc), markdown_to_html_node(doc).to_html())
+
+    def test_empty_document(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html("\n\n")
+
+
+class TestRenderMany(unittest.TestCase):
+    def setUp(self):
+        self.expected = [markdown_to_html_node(doc).to_html() for doc in DOCS]
+
+    def test_in_order(self):
+        self.assertEqual(list(render_many(DOCS)), self.expected)
+
+    def test_chunking_and_dedupe_options(self):
+        for chunk_size in (1, 2, 4, 100):
+            for dedupe in (True, False):
+                self.assertEqual(list(render_many(DOCS, chunk_size=chunk_size, dedupe=dedupe)), self.expected)
+
+    def test_streams_lazily(self):
+        consumed = []
+
+        def source():
+            for doc in DOCS:
+                consumed.append(doc)
+                yield doc
+
+        results = render_many(source(), chunk_size=2)
+        self.assertEqual(next(results), self.expected[0])
+        self.assertEqual(len(consumed), 2)
+
+    def test_worker_pool(self):
+        docs = DOCS * 50
+        self.assertEqual(list(render_many(docs, workers=2, chunk_size=16)), self.expected * 50)
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            list(render_many(DOCS, chunk_size=0))
+
+    def test_errors_propagate(self):
+        with self.assertRaises(ValueError):
+            list(render_many(["ok", "unmatched **bold"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from bench import CorpusGenerator, percentile, run_benchmark, compare, parse_mix, build_suite, quiet, snippets
+from block_markdown import markdown_to_html_node
+from main import main
+
+
+class TestCorpusGenerator(unittest.TestCase):
+    def test_deterministic(self):
+        generator = CorpusGenerator(pages=5, seed=42)
+        urls = ["/a", "/b"]
+        self.assertEqual(generator.page_markdown(3, urls), generator.page_markdown(3, urls))
+        other = CorpusGenerator(pages=5, seed=43)
+        self.assertNotEqual(generator.page_markdown(3, urls), other.page_markdown(3, urls))
+
+    def test_page_paths_depth(self):
+        paths = CorpusGenerator(pages=20, depth=3).page_paths()
+        self.assertEqual(len(paths), 20)
+        self.assertEqual(len(set(paths)), 20)
+        self.assertTrue(all(path.count("/") == 4 for path in paths))
+
+    def test_generated_pages_render(self):
+        generator = CorpusGenerator(pages=10, blocks_per_page=40)
+        for i in range(10):
+            html = markdown_to_html_node(generator.page_markdown(i, ["/x"])).to_html()
+            self.assertTrue(html.startswith("<div><h1>Page"))
+
+    def test_write_and_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = CorpusGenerator(pages=6, blocks_per_page=5).write(tmp)
+            self.assertEqual(len(list((root / "content").rglob("*.md"))), 7)
+            with quiet():
+                main([], project_root=root)
+            self.assertEqual(len(list((root / "docs").rglob("index.html"))), 7)
+
+    def test_mix(self):
+        self.assertEqual(parse_mix("heading=1,code=3"), {"heading": 1, "code": 3})
+        generator = CorpusGenerator(mix={"code": 1}, blocks_per_page=3)
+        markdown = generator.page_markdown(0, ["/x"])
+        self.assertEqual(markdown.count("```"), 6)
+
+    def test_nested_mix(self):
+        generator = CorpusGenerator(mix={"nested": 1}, blocks_per_page=2)
+        markdown = generator.page_markdown(0, ["/x"])
+        self.assertIn("\n  - ", markdown)
+        self.assertIn("\n> 1. ", markdown)
+        # Off by default: the default corpus is unchanged
+        self.assertNotIn("\n  - ", CorpusGenerator(blocks_per_page=50).page_markdown(0, ["/x"]))
+
+
+class TestHarness(unittest.TestCase):
+    def test_percentile(self):
+        samples = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(samples, 95), 95.0)
+        self.assertEqual(percentile(samples, 50), 50.0)
+        self.assertEqual(percentile([3.0], 95), 3.0)
+
+    def test_run_benchmark(self):
+        calls = []
+        stats = run_benchmark(lambda: calls.append(1), warmup=2, repeats=3)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(len(stats["samples"]), 3)
+        self.assertLessEqual(stats["min"], stats["median"])
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0}}}
+        results = {"results": {"a": {"median": 1.05}, "b": {"median": 1.5}, "c": {"median": 9.0}}}
+        regressions = compare(results, baseline, 0.10)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("b:"))
+
+    def test_build_suite_names(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = CorpusGenerator(pages=2, blocks_per_page=3).write(tmp)
+            suite = build_suite(Path(root), snippet_count=50)
+            self.assertEqual(
+                set(suite),
+                {"text_to_textnodes", "block_to_block_type", "block_split", "block_parse", "markdown_to_html_node",
+                 "to_html", "html_escape", "copy_directory_contents", "main_build",
+                 "snippets_one_by_one", "snippets_render_many",
+                 "search_index_build", "search_index_update"},
+            )
+            suite["search_index_build"]()
+            self.assertTrue((Path(root) / "bench-search" / "index.json").is_file())
+            self.assertEqual(suite["snippets_one_by_one"](), suite["snippets_render_many"]())
+
+    def test_snippets_are_deterministic_with_duplicates(self):
+        comments = snippets(500)
+        self.assertEqual(comments, snippets(500))
+        self.assertLess(len(set(comments)), len(comments))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,12 @@ from block_markdown import (
     block_to_block_type,
     BlockType,
     markdown_to_html_node,
+    extract_link_definitions,
+    parse_blocks,
+    parse_inline,
+    block_to_html_node,
+    BlockParser,
+    LIST_ITEM,
 )
 
 
@@ -448,6 +454,137 @@ This is a paragraph with **bold** text.
         )
 
 
+class TestParseInline(unittest.TestCase):
+    def test_matches_rendering(self):
+        md = "# Title _x_\n\n> - item **b**\n>\n>   text [a]\n\n[a]: /a\n\n```\ncode _x_\n```"
+        document = parse_blocks(md)
+        definitions = extract_link_definitions(document)
+        parse_inline(document, definitions)
+        self.assertIsNotNone(document.children[0].text_nodes)
+        html = "".join(block_to_html_node(block, None, definitions).to_html() for block in document.children)
+        self.assertEqual("<div>" + html + "</div>", markdown_to_html_node(md).to_html())
+
+
+class TestLinkDefinitions(unittest.TestCase):
+    def test_extract_link_definitions(self):
+        document = parse_blocks("Intro\n\n[Docs]: /docs \"Title\"\n  [logo]: <https://example.com/a.png>\n[docs]: /second\n\nEnd")
+        definitions = extract_link_definitions(document)
+        self.assertEqual(definitions, {"docs": "/docs", "logo": "https://example.com/a.png"})
+        self.assertEqual([block.lines for block in document.children], [["Intro"], ["End"]])
+
+    def test_definition_lines_in_paragraphs(self):
+        document = parse_blocks("Text\n[a]: /a\nmore")
+        self.assertEqual(extract_link_definitions(document), {"a": "/a"})
+        self.assertEqual(document.children[0].lines, ["Text", "more"])
+
+    def test_code_blocks_keep_definition_lines(self):
+        md = "```\n[a]: /in-code\n```\n\n```inline```\n[b]: /outside"
+        document = parse_blocks(md)
+        self.assertEqual(extract_link_definitions(document), {"b": "/outside"})
+        self.assertEqual([block.kind for block in document.children], [BlockType.CODE, BlockType.CODE])
+
+    def test_indented_fences_keep_definition_lines(self):
+        self.assertEqual(
+            markdown_to_html_node("- item\n  ```\n  [a]: /x\n  ```\n\n[a]").to_html(),
+            "<div><ul><li>item<pre><code>[a]: /x\n</code></pre></li></ul><p>[a]</p></div>",
+        )
+
+    def test_reference_links_render(self):
+        md = "# Title\n\nSee [the guide][guide] and [guide].\n\n[guide]: /guide\n\n```\n[guide]\n```"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            '<div><h1>Title</h1><p>See <a href="/guide">the guide</a> and <a href="/guide">guide</a>.</p>'
+            "<pre><code>[guide]\n</code></pre></div>",
+        )
+
+    def test_code_spans_keep_references(self):
+        self.assertEqual(
+            markdown_to_html_node("`[docs]` and [docs]\n\n[docs]: /d").to_html(),
+            '<div><p><code>[docs]</code> and <a href="/d">docs</a></p></div>',
+        )
+
+
+class TestBlockParser(unittest.TestCase):
+    def assertRenders(self, md, html):
+        self.assertEqual(markdown_to_html_node(md).to_html(), "<div>" + html + "</div>")
+
+    def test_parse_blocks_tree(self):
+        document = parse_blocks("# Title\n\n- a\n  - b\n\n> quote")
+        self.assertEqual(
+            [block.kind for block in document.children],
+            [BlockType.HEADING, BlockType.UNORDERED_LIST, BlockType.QUOTE],
+        )
+        item = document.children[1].children[0]
+        self.assertEqual(item.kind, LIST_ITEM)
+        self.assertEqual([child.kind for child in item.children], [BlockType.PARAGRAPH, BlockType.UNORDERED_LIST])
+        self.assertEqual(item.children[0].lines, ["a"])
+
+    def test_nested_lists(self):
+        self.assertRenders(
+            "- a\n  - b\n    1. c\n- d",
+            "<ul><li>a<ul><li>b<ol><li>c</li></ol></li></ul></li><li>d</li></ul>",
+        )
+
+    def test_loose_list(self):
+        self.assertRenders("- a\n\n- b", "<ul><li><p>a</p></li><li><p>b</p></li></ul>")
+        # A blank line inside a nested list leaves the outer list tight
+        self.assertRenders(
+            "- a\n  - b\n\n  - c\n- d",
+            "<ul><li>a<ul><li><p>b</p></li><li><p>c</p></li></ul></li><li>d</li></ul>",
+        )
+
+    def test_fenced_code_keeps_blank_lines(self):
+        self.assertRenders("```\na\n\n\nb\n```", "<pre><code>a\n\n\nb\n</code></pre>")
+
+    def test_escapes_html(self):
+        self.assertRenders(
+            '[< Back](/a?b=1&c=2) & "more"\n\n```\nif a < b && c > d:\n```',
+            '<p><a href="/a?b=1&amp;c=2">&lt; Back</a> &amp; "more"</p>'
+            "<pre><code>if a &lt; b &amp;&amp; c &gt; d:\n</code></pre>",
+        )
+
+    def test_code_in_list_item(self):
+        self.assertRenders(
+            "1. one\n   ```\n   x = 1\n\n     y\n   ```\n2. two",
+            "<ol><li>one<pre><code>x = 1\n\n  y\n</code></pre></li><li>two</li></ol>",
+        )
+
+    def test_quote_containing_list(self):
+        self.assertRenders(
+            "> Intro\n> - a\n> - b\n\nAfter",
+            "<blockquote><p>Intro</p><ul><li>a</li><li>b</li></ul></blockquote><p>After</p>",
+        )
+
+    def test_quote_paragraphs(self):
+        self.assertRenders("> a\n>\n> b", "<blockquote><p>a</p><p>b</p></blockquote>")
+
+    def test_lazy_continuation(self):
+        self.assertRenders("> a\nb", "<blockquote>a b</blockquote>")
+        self.assertRenders("- a\nb", "<ul><li>a b</li></ul>")
+
+    def test_blocks_interrupt_paragraphs(self):
+        self.assertRenders("text\n## Heading\n- item", "<p>text</p><h2>Heading</h2><ul><li>item</li></ul>")
+
+    def test_ordered_lists_start_at_one(self):
+        self.assertRenders("2. not\n3. a list", "<p>2. not 3. a list</p>")
+        self.assertRenders("text\n2. more", "<p>text 2. more</p>")
+
+    def test_list_marker_change_starts_new_list(self):
+        self.assertRenders("- a\n1. b", "<ul><li>a</li></ul><ol><li>b</li></ol>")
+
+    def test_unclosed_fence_runs_to_end(self):
+        self.assertRenders("```\ncode\n\nmore", "<pre><code>code\n\nmore\n</code></pre>")
+
+    def test_open_blocks(self):
+        parser = BlockParser()
+        parser.feed("- a")
+        self.assertEqual(parser.open_blocks, 3)
+        parser.feed("")
+        self.assertEqual(parser.open_blocks, 2)
+        parser.feed("# Title")
+        self.assertEqual(parser.open_blocks, 0)
+        self.assertEqual(len(parser.close().children), 2)
+
+
 if __name__ == "__main__":
     unittest.main()
-
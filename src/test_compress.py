@@ -0,0 +1,78 @@
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+
+from build_cache import ContentCache, content_hash
+from compress import compress_file, precompress_directory, gzip_bytes
+
+
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.site = self.root / "docs"
+        (self.site / "blog").mkdir(parents=True)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_gzip_bytes_deterministic(self):
+        data = b"hello world " * 100
+        self.assertEqual(gzip_bytes(data), gzip_bytes(data))
+        self.assertEqual(gzip.decompress(gzip_bytes(data)), data)
+
+    def test_writes_gz_sibling(self):
+        page = self.site / "index.html"
+        page.write_text("<p>hello</p>" * 200)
+        result = compress_file(page)
+        sibling = self.site / "index.html.gz"
+        self.assertIn(sibling, result["written"])
+        self.assertEqual(gzip.decompress(sibling.read_bytes()), page.read_bytes())
+
+    def test_skips_small_files(self):
+        page = self.site / "tiny.html"
+        page.write_text("<p>hi</p>")
+        result = compress_file(page, min_size=512)
+        self.assertTrue(result["skipped"])
+        self.assertFalse((self.site / "tiny.html.gz").exists())
+
+    def test_cache_hit_on_unchanged_content(self):
+        cache = ContentCache(str(self.root / ".cache"), "compress")
+        page = self.site / "index.html"
+        page.write_text("<p>hello</p>" * 200)
+        first = compress_file(page, cache)
+        self.assertEqual(first["cache_hits"], 0)
+        second = compress_file(page, cache)
+        self.assertGreater(second["cache_hits"], 0)
+
+    def test_cached_blob_is_reused(self):
+        cache = ContentCache(str(self.root / ".cache"), "compress")
+        page = self.site / "index.html"
+        page.write_bytes(b"a" * 1000)
+        # Seed the cache with a marker blob to prove the compressor is skipped
+        cache.put(content_hash(page.read_bytes()) + ".gz", b"cached")
+        compress_file(page, cache)
+        self.assertEqual((self.site / "index.html.gz").read_bytes(), b"cached")
+
+    def test_precompress_directory(self):
+        (self.site / "index.html").write_text("<p>hello</p>" * 200)
+        (self.site / "blog" / "index.html").write_text("<p>post</p>" * 200)
+        (self.site / "index.css").write_text("body { color: red; }\n" * 100)
+        (self.site / "image.png").write_bytes(b"\x89PNG" * 500)
+        lines = []
+        totals = precompress_directory(str(self.site), cache_dir=str(self.root / ".cache"), log=lines.append)
+        self.assertEqual(totals["files"], 3)
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith("Precompressed 3 files"))
+        self.assertTrue((self.site / "blog" / "index.html.gz").exists())
+        self.assertTrue((self.site / "index.css.gz").exists())
+        self.assertFalse((self.site / "image.png.gz").exists())
+
+    def test_precompress_missing_directory(self):
+        with self.assertRaises(ValueError):
+            precompress_directory(str(self.root / "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+from content_collections import Collection, ListingPage, page_url
+
+
+def post(title: str, date: str = "", tags: list[str] = None, **extra) -> dict:
+    return dict({"title": title, "date": date, "tags": tags or [], "description": ""}, **extra)
+
+
+class TestHelpers(unittest.TestCase):
+    def test_page_url(self):
+        self.assertEqual(page_url("index.md"), "/")
+        self.assertEqual(page_url("blog/tom/index.md"), "/blog/tom")
+        self.assertEqual(page_url("blog/post.md"), "/blog/post.html")
+
+
+class TestListingPage(unittest.TestCase):
+    def test_to_html(self):
+        page = ListingPage(
+            "blog/page/2/index.html", "Blog",
+            [dict(post("Hi", "2024-01-01", description="Short"), url="/blog/hi.html")],
+            newer="/blog", older="/blog/page/3",
+        )
+        self.assertEqual(
+            page.to_html_node().to_html(),
+            '<div><h1>Blog</h1><ul><li><a href="/blog/hi.html">Hi</a><time>2024-01-01</time><p>Short</p></li></ul>'
+            '<nav><a href="/blog" rel="prev">Newer posts</a><a href="/blog/page/3" rel="next">Older posts</a></nav></div>',
+        )
+
+    def test_empty(self):
+        html = ListingPage("blog/index.html", "Blog", []).to_html_node().to_html()
+        self.assertEqual(html, "<div><h1>Blog</h1><p>No posts yet.</p></div>")
+
+
+class TestCollection(unittest.TestCase):
+    def setUp(self):
+        self.metadata = {
+            "index.md": post("Home"),
+            "blog/index.md": post("Blog"),
+            "blog/a.md": post("A", "2024-01-01", ["Lore"]),
+            "blog/b/index.md": post("B", "2024-03-01", ["Lore", "Elves"]),
+            "blog/c.md": post("C", "2024-02-01"),
+            "blog/draft.md": post("Draft", "2024-04-01", draft="true"),
+        }
+        self.collection = Collection("blog", per_page=2)
+
+    def titles(self, posts: list[dict]) -> list[str]:
+        return [post["title"] for post in posts]
+
+    def test_per_page(self):
+        with self.assertRaises(ValueError):
+            Collection("blog", per_page=0)
+
+    def test_posts_newest_first(self):
+        self.assertEqual(self.collection.update(self.metadata), 3)
+        self.assertEqual(len(self.collection), 3)
+        self.assertEqual(self.titles(self.collection.posts()), ["B", "C", "A"])
+        self.assertEqual(self.collection.posts()[0]["url"], "/blog/b")
+
+    def test_incremental_update(self):
+        self.collection.update(self.metadata)
+        self.assertEqual(self.collection.update(self.metadata), 0)
+        self.metadata["blog/a.md"] = post("A", "2024-05-01", ["Lore"])
+        del self.metadata["blog/c.md"]
+        self.metadata["blog/d.md"] = post("D", "2024-02-15")
+        self.assertEqual(self.collection.update(self.metadata), 3)
+        self.assertEqual(self.titles(self.collection.posts()), ["A", "B", "D"])
+
+    def test_listing_pages(self):
+        self.collection.update(self.metadata)
+        pages = self.collection.listing_pages()
+        self.assertEqual(
+            [page.path for page in pages],
+            [
+                "blog/index.html", "blog/page/2/index.html",
+                "blog/tags/elves/index.html", "blog/tags/lore/index.html",
+            ],
+        )
+        first, second, elves, lore = pages
+        self.assertEqual(self.titles(first.posts), ["B", "C"])
+        self.assertEqual((first.newer, first.older), (None, "/blog/page/2"))
+        self.assertEqual((second.title, second.newer, second.older), ("Blog (page 2)", "/blog", None))
+        self.assertEqual(elves.title, "Blog tagged Elves")
+        self.assertEqual(self.titles(lore.posts), ["B", "A"])
+
+    def test_key_tracks_content(self):
+        self.collection.update(self.metadata)
+        before = [page.key() for page in self.collection.listing_pages()]
+        self.metadata["blog/c.md"] = post("C, renamed", "2024-02-01")
+        self.collection.update(self.metadata)
+        after = [page.key() for page in self.collection.listing_pages()]
+        self.assertNotEqual(before[0], after[0])
+        self.assertEqual(before[2:], after[2:])
+
+
+if __name__ == "__main__":
+    unittest.main()
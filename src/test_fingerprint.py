@@ -0,0 +1,120 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from fingerprint import (
+    HashIndex,
+    fingerprinted_name,
+    fingerprint_assets,
+    rewrite_url,
+    rewrite_css_urls,
+    rewrite_html_urls,
+    rewrite_node_urls,
+    MANIFEST_NAME,
+)
+from block_markdown import markdown_to_html_node
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.site = self.root / "docs"
+        (self.site / "images").mkdir(parents=True)
+        (self.site / "index.css").write_text("body { color: red; }")
+        (self.site / "images" / "tom.png").write_bytes(b"\x89PNG fake")
+        (self.site / "index.html").write_text("<p>page</p>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fingerprinted_name(self):
+        self.assertEqual(fingerprinted_name("index.css", "abcdef0123456789"), "index.abcdef0123.css")
+        self.assertEqual(fingerprinted_name("LICENSE", "abcdef0123456789"), "LICENSE.abcdef0123")
+
+    def test_fingerprint_assets(self):
+        manifest = fingerprint_assets(str(self.site))
+        self.assertEqual(set(manifest), {"/index.css", "/images/tom.png"})
+        self.assertRegex(manifest["/index.css"], r"^/index\.[0-9a-f]{10}\.css$")
+        self.assertTrue((self.site / manifest["/images/tom.png"].lstrip("/")).exists())
+        # The originals stay for references the build can't rewrite
+        self.assertTrue((self.site / "index.css").exists())
+        self.assertTrue((self.site / "images" / "tom.png").exists())
+        # HTML pages are never renamed
+        self.assertTrue((self.site / "index.html").exists())
+        with open(self.site / MANIFEST_NAME) as f:
+            self.assertEqual(json.load(f), manifest)
+
+    def test_fingerprint_assets_rewrites_stylesheet_urls(self):
+        (self.site / "css").mkdir()
+        (self.site / "css" / "site.css").write_text(
+            'a { background: url("../images/tom.png"); } b { background: url(/images/tom.png#x); }'
+        )
+        manifest = fingerprint_assets(str(self.site))
+        image = manifest["/images/tom.png"]
+        css = (self.site / manifest["/css/site.css"].lstrip("/")).read_text()
+        self.assertEqual(css, f'a {{ background: url("..{image}"); }} b {{ background: url({image}#x); }}')
+        # The original keeps the names it was written with
+        self.assertIn("../images/tom.png", (self.site / "css" / "site.css").read_text())
+
+    def test_rewrite_css_urls(self):
+        manifest = {"/images/a.png": "/images/a.123.png", "/font.woff2": "/font.456.woff2"}
+        self.assertEqual(
+            rewrite_css_urls("url(images/a.png) url( font.woff2 )", "/site.css", manifest),
+            "url(images/a.123.png) url(font.456.woff2)",
+        )
+        self.assertEqual(
+            rewrite_css_urls("url('../font.woff2?v=2') url(missing.png)", "/css/site.css", manifest),
+            "url('../font.456.woff2?v=2') url(missing.png)",
+        )
+        for css in ("url(data:image/png;base64,AAAA)", "url(https://example.com/a.png)", "url(//cdn/a.png)"):
+            self.assertEqual(rewrite_css_urls(css, "/site.css", manifest), css)
+
+    def test_hash_index_skips_unchanged_files(self):
+        index_path = self.root / "hashes.json"
+        path = self.site / "index.css"
+        index = HashIndex(str(index_path))
+        digest = index.hash_file(path, "index.css")
+        index.save()
+        self.assertEqual(index.rehashed, 1)
+
+        index = HashIndex(str(index_path))
+        self.assertEqual(index.hash_file(path, "index.css"), digest)
+        self.assertEqual(index.rehashed, 0)
+
+    def test_hash_index_rehashes_changed_files(self):
+        path = self.site / "index.css"
+        index = HashIndex()
+        first = index.hash_file(path, "index.css")
+        path.write_text("body { color: blue; } /* changed */")
+        self.assertNotEqual(index.hash_file(path, "index.css"), first)
+        self.assertEqual(index.rehashed, 2)
+
+    def test_rewrite_url(self):
+        manifest = {"/index.css": "/index.abc.css"}
+        self.assertEqual(rewrite_url("/index.css", manifest), "/index.abc.css")
+        self.assertEqual(rewrite_url("/index.css?v=1#x", manifest), "/index.abc.css?v=1#x")
+        self.assertEqual(rewrite_url("/other.css", manifest), "/other.css")
+        self.assertEqual(rewrite_url("https://example.com/index.css", manifest), "https://example.com/index.css")
+
+    def test_rewrite_html_urls(self):
+        manifest = {"/index.css": "/index.abc.css"}
+        html = '<link href="/index.css" rel="stylesheet" /><a href="/blog">x</a>'
+        self.assertEqual(
+            rewrite_html_urls(html, manifest),
+            '<link href="/index.abc.css" rel="stylesheet" /><a href="/blog">x</a>',
+        )
+
+    def test_rewrite_node_urls(self):
+        manifest = {"/images/tom.png": "/images/tom.abc.png"}
+        node = markdown_to_html_node("![Tom](/images/tom.png) and [home](/)")
+        rewrite_node_urls(node, manifest)
+        self.assertEqual(
+            node.to_html(),
+            '<div><p><img src="/images/tom.abc.png" alt="Tom"> and <a href="/">home</a></p></div>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
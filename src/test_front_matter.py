@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+
+from block_markdown import markdown_to_html_node
+from front_matter import (
+    complete_metadata, parse_date, parse_front_matter, placeholder_values, read_metadata, split_front_matter,
+)
+from toc import TableOfContents
+
+
+PAGE = """---
+title: "Hello: World"
+date: 2024-05-01
+tags: [python, 'web']
+description: A short post
+cover_image: /images/a.png
+---
+# Heading
+
+Body text
+"""
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_parse(self):
+        metadata = parse_front_matter(["title: 'Quoted'", "", "# comment", "tags: a, b", "draft: true"])
+        self.assertEqual(metadata, {"title": "Quoted", "tags": ["a", "b"], "draft": "true"})
+        with self.assertRaises(ValueError):
+            parse_front_matter(["no colon here"])
+
+    def test_parse_date(self):
+        self.assertEqual(parse_date("2024-05-01"), "2024-05-01")
+        self.assertEqual(parse_date("2024-05-01T10:30:00+02:00"), "2024-05-01T08:30:00Z")
+        self.assertEqual(parse_date("2024-05-01 10:30"), "2024-05-01T10:30:00Z")
+        self.assertEqual(parse_date("2024-05-01T10:30:00Z"), "2024-05-01T10:30:00Z")
+        self.assertEqual(parse_date(""), "")
+        for value in ("May 1, 2024", "2024-13-01", "01/05/2024", ["2024-05-01"]):
+            with self.assertRaises(ValueError):
+                parse_date(value)
+
+    def test_dates_are_parsed(self):
+        self.assertEqual(parse_front_matter(['date: "2024-05-01T23:00:00-01:00"'])["date"], "2024-05-02T00:00:00Z")
+        with self.assertRaisesRegex(ValueError, "Invalid date: 'yesterday'"):
+            parse_front_matter(["date: yesterday"])
+
+    def test_split(self):
+        metadata, body = split_front_matter(PAGE)
+        self.assertEqual(metadata["title"], "Hello: World")
+        self.assertEqual(metadata["tags"], ["python", "web"])
+        self.assertEqual(body, "# Heading\n\nBody text\n")
+        self.assertEqual(split_front_matter("# Plain\n"), ({}, "# Plain\n"))
+        self.assertEqual(split_front_matter("----\n# x"), ({}, "----\n# x"))
+        with self.assertRaises(ValueError):
+            split_front_matter("---\ntitle: x\n# never closed\n")
+
+    def test_complete_metadata(self):
+        self.assertEqual(complete_metadata({}, "Title"), {"title": "Title", "date": "", "tags": [], "description": ""})
+        with self.assertRaises(ValueError):
+            complete_metadata({}, None)
+
+    def test_front_matter_title_wins(self):
+        self.assertEqual(complete_metadata(split_front_matter(PAGE)[0], "Heading")["title"], "Hello: World")
+        self.assertEqual(complete_metadata({"date": "2024-01-01"}, "From heading")["title"], "From heading")
+
+    def test_placeholder_values(self):
+        metadata = complete_metadata(split_front_matter(PAGE)[0], None)
+        values = placeholder_values(metadata)
+        self.assertEqual(values["Title"], "Hello: World")
+        self.assertEqual(values["Tags"], "python, web")
+        self.assertEqual(values["CoverImage"], "/images/a.png")
+
+    def test_placeholder_values_are_escaped(self):
+        values = placeholder_values({"title": "Fish & <Chips>", "description": 'Say "hi"', "tags": ["a<b"]})
+        self.assertEqual(values["Title"], "Fish &amp; &lt;Chips&gt;")
+        self.assertEqual(values["Description"], "Say &quot;hi&quot;")
+        self.assertEqual(values["Tags"], "a&lt;b")
+
+
+class TestReadMetadata(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text: str) -> str:
+        path = os.path.join(self.tmp.name, "page.md")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_matches_rendered_metadata(self):
+        for text in (
+            PAGE, "# Plain page\n\nBody", "---\ndate: 2024-01-01\n---\n\n# Late title\n",
+            "```sh\n# install\n```\n\n# Real **Title**\n", "````\n```\n# not closed yet\n````\n# After\n",
+            "```# one-line code```\n# Title\n",
+        ):
+            metadata, body = split_front_matter(text)
+            toc = TableOfContents()
+            markdown_to_html_node(body, toc)
+            self.assertEqual(read_metadata(self.write(text)), complete_metadata(metadata, toc.title()))
+
+    def test_skips_fenced_code(self):
+        self.assertEqual(read_metadata(self.write("```sh\n# install\n```\n\n# Real Title\n"))["title"], "Real Title")
+
+    def test_stops_before_the_body(self):
+        # A body that would fail to parse is never read
+        path = self.write("---\ntitle: Fast\n---\n" + "unmatched **bold\n" * 1000)
+        self.assertEqual(read_metadata(path)["title"], "Fast")
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            read_metadata(self.write("---\ntitle: x\n"))
+        with self.assertRaises(ValueError):
+            read_metadata(self.write("no title"))
+        path = self.write("---\ndate: 1st May\n---\n# Title\n")
+        with self.assertRaisesRegex(ValueError, "^" + path + ": Invalid date"):
+            read_metadata(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import HTMLNode, LeafNode, ParentNode, escape_attribute, escape_text
 
 class TestHTMLNode(unittest.TestCase):   
     def test_props_to_html(self):
@@ -82,5 +82,33 @@ class TestHTMLNode(unittest.TestCase):
             "<p><b>Bold text</b>Normal text<i>italic text</i>Normal text</p>",
         )
 
+    def test_iter_nodes_document_order(self):
+        first = LeafNode("b", "first")
+        second = LeafNode("i", "second")
+        inner = ParentNode("span", [second])
+        root = ParentNode("p", [first, inner])
+        self.assertEqual(list(root.iter_nodes()), [root, first, inner, second])
+
+    def test_escape_text(self):
+        self.assertEqual(escape_text('a < b && "c" > d'), 'a &lt; b &amp;&amp; "c" &gt; d')
+        self.assertEqual(escape_text("&lt;"), "&amp;lt;")
+        plain = "nothing to escape"
+        self.assertIs(escape_text(plain), plain)
+
+    def test_escape_attribute(self):
+        self.assertEqual(escape_attribute('/search?q="x"&page=<2>'), "/search?q=&quot;x&quot;&amp;page=&lt;2&gt;")
+
+    def test_to_html_escapes(self):
+        node = ParentNode("p", [
+            LeafNode(None, "1 < 2 & "),
+            LeafNode("a", "<script>", {"href": '/x?a=1&b="2"'}),
+            LeafNode("img", None, {"src": "/i.png", "alt": 'say "hi"'}),
+        ])
+        self.assertEqual(
+            node.to_html(),
+            '<p>1 &lt; 2 &amp; <a href="/x?a=1&amp;b=&quot;2&quot;">&lt;script&gt;</a>'
+            '<img src="/i.png" alt="say &quot;hi&quot;"></p>',
+        )
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
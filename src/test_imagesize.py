@@ -0,0 +1,137 @@
+import os
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from imagesize import probe_image, ImageSizeCache, add_image_dimensions
+from block_markdown import markdown_to_html_node
+
+
+def png_bytes(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height) + b"\x08\x06\x00\x00\x00"
+
+
+def gif_bytes(width, height):
+    return b"GIF89a" + struct.pack("<HH", width, height) + b"\x00" * 10
+
+
+def jpeg_bytes(width, height):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof = b"\xff\xc0" + struct.pack(">HBHH", 17, 8, height, width) + b"\x03" + b"\x00" * 9
+    return b"\xff\xd8" + app0 + sof + b"\xff\xd9"
+
+
+def webp_bytes(chunk, payload):
+    body = b"WEBP" + chunk + struct.pack("<I", len(payload)) + payload
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+class TestProbeImage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def probe(self, name, data):
+        path = self.dir / name
+        path.write_bytes(data)
+        return probe_image(str(path))
+
+    def test_png(self):
+        self.assertEqual(self.probe("a.png", png_bytes(1026, 388)), (1026, 388))
+
+    def test_gif(self):
+        self.assertEqual(self.probe("a.gif", gif_bytes(320, 200)), (320, 200))
+
+    def test_jpeg(self):
+        self.assertEqual(self.probe("a.jpg", jpeg_bytes(640, 480)), (640, 480))
+
+    def test_webp_lossy(self):
+        payload = b"\x00" * 3 + b"\x9d\x01\x2a" + struct.pack("<HH", 800, 600) + b"\x00" * 4
+        self.assertEqual(self.probe("a.webp", webp_bytes(b"VP8 ", payload)), (800, 600))
+
+    def test_webp_lossless(self):
+        bits = (400 - 1) | ((300 - 1) << 14)
+        payload = b"\x2f" + bits.to_bytes(4, "little") + b"\x00" * 8
+        self.assertEqual(self.probe("a.webp", webp_bytes(b"VP8L", payload)), (400, 300))
+
+    def test_webp_extended(self):
+        payload = b"\x00" * 4 + (1920 - 1).to_bytes(3, "little") + (1080 - 1).to_bytes(3, "little")
+        self.assertEqual(self.probe("a.webp", webp_bytes(b"VP8X", payload)), (1920, 1080))
+
+    def test_unknown_format(self):
+        self.assertIsNone(self.probe("a.txt", b"not an image at all"))
+
+    def test_truncated_jpeg(self):
+        self.assertIsNone(self.probe("a.jpg", b"\xff\xd8\xff\xe0\x00"))
+
+
+class TestImageSizeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = Path(self.tmp.name) / "static"
+        (self.static / "images").mkdir(parents=True)
+        (self.static / "images" / "tom.png").write_bytes(png_bytes(928, 468))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_probes_each_image_once(self):
+        cache = ImageSizeCache(str(self.static))
+        for _ in range(100):
+            self.assertEqual(cache.dimensions("/images/tom.png"), (928, 468))
+        self.assertEqual(cache.probes, 1)
+
+    def test_reprobes_when_mtime_changes(self):
+        cache = ImageSizeCache(str(self.static))
+        path = self.static / "images" / "tom.png"
+        cache.dimensions("/images/tom.png")
+        path.write_bytes(png_bytes(10, 20))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(cache.dimensions("/images/tom.png"), (10, 20))
+        self.assertEqual(cache.probes, 2)
+
+    def test_persisted_between_builds(self):
+        index = Path(self.tmp.name) / "image-sizes.json"
+        cache = ImageSizeCache(str(self.static), index_path=str(index))
+        cache.dimensions("/images/tom.png")
+        cache.save()
+        cache = ImageSizeCache(str(self.static), index_path=str(index))
+        self.assertEqual(cache.dimensions("/images/tom.png"), (928, 468))
+        self.assertEqual(cache.probes, 0)
+
+    def test_remote_and_missing_images(self):
+        cache = ImageSizeCache(str(self.static))
+        self.assertIsNone(cache.dimensions("https://example.com/tom.png"))
+        self.assertIsNone(cache.dimensions("//cdn.example.com/tom.png"))
+        self.assertIsNone(cache.dimensions("/images/missing.png"))
+
+    def test_paths_stay_in_the_static_directory(self):
+        outside = Path(self.tmp.name) / "secret.png"
+        outside.write_bytes(png_bytes(1, 1))
+        cache = ImageSizeCache(str(self.static))
+        self.assertIsNone(cache.dimensions("/../secret.png"))
+        self.assertIsNone(cache.dimensions("/images/../../secret.png"))
+        self.assertEqual(cache.probes, 0)
+        # Paths that only pass through .. inside the directory are fine, and share an entry
+        self.assertEqual(cache.dimensions("/images/../images/tom.png"), (928, 468))
+        self.assertEqual(cache.dimensions("/images/tom.png"), (928, 468))
+        self.assertEqual(cache.probes, 1)
+
+    def test_add_image_dimensions(self):
+        cache = ImageSizeCache(str(self.static))
+        node = markdown_to_html_node("![Tom](/images/tom.png) ![Remote](https://example.com/a.png)")
+        add_image_dimensions(node, cache)
+        self.assertEqual(
+            node.to_html(),
+            '<div><p><img src="/images/tom.png" alt="Tom" width="928" height="468" loading="lazy" decoding="async"> '
+            '<img src="https://example.com/a.png" alt="Remote" loading="lazy" decoding="async"></p></div>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
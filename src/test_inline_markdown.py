@@ -7,6 +7,8 @@ from inline_markdown import (
     split_nodes_image,
     split_nodes_link,
     text_to_textnodes,
+    normalize_label,
+    resolve_reference_links,
 )
 
 
@@ -723,6 +725,47 @@ class TestTextToTextNodes(unittest.TestCase):
         self.assertListEqual(expected, nodes)
 
 
+class TestResolveReferenceLinks(unittest.TestCase):
+    def setUp(self):
+        self.definitions = {"docs": "/docs", "the logo": "/logo.png"}
+
+    def test_normalize_label(self):
+        self.assertEqual(normalize_label("  The\n  Logo "), "the logo")
+
+    def test_reference_forms(self):
+        nodes = [TextNode("[Read][DOCS], [docs][], [Docs] and ![alt][the  logo]", TextType.TEXT)]
+        self.assertListEqual(
+            resolve_reference_links(nodes, self.definitions),
+            [
+                TextNode("Read", TextType.LINK, "/docs"),
+                TextNode(", ", TextType.TEXT),
+                TextNode("docs", TextType.LINK, "/docs"),
+                TextNode(", ", TextType.TEXT),
+                TextNode("Docs", TextType.LINK, "/docs"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("alt", TextType.IMAGE, "/logo.png"),
+            ],
+        )
+
+    def test_unresolved_and_inline_links_are_kept(self):
+        nodes = text_to_textnodes("[a][missing] [missing] [docs](/inline) [x]: not a reference")
+        self.assertListEqual(resolve_reference_links(nodes, self.definitions), nodes)
+
+    def test_no_definitions(self):
+        nodes = [TextNode("[docs][]", TextType.TEXT)]
+        self.assertIs(resolve_reference_links(nodes, {}), nodes)
+
+    def test_code_spans_are_not_resolved(self):
+        nodes = text_to_textnodes("`[docs]` and [docs].")
+        self.assertListEqual(
+            resolve_reference_links(nodes, self.definitions),
+            [
+                TextNode("[docs]", TextType.CODE),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("docs", TextType.LINK, "/docs"),
+                TextNode(".", TextType.TEXT),
+            ],
+        )
+
 if __name__ == "__main__":
     unittest.main()
-
@@ -0,0 +1,70 @@
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from linkcheck import LinkGraph, collect_links, link_target, page_directory, page_targets
+
+
+class TestHelpers(unittest.TestCase):
+    def test_collect_links(self):
+        node = ParentNode("div", [
+            LeafNode("a", "Home", {"href": "/"}),
+            ParentNode("p", [LeafNode("img", "", {"src": "/images/a.png", "alt": "A"})]),
+        ])
+        self.assertEqual(collect_links(node), ["/", "/images/a.png"])
+
+    def test_link_target(self):
+        self.assertEqual(link_target("/blog/tom"), "/blog/tom")
+        self.assertEqual(link_target("/blog/"), "/blog/")
+        self.assertEqual(link_target("/"), "/")
+        self.assertEqual(link_target("/a%20b.html?x=1#top"), "/a b.html")
+        self.assertEqual(link_target("../majesty", "/blog/tom/"), "/blog/majesty")
+        self.assertEqual(link_target("images/a.png", "/blog/"), "/blog/images/a.png")
+        for url in ("https://example.com/", "//cdn.example.com/a.js", "mailto:me@example.com", "#top", ""):
+            self.assertIsNone(link_target(url), url)
+
+    def test_page_paths(self):
+        self.assertEqual(page_directory("index.html"), "/")
+        self.assertEqual(page_directory("blog/tom/index.html"), "/blog/tom/")
+        self.assertEqual(page_targets("index.html"), ("/index.html", "/"))
+        self.assertEqual(page_targets("blog/index.html"), ("/blog/index.html", "/blog/", "/blog"))
+        self.assertEqual(page_targets("contact.html"), ("/contact.html",))
+
+
+class TestLinkGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = LinkGraph()
+        self.graph.update("index.html", ["/blog", "https://example.com/", "/missing"])
+        self.graph.update("blog/index.html", ["tom", "/"])
+        self.graph.update("blog/tom/index.html", ["../", "/images/a.png"])
+        self.graph.update("orphan.html", ["/"])
+        self.files = {"index.html", "blog/index.html", "blog/tom/index.html", "orphan.html", "images/a.png"}
+
+    def test_check(self):
+        self.assertEqual(len(self.graph), 4)
+        self.assertEqual(self.graph.check(self.files), {"index.html": ["/missing"]})
+
+    def test_file_changes_recheck_linking_pages(self):
+        self.graph.check(self.files)
+        self.assertEqual(
+            self.graph.check(self.files - {"images/a.png"}),
+            {"blog/tom/index.html": ["/images/a.png"], "index.html": ["/missing"]},
+        )
+        self.assertEqual(self.graph.check(self.files | {"missing"}), {})
+
+    def test_update_and_prune(self):
+        self.graph.check(self.files)
+        self.graph.update("index.html", ["/blog"])
+        self.graph.update("blog/tom/index.html", ["/nowhere"])
+        self.graph.prune(["index.html", "blog/tom/index.html", "orphan.html"])
+        self.assertEqual(self.graph.check(self.files), {"blog/tom/index.html": ["/nowhere"]})
+
+    def test_orphans(self):
+        pages = ["index.html", "blog/index.html", "blog/tom/index.html", "orphan.html"]
+        self.assertEqual(self.graph.orphans(pages), ["orphan.html"])
+        # A page linking only to itself is still an orphan
+        self.graph.update("orphan.html", ["/orphan.html"])
+        self.assertEqual(self.graph.orphans(pages), ["orphan.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from main import generate_page, generate_pages_recursive
+
+
+class TestGeneratePages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "content" / "blog").mkdir(parents=True)
+        (self.root / "content" / "index.md").write_text("# Home\n\n[Blog](/blog/)")
+        (self.root / "content" / "blog" / "post.md").write_text("---\ntitle: Post\n---\nText")
+        (self.root / "template.html").write_text("<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_generate_page(self):
+        dest = self.root / "out" / "index.html"
+        generate_page(str(self.root / "content" / "index.md"), str(self.root / "template.html"), str(dest), "/fan/")
+        self.assertEqual(dest.read_text(), '<title>Home</title><div><h1 id="home">Home</h1><p><a href="/fan/blog/">Blog</a></p></div>')
+
+    def test_generate_pages_recursive(self):
+        out = self.root / "out"
+        generate_pages_recursive(str(self.root / "content"), str(self.root / "template.html"), str(out))
+        self.assertEqual(sorted(path.relative_to(out).as_posix() for path in out.rglob("*.html")),
+                         ["blog/post.html", "index.html"])
+        self.assertEqual((out / "blog" / "post.html").read_text(), "<title>Post</title><div><p>Text</p></div>")
+        with self.assertRaises(ValueError):
+            generate_pages_recursive(str(self.root / "missing"), str(self.root / "template.html"), str(out))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+from memory_report import measure_page, largest_pages, build_memory_report
+
+
+class TestMemoryReport(unittest.TestCase):
+    def test_measure_page_stages(self):
+        markdown = "# Title\n\n" + "\n\n".join(f"Paragraph {i} with **bold** text" for i in range(200))
+        stages = measure_page(markdown)
+        self.assertEqual(
+            [stage["stage"] for stage in stages],
+            ["parse_blocks", "text_to_textnodes", "block_to_html_node", "to_html"],
+        )
+        for stage in stages:
+            self.assertGreater(stage["peak_bytes"], 0)
+            self.assertEqual(stage["pid"], os.getpid())
+            self.assertIn("rss_delta_kb", stage)
+            self.assertIn("peak_rss_growth_kb", stage)
+        # TextNode lists and the ParentNode tree are measured apart, and
+        # both outweigh the Block tree they came from
+        self.assertTrue(any("inline_markdown.py" in site["site"] for site in stages[1]["top_sites"]))
+        self.assertGreater(stages[1]["retained_bytes"], stages[0]["retained_bytes"])
+        self.assertGreater(stages[2]["retained_bytes"], stages[0]["retained_bytes"])
+        self.assertTrue(stages[2]["top_sites"])
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_largest_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "blog").mkdir()
+            (root / "small.md").write_text("# a")
+            (root / "blog" / "big.md").write_text("# b\n\n" + "text " * 100)
+            (root / "medium.md").write_text("# c\n\n" + "text " * 10)
+            self.assertEqual(
+                [path.name for path in largest_pages(tmp, 2)],
+                ["big.md", "medium.md"],
+            )
+
+    def test_build_memory_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "index.md").write_text("# Home\n\n- one\n- two")
+            report = build_memory_report(tmp, pages=1)
+            self.assertEqual(len(report["pages"]), 1)
+            self.assertEqual(report["pages"][0]["path"], "index.md")
+            self.assertEqual(len(report["pages"][0]["stages"]), 4)
+
+    def test_build_memory_report_per_worker(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "a.md").write_text("# A\n\n" + "Some _text_ " * 50)
+            Path(tmp, "b.md").write_text("# B\n\nMore")
+            report = build_memory_report(tmp, pages=2, workers=2)
+        self.assertEqual([page["path"] for page in report["pages"]], ["a.md", "b.md"])
+        self.assertNotIn(os.getpid(), [worker["pid"] for worker in report["workers"]])
+        self.assertEqual(sorted(path for worker in report["workers"] for path in worker["pages"]), ["a.md", "b.md"])
+
+    def test_build_memory_report_skips_front_matter(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "index.md").write_text("---\ntitle: Home\ncover_image: /images/cover.png\n---\nSome text")
+            report = build_memory_report(tmp, pages=1)
+            self.assertEqual(len(report["pages"][0]["stages"]), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
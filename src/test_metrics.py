@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+import metrics
+from block_markdown import markdown_to_html_node
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.reset()
+
+    def test_inc_and_get(self):
+        metrics.inc("static_site_pages_rendered_total")
+        metrics.inc("static_site_pages_rendered_total", amount=2)
+        self.assertEqual(metrics.get("static_site_pages_rendered_total"), 3)
+
+    def test_render_counts(self):
+        markdown_to_html_node("# Title\n\nSome **bold** and a [link](/x)\n\n- a\n- b")
+        self.assertEqual(metrics.get("static_site_blocks_total", "heading"), 1)
+        self.assertEqual(metrics.get("static_site_blocks_total", "paragraph"), 1)
+        self.assertEqual(metrics.get("static_site_blocks_total", "unordered_list"), 1)
+        self.assertEqual(metrics.get("static_site_textnodes_total", "bold"), 1)
+        self.assertEqual(metrics.get("static_site_textnodes_total", "link"), 1)
+        self.assertEqual(metrics.get("static_site_regex_invocations_total", "LinkSyntax.match"), 1)
+        # div, h1, p, ul, 2x li, and one leaf per TextNode
+        self.assertEqual(metrics.get("static_site_htmlnodes_created_total"), 6 + 7)
+
+    def test_render_textfile(self):
+        metrics.inc("static_site_blocks_total", "code", 2)
+        metrics.inc("static_site_cache_requests_total", ("compress", "hit"))
+        text = metrics.render_textfile()
+        self.assertIn("# TYPE static_site_blocks_total counter\n", text)
+        self.assertIn('static_site_blocks_total{type="code"} 2\n', text)
+        self.assertIn('static_site_cache_requests_total{cache="compress",result="hit"} 1\n', text)
+        # Unlabelled counters are always exported, even at zero
+        self.assertIn("static_site_pages_rendered_total 0\n", text)
+
+    def test_label_escaping(self):
+        metrics.inc("static_site_blocks_total", 'we"ird')
+        self.assertIn('{type="we\\"ird"}', metrics.render_textfile())
+
+    def test_write_textfile(self):
+        metrics.inc("static_site_pages_rendered_total")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "static_site.prom")
+            metrics.write_textfile(path)
+            with open(path) as f:
+                self.assertIn("static_site_pages_rendered_total 1\n", f.read())
+            self.assertEqual(os.listdir(tmp), ["static_site.prom"])
+
+
+if __name__ == "__main__":
+    unittest.main()
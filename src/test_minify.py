@@ -0,0 +1,106 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from minify import minify_html, minify_css, minify_tag, minify_static_css, MinifyStats
+
+
+class TestMinifyHTML(unittest.TestCase):
+    def test_collapses_template_whitespace(self):
+        html = """<!doctype html>
+<html>
+  <head>
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+        self.assertEqual(
+            minify_html(html),
+            "<!doctype html><html><head><title>{{ Title }}</title>"
+            "<link href=/index.css rel=stylesheet></head>"
+            "<body><article>{{ Content }}</article></body></html>",
+        )
+
+    def test_keeps_inline_whitespace(self):
+        self.assertEqual(minify_html("<p>a  <b>b</b>\n <i>c</i></p>"), "<p>a <b>b</b> <i>c</i></p>")
+
+    def test_preserves_pre_code(self):
+        html = "<div>\n  <pre><code>line 1\n\n    line 2</code></pre>\n</div>"
+        self.assertEqual(minify_html(html), "<div><pre><code>line 1\n\n    line 2</code></pre></div>")
+
+    def test_preserves_inline_code(self):
+        self.assertEqual(minify_html("<p>run <code>a  =  b</code></p>"), "<p>run <code>a  =  b</code></p>")
+
+    def test_drops_comments(self):
+        self.assertEqual(minify_html("<p>a<!-- note -->b</p>"), "<p>ab</p>")
+
+    def test_minify_tag_keeps_quotes_when_needed(self):
+        self.assertEqual(
+            minify_tag('<meta name="viewport" content="width=device-width, initial-scale=1" />'),
+            '<meta name=viewport content="width=device-width, initial-scale=1">',
+        )
+        self.assertEqual(minify_tag('<a href="/blog/">'), '<a href="/blog/">')
+        self.assertEqual(minify_tag('<img alt="" src="a.png">'), '<img alt="" src=a.png>')
+
+
+class TestMinifyCSS(unittest.TestCase):
+    def test_basic(self):
+        css = """
+/* heading */
+h1,
+h2 {
+    color: #dda15e;
+    margin: 0 auto;
+}
+"""
+        self.assertEqual(minify_css(css), "h1,h2{color:#dda15e;margin:0 auto}")
+
+    def test_preserves_strings(self):
+        self.assertEqual(minify_css('a { content: " ;} x" ; }'), 'a{content:" ;} x"}')
+
+    def test_media_query_spacing(self):
+        self.assertEqual(
+            minify_css("@media screen and (max-width: 600px) { a > b { color: red; } }"),
+            "@media screen and (max-width:600px){a>b{color:red}}",
+        )
+
+    def test_keeps_license_comments(self):
+        self.assertEqual(minify_css("/*! MIT */ a { color: red }"), "/*! MIT */ a{color:red}")
+
+
+class TestMinifyStaticCSS(unittest.TestCase):
+    def test_minifies_in_place_and_reports(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            site = Path(tmp) / "docs"
+            site.mkdir()
+            css = site / "index.css"
+            css.write_text("body {\n  color: red;\n}\n")
+            stats = MinifyStats()
+            count = minify_static_css(str(site), cache_dir=str(Path(tmp) / ".cache"), stats=stats)
+            self.assertEqual(count, 1)
+            self.assertEqual(css.read_text(), "body{color:red}")
+            files, before, after = stats.by_type[".css"]
+            self.assertEqual((files, before, after), (1, 23, 15))
+            lines = []
+            stats.report(lines.append)
+            self.assertEqual(lines, ["Minified 1 .css files: 23 -> 15 bytes (saved 8, 34.8%)"])
+
+    def test_cache_hit_on_second_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            site = Path(tmp) / "docs"
+            site.mkdir()
+            (site / "index.css").write_text("body {\n  color: red;\n}\n")
+            cache_dir = str(Path(tmp) / ".cache")
+            minify_static_css(str(site), cache_dir=cache_dir)
+            (site / "index.css").write_text("body {\n  color: red;\n}\n")
+            minify_static_css(str(site), cache_dir=cache_dir)
+            self.assertEqual((site / "index.css").read_text(), "body{color:red}")
+            self.assertTrue(any((Path(cache_dir) / "minify").rglob("*.css")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import pstats
+import tempfile
+import unittest
+
+from page_profile import PageProfiler, profile_name, profile_page
+from block_markdown import markdown_to_html_node
+
+
+class TestPageProfiler(unittest.TestCase):
+    def make_profiler(self, **kwargs):
+        profiler = PageProfiler(**kwargs)
+        profiler.record("a.md", 0.010, 100, 200, 5)
+        profiler.record("b.md", 0.030, 300, 600, 15)
+        profiler.record("c.md", 0.020, 200, 400, 10)
+        return profiler
+
+    def test_slowest(self):
+        profiler = self.make_profiler(top_n=2)
+        self.assertEqual([record["path"] for record in profiler.slowest()], ["b.md", "c.md"])
+        self.assertEqual(len(profiler.slowest(10)), 3)
+
+    def test_merge_worker_records(self):
+        profiler = self.make_profiler()
+        worker = PageProfiler()
+        worker.record("d.md", 0.050, 10, 20, 1)
+        profiler.merge(worker.records)
+        self.assertEqual(profiler.slowest(1)[0]["path"], "d.md")
+
+    def test_report(self):
+        lines = []
+        self.make_profiler(top_n=2).report(lines.append)
+        self.assertEqual(lines[0], "Profiled 3 pages in 60.0 ms")
+        self.assertEqual([line.split()[-1] for line in lines[2:]], ["b.md", "c.md"])
+
+    def test_profile_name(self):
+        self.assertEqual(profile_name("blog/tom/index.md"), "blog__tom__index")
+        self.assertEqual(profile_name("index.md"), "index")
+
+    def test_capture_profiles_for_sample(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = self.make_profiler(sample=2, output_dir=tmp)
+            rendered = []
+
+            def render(path):
+                rendered.append(path)
+                return markdown_to_html_node("# " + path).to_html()
+
+            lines = []
+            written = profiler.capture_profiles(render, log=lines.append)
+            self.assertEqual(rendered, ["b.md", "c.md"])
+            self.assertEqual(lines, [f"Wrote profile: {path}" for path in written])
+            self.assertEqual(sorted(os.listdir(tmp)), ["b.prof", "c.prof"])
+            stats = pstats.Stats(str(written[0]))
+            self.assertGreater(stats.total_calls, 0)
+
+    def test_capture_disabled_without_output_dir(self):
+        profiler = self.make_profiler(sample=2)
+        self.assertEqual(profiler.capture_profiles(lambda path: None), [])
+
+    def test_profile_page(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            prof_path = os.path.join(tmp, "page.prof")
+            profile_page(lambda path: markdown_to_html_node("**x**").to_html(), "x.md", prof_path)
+            self.assertTrue(os.path.exists(prof_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from render_page import main, parse_args, render_file
+from site_builder import render_markdown_page
+from template import Template
+
+
+MARKDOWN = "# Hello\n\nA [link](/blog) and ![img](/images/a.png)\n"
+
+
+class TestRenderPage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, 'w') as f:
+            f.write('<title>{{ Title }}</title><link href="/index.css">{{ Content }}')
+        self.source = os.path.join(self.tmp.name, "page.md")
+        with open(self.source, 'w') as f:
+            f.write(MARKDOWN)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_site_rendering(self):
+        for basepath in ("/", "/repo/"):
+            expected = render_markdown_page(MARKDOWN, Template.from_file(self.template, basepath=basepath))
+            self.assertEqual(render_file(MARKDOWN, self.template, basepath), expected)
+
+    def test_parse_args(self):
+        options = parse_args(["page.md", "--basepath", "/repo/", "-o", "out.html"])
+        self.assertEqual(options["source"], "page.md")
+        self.assertEqual(options["basepath"], "/repo/")
+        self.assertEqual(options["output"], "out.html")
+        for argv in ([], ["a.md", "b.md"], ["--bogus", "a.md"], ["a.md", "--template"]):
+            with self.assertRaises(ValueError):
+                parse_args(argv)
+
+    def test_main_writes_output(self):
+        output = os.path.join(self.tmp.name, "out.html")
+        self.assertEqual(main([self.source, "--template", self.template, "-o", output]), 0)
+        with open(output) as f:
+            self.assertTrue(f.read().startswith("<title>Hello</title>"))
+
+    def test_main_reports_errors(self):
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            self.assertEqual(main([os.path.join(self.tmp.name, "missing.md"), "--template", self.template]), 1)
+            self.assertEqual(main([]), 2)
+        self.assertIn("render_page.py: error:", err.getvalue())
+
+    def test_main_names_the_file_of_invalid_pages(self):
+        source = os.path.join(self.tmp.name, "bad.md")
+        with open(source, 'w') as f:
+            f.write("---\ndate: someday\n---\n# Bad\n")
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            self.assertEqual(main([source, "--template", self.template]), 1)
+        self.assertIn(f"render_page.py: error: {source}: Invalid date: 'someday'", err.getvalue())
+
+    def test_imports_only_what_a_single_page_needs(self):
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "render_page.py")
+        code = (
+            f"import runpy, sys; sys.argv = ['render_page.py', {self.source!r}, '--template', {self.template!r}]; "
+            f"sys.path.insert(0, {os.path.dirname(script)!r})\n"
+            f"try:\n    runpy.run_path({script!r}, run_name='__main__')\nexcept SystemExit:\n    pass\n"
+            "print(sorted(m for m in ('site_builder', 'pathlib', 'shutil', 'argparse', 'fingerprint', 'minify') if m in sys.modules), file=sys.stderr)"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        self.assertTrue(result.stdout.startswith("<title>Hello</title>"))
+        self.assertEqual(result.stderr.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
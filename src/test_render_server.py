@@ -0,0 +1,181 @@
+import http.client
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from loadgen import run_load
+from render_server import RenderCache, RenderServer
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_hit_after_miss(self):
+        cache = RenderCache(1024)
+        calls = []
+        render = lambda: calls.append(1) or b"page"
+        self.assertEqual(cache.get_or_render(("a.md", 1), render), b"page")
+        self.assertEqual(cache.get_or_render(("a.md", 1), render), b"page")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_new_mtime_misses(self):
+        cache = RenderCache(1024)
+        cache.get_or_render(("a.md", 1), lambda: b"old")
+        self.assertEqual(cache.get_or_render(("a.md", 2), lambda: b"new"), b"new")
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = RenderCache(10)
+        cache.get_or_render("a", lambda: b"aaaa")
+        cache.get_or_render("b", lambda: b"bbbb")
+        cache.get_or_render("a", lambda: b"unused")
+        cache.get_or_render("c", lambda: b"cccc")
+        self.assertEqual(cache.size, 8)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.get_or_render("a", lambda: b"miss"), b"aaaa")
+        self.assertEqual(cache.get_or_render("b", lambda: b"miss"), b"miss")
+
+    def test_oversized_values_are_not_cached(self):
+        cache = RenderCache(4)
+        cache.get_or_render("a", lambda: b"too large")
+        self.assertEqual(len(cache), 0)
+
+    def test_concurrent_misses_are_coalesced(self):
+        cache = RenderCache(1024)
+        calls = []
+        started = threading.Event()
+
+        def render():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return b"page"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_render("a", render))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [b"page"] * 8)
+        self.assertEqual(cache.coalesced + cache.hits, 7)
+
+    def test_errors_reach_waiters_and_are_not_cached(self):
+        cache = RenderCache(1024)
+
+        def render():
+            raise ValueError("No h1 header found in markdown content")
+
+        with self.assertRaises(ValueError):
+            cache.get_or_render("a", render)
+        self.assertEqual(cache.get_or_render("a", lambda: b"fixed"), b"fixed")
+
+    def test_interrupted_render_is_not_cached(self):
+        cache = RenderCache(1024)
+        rendering = threading.Event()
+        release = threading.Event()
+
+        def render():
+            rendering.set()
+            release.wait()
+            raise KeyboardInterrupt
+
+        errors = []
+
+        def request(render):
+            try:
+                cache.get_or_render("a", render)
+            except BaseException as e:
+                errors.append(type(e))
+
+        leader = threading.Thread(target=request, args=(render,), daemon=True)
+        leader.start()
+        rendering.wait()
+        waiter = threading.Thread(target=request, args=(lambda: b"never",), daemon=True)
+        waiter.start()
+        while cache.coalesced == 0:
+            time.sleep(0.001)
+        release.set()
+        leader.join(5)
+        waiter.join(5)
+        self.assertFalse(waiter.is_alive())
+        # Both see the interrupt itself, not a TypeError from caching None
+        self.assertEqual(errors, [KeyboardInterrupt, KeyboardInterrupt])
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.get_or_render("a", lambda: b"page"), b"page")
+
+
+class TestRenderServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = Path(cls.tmp.name)
+        (root / "content" / "blog").mkdir(parents=True)
+        (root / "static").mkdir()
+        (root / "content" / "index.md").write_text("# Home\n\nHello **world**\n")
+        (root / "content" / "blog" / "index.md").write_text("# Blog\n\nPosts\n")
+        (root / "content" / "about.md").write_text("# About\n\nUs\n")
+        (root / "content" / "broken.md").write_text("No title\n")
+        (root / "static" / "index.css").write_text("body{}")
+        (root / "template.html").write_text("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        cls.root = root
+        cls.server = RenderServer(
+            ("127.0.0.1", 0), str(root / "content"), str(root / "template.html"), str(root / "static"), quiet=True
+        )
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmp.cleanup()
+
+    def request(self, path, headers=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.server.server_port, timeout=5)
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        body = response.read()
+        conn.close()
+        return response, body
+
+    def test_renders_pages(self):
+        response, body = self.request("/")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b'<title>Home</title><main><div><h1 id="home">Home</h1><p>Hello <b>world</b></p></div></main>')
+        self.assertIn(b'<h1 id="blog">Blog</h1>', self.request("/blog")[1])
+        self.assertIn(b'<h1 id="blog">Blog</h1>', self.request("/blog/index.html")[1])
+        self.assertIn(b'<h1 id="about">About</h1>', self.request("/about.html")[1])
+
+    def test_falls_back_to_static_files(self):
+        response, body = self.request("/index.css")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"body{}")
+        self.assertEqual(self.request("/missing")[0].status, 404)
+
+    def test_render_errors(self):
+        self.assertEqual(self.request("/broken.html")[0].status, 500)
+
+    def test_not_modified(self):
+        response, _ = self.request("/about.html")
+        response, body = self.request("/about.html", {"If-None-Match": response.getheader("ETag")})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+
+    def test_edited_page_is_rerendered(self):
+        page = self.root / "content" / "edit.md"
+        page.write_text("# Before\n")
+        self.assertIn(b"Before", self.request("/edit.html")[1])
+        page.write_text("# After\n")
+        stat = page.stat()
+        os.utime(page, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIn(b"After", self.request("/edit.html")[1])
+
+    def test_load(self):
+        result = run_load(f"http://127.0.0.1:{self.server.server_port}", ["/", "/blog"], concurrency=4, requests=200)
+        self.assertEqual(result["statuses"], {200: 200})
+
+
+if __name__ == "__main__":
+    unittest.main()
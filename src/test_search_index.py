@@ -0,0 +1,88 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from block_markdown import markdown_to_html_node
+from search_index import DOCS_PER_SHARD, SearchIndex, page_terms, shard_name, text_runs
+
+
+class TestTokenizing(unittest.TestCase):
+    def test_text_runs(self):
+        node = markdown_to_html_node("## The **Shire**\n\nA _quiet_ `code` [link](/x) land.")
+        self.assertEqual(
+            text_runs(node),
+            [("The ", True), ("Shire", True), ("A ", False), ("quiet", False), (" ", False), (" ", False), (" land.", False)],
+        )
+
+    def test_page_terms(self):
+        terms = page_terms([("The Shire", True), ("Shire of the hobbits, a shire!", False)])
+        self.assertEqual(terms, {"shire": [1, 1, 2, 7], "hobbits": [0, 5]})
+
+    def test_shard_name(self):
+        self.assertEqual(shard_name("hobbit"), "ho")
+        self.assertEqual(shard_name("x"), "x")
+        self.assertEqual(shard_name("hobbit", 3), "hob")
+        self.assertEqual(shard_name("éowyn"), "_c3a96f")
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.index = SearchIndex()
+        self.shire = page_terms([("Shire hobbits", False)])
+        self.index.update("shire.md", "/shire.html", "Shire", self.shire)
+        self.index.update("rohan.md", "/rohan.html", "Rohan", page_terms([("Rohan horses hobbits", False)]))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, name: str):
+        return json.loads((self.dir / name).read_text())
+
+    def test_write(self):
+        stats = self.index.write(str(self.dir))
+        self.assertEqual(stats["shards"], 3)
+        self.assertEqual(self.read("index.json"), {
+            "version": 1, "prefix_length": 2, "docs_per_shard": DOCS_PER_SHARD,
+            "documents": 2, "shards": ["ho", "ro", "sh"],
+        })
+        self.assertEqual(self.read("docs/0.json"), [["/shire.html", "Shire"], ["/rohan.html", "Rohan"]])
+        self.assertEqual(self.read("ho.json"), {"hobbits": [[0, 0, 1], [1, 0, 2]], "horses": [[1, 0, 1]]})
+
+    def test_positions_are_delta_encoded(self):
+        self.index.update("shire.md", "/shire.html", "Shire", page_terms([("shire " * 4, True)]))
+        self.index.write(str(self.dir))
+        self.assertEqual(self.read("sh.json"), {"shire": [[0, 4, 0, 1, 1, 1]]})
+
+    def test_incremental_update(self):
+        self.index.write(str(self.dir))
+        self.index.update("shire.md", "/shire.html", "Shire", self.shire)
+        self.assertEqual(self.index._dirty_shards, set())
+        self.index.update("shire.md", "/shire.html", "The Shire", page_terms([("Shire pipeweed", False)]))
+        # "shire" kept its posting, so only the shards of lost and new terms change
+        self.assertEqual(self.index._dirty_shards, {"ho", "pi"})
+        self.index.write(str(self.dir))
+        self.assertEqual(self.read("ho.json"), {"hobbits": [[1, 0, 2]], "horses": [[1, 0, 1]]})
+        self.assertEqual(self.read("docs/0.json")[0], ["/shire.html", "The Shire"])
+
+    def test_prune_frees_ids(self):
+        self.index.write(str(self.dir))
+        self.index.prune(["rohan.md"])
+        self.assertEqual(len(self.index), 1)
+        stats = self.index.write(str(self.dir))
+        self.assertEqual(stats["shards"], 2)
+        self.assertFalse((self.dir / "sh.json").exists())
+        self.assertEqual(self.read("docs/0.json"), [None, ["/rohan.html", "Rohan"]])
+        self.index.update("gondor.md", "/gondor.html", "Gondor", page_terms([("Gondor", False)]))
+        self.index.write(str(self.dir))
+        self.assertEqual(self.read("docs/0.json")[0], ["/gondor.html", "Gondor"])
+
+    def test_prefix_length(self):
+        with self.assertRaises(ValueError):
+            SearchIndex(prefix_length=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import gzip
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from build_manifest import write_build_manifest, load_build_manifest, MANIFEST_NAME
+from server import StaticSiteServer, parse_accept_encoding, parse_range
+from loadgen import run_load
+
+
+class TestHelpers(unittest.TestCase):
+    def test_parse_accept_encoding(self):
+        self.assertEqual(
+            parse_accept_encoding("gzip, br;q=0.5, identity;q=0"),
+            {"gzip": 1.0, "br": 0.5, "identity": 0.0},
+        )
+        self.assertEqual(parse_accept_encoding(""), {})
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=50-500", 100), (50, 99))
+        self.assertIsNone(parse_range("bytes=100-", 100))
+        with self.assertRaises(ValueError):
+            parse_range("bytes=0-1,5-6", 100)
+
+
+class TestBuildManifest(unittest.TestCase):
+    def test_manifest_etags(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "index.html").write_text("<p>hi</p>")
+            Path(tmp, "blog").mkdir()
+            Path(tmp, "blog", "index.html").write_text("<p>post</p>")
+            manifest = write_build_manifest(tmp)
+            self.assertEqual(set(manifest["files"]), {"index.html", "blog/index.html"})
+            entry = manifest["files"]["index.html"]
+            self.assertRegex(entry["etag"], r'^"[0-9a-f]{20}"$')
+            self.assertEqual(entry["size"], 9)
+            self.assertEqual(load_build_manifest(tmp), json.loads(Path(tmp, MANIFEST_NAME).read_text()))
+            # Rebuilding doesn't list the manifest itself
+            self.assertNotIn(MANIFEST_NAME, write_build_manifest(tmp)["files"])
+
+
+class TestStaticSiteServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = Path(cls.tmp.name)
+        cls.body = ("<p>hello world</p>" * 100).encode()
+        (root / "index.html").write_bytes(cls.body)
+        (root / "index.html.gz").write_bytes(gzip.compress(cls.body))
+        (root / "blog" / "tom").mkdir(parents=True)
+        (root / "blog" / "tom" / "index.html").write_text("<p>tom</p>")
+        (root / "index.0123456789.css").write_text("body{}")
+        write_build_manifest(str(root))
+        cls.manifest = load_build_manifest(str(root))
+        cls.server = StaticSiteServer(("127.0.0.1", 0), str(root), quiet=True)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmp.cleanup()
+
+    def request(self, path, headers=None, method="GET"):
+        conn = http.client.HTTPConnection("127.0.0.1", self.server.server_port, timeout=5)
+        conn.request(method, path, headers=headers or {})
+        response = conn.getresponse()
+        body = response.read()
+        conn.close()
+        return response, body
+
+    def test_serves_index(self):
+        response, body = self.request("/")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, self.body)
+        self.assertEqual(response.getheader("ETag"), self.manifest["files"]["index.html"]["etag"])
+        self.assertEqual(response.getheader("Cache-Control"), "no-cache")
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+
+    def test_directory_without_trailing_slash(self):
+        response, body = self.request("/blog/tom")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"<p>tom</p>")
+
+    def test_gzip_variant(self):
+        response, body = self.request("/index.html", {"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(gzip.decompress(body), self.body)
+        self.assertEqual(response.getheader("ETag"), self.manifest["files"]["index.html.gz"]["etag"])
+
+    def test_gzip_refused_with_q0(self):
+        response, body = self.request("/index.html", {"Accept-Encoding": "gzip;q=0"})
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        self.assertEqual(body, self.body)
+
+    def test_if_none_match(self):
+        etag = self.manifest["files"]["index.html"]["etag"]
+        response, body = self.request("/index.html", {"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+
+    def test_etags_follow_rebuilds(self):
+        root = self.server.root
+        page = root / "swap.html"
+        page.write_text("aaaa")
+        write_build_manifest(str(root))
+        first = load_build_manifest(str(root))["files"]["swap.html"]["etag"]
+        self.assertEqual(self.request("/swap.html")[0].getheader("ETag"), first)
+
+        # Same size, new content, manifest not rewritten yet: not the old ETag
+        page.write_text("bbbb")
+        stat = page.stat()
+        os.utime(page, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**10))
+        changed = self.request("/swap.html")[0].getheader("ETag")
+        self.assertNotEqual(changed, first)
+        self.assertTrue(changed.startswith("W/"))
+
+        # The rewritten manifest is picked up without restarting the server
+        manifest_path = root / MANIFEST_NAME
+        write_build_manifest(str(root))
+        stat = manifest_path.stat()
+        os.utime(manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**10))
+        second = load_build_manifest(str(root))["files"]["swap.html"]["etag"]
+        self.assertNotEqual(second, first)
+        self.assertEqual(self.request("/swap.html")[0].getheader("ETag"), second)
+
+    def test_if_modified_since(self):
+        response, _ = self.request("/index.html")
+        last_modified = response.getheader("Last-Modified")
+        response, _ = self.request("/index.html", {"If-Modified-Since": last_modified})
+        self.assertEqual(response.status, 304)
+        response, _ = self.request("/index.html", {"If-Modified-Since": "Mon, 01 Jan 1990 00:00:00 GMT"})
+        self.assertEqual(response.status, 200)
+
+    def test_range(self):
+        response, body = self.request("/index.html", {"Range": "bytes=3-10", "Accept-Encoding": "gzip"})
+        self.assertEqual(response.status, 206)
+        self.assertEqual(body, self.body[3:11])
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        self.assertEqual(response.getheader("Content-Range"), f"bytes 3-10/{len(self.body)}")
+
+    def test_unsatisfiable_range(self):
+        response, _ = self.request("/index.html", {"Range": f"bytes={len(self.body)}-"})
+        self.assertEqual(response.status, 416)
+
+    def test_immutable_assets(self):
+        response, _ = self.request("/index.0123456789.css")
+        self.assertEqual(response.getheader("Cache-Control"), "public, max-age=31536000, immutable")
+        self.assertTrue(response.getheader("Content-Type").startswith("text/css"))
+
+    def test_head(self):
+        response, body = self.request("/index.html", method="HEAD")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader("Content-Length"), str(len(self.body)))
+        self.assertEqual(body, b"")
+
+    def test_refuses_dotfiles_and_missing(self):
+        self.assertEqual(self.request("/" + MANIFEST_NAME)[0].status, 404)
+        self.assertEqual(self.request("/../etc/passwd")[0].status, 404)
+        self.assertEqual(self.request("/missing.html")[0].status, 404)
+
+    def test_keep_alive_load(self):
+        result = run_load(
+            f"http://127.0.0.1:{self.server.server_port}", ["/", "/blog/tom"], concurrency=4, requests=200
+        )
+        self.assertEqual(result["requests"], 200)
+        self.assertEqual(result["errors"], 0)
+        self.assertEqual(result["statuses"], {200: 200})
+
+
+if __name__ == "__main__":
+    unittest.main()
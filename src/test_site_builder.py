@@ -0,0 +1,253 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import linkcheck
+from content_collections import Collection
+from search_index import SearchIndex
+from site_builder import Site
+
+
+class TestSite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        (root / "content" / "blog").mkdir(parents=True)
+        (root / "static").mkdir()
+        (root / "content" / "index.md").write_text("# Home\n\n[Blog](/blog)\n")
+        (root / "content" / "blog" / "index.md").write_text("# Blog\n\nPosts\n")
+        (root / "static" / "index.css").write_text("body { margin: 0; }\n")
+        (root / "template.html").write_text(
+            '<link href="/index.css" rel="stylesheet"><title>{{ Title }}</title>{{ Content }}'
+        )
+        self.root = root
+        self.site = Site(root / "content", root / "static", root / "template.html", root / "docs", cache_dir=root / ".cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def touch(self, path: Path, text: str):
+        # Bump the mtime explicitly so the change is visible at coarse timestamp resolution
+        path.write_text(text)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_build(self):
+        result = self.site.build()
+        self.assertTrue(result.ok)
+        self.assertEqual(result.pages, ["blog/index.html", "index.html"])
+        self.assertEqual(list(result.timings), ["static copy", "fingerprint", "pages", "precompress", "manifest", "links"])
+        self.assertIn("index.html", result.changed)
+        self.assertEqual(result.removed, [])
+        css = result.asset_manifest["/index.css"]
+        html = (self.root / "docs" / "index.html").read_text()
+        self.assertIn(f'href="{css}"', html)
+        self.assertIn("<title>Home</title>", html)
+
+    def test_rebuild_reports_changes(self):
+        self.site.build()
+        result = self.site.build()
+        self.assertEqual(result.changed, [])
+        self.touch(self.root / "content" / "blog" / "index.md", "# Blog\n\nMore posts\n")
+        (self.root / "content" / "index.md").rename(self.root / "content" / "home.md")
+        result = self.site.build()
+        self.assertEqual(sorted(result.changed), ["blog/index.html", "home.html"])
+        self.assertEqual(result.removed, ["index.html"])
+
+    def test_errors_are_collected(self):
+        (self.root / "content" / "broken.md").write_text("no title\n")
+        result = self.site.build()
+        self.assertFalse(result.ok)
+        self.assertEqual(result.errors, [("broken.md", "No h1 header found in markdown content")])
+        self.assertEqual(len(result.pages), 2)
+
+    def test_dates_sort_across_formats(self):
+        blog = self.root / "content" / "blog"
+        # 00:30 in UTC+2 is the evening before in UTC
+        (blog / "late.md").write_text("---\ndate: 2024-01-02T00:30:00+02:00\n---\n# Late\n")
+        (blog / "day.md").write_text("---\ndate: 2024-01-01\n---\n# Day\n")
+        (blog / "bad.md").write_text("---\ndate: 2nd January\n---\n# Bad\n")
+        collection = Collection("blog")
+        site = Site(
+            self.root / "content", self.root / "static", self.root / "template.html", self.root / "docs",
+            collections=[collection],
+        )
+        result = site.build()
+        self.assertEqual([post["title"] for post in collection.posts()], ["Late", "Day"])
+        self.assertEqual(collection.posts()[0]["date"], "2024-01-01T22:30:00Z")
+        self.assertEqual(result.errors, [("blog/bad.md", "Invalid date: '2nd January' (expected YYYY-MM-DD or an ISO 8601 date and time)")])
+
+    def test_render_string(self):
+        html = self.site.render_string("# Hi\n\nThere")
+        self.assertEqual(html, '<link href="/index.css" rel="stylesheet"><title>Hi</title><div><h1 id="hi">Hi</h1><p>There</p></div>')
+
+    def test_toc_placeholder(self):
+        self.touch(self.root / "template.html", "<nav>{{ TOC }}</nav>{{ Content }}")
+        html = self.site.render_string("# Hi\n\n## Setup\n\n### Setup\n\n## Use")
+        self.assertEqual(
+            html,
+            '<nav><nav class="toc"><ul><li><a href="#setup">Setup</a><ul><li><a href="#setup-1">Setup</a></li></ul></li>'
+            '<li><a href="#use">Use</a></li></ul></nav></nav>'
+            '<div><h1 id="hi">Hi</h1><h2 id="setup">Setup</h2><h3 id="setup-1">Setup</h3><h2 id="use">Use</h2></div>',
+        )
+        self.assertEqual(self.site.render_string("# Hi"), '<nav></nav><div><h1 id="hi">Hi</h1></div>')
+
+    def test_render_page_reuses_result_until_changed(self):
+        page = self.root / "content" / "blog" / "index.md"
+        first = self.site.render_page("blog/index.md")
+        self.assertIs(self.site.render_page(str(page)), first)
+        self.touch(page, "# Blog\n\nChanged\n")
+        self.assertIn("Changed", self.site.render_page("blog/index.md"))
+
+    def test_template_change_recompiles(self):
+        self.site.render_page("index.md")
+        self.touch(self.root / "template.html", "<main>{{ Content }}</main>")
+        self.assertTrue(self.site.render_page("index.md").startswith("<main>"))
+
+    def test_silent_by_default(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.site.build()
+        self.assertEqual(out.getvalue(), "")
+
+    def test_log(self):
+        lines = []
+        Site(
+            self.root / "content", self.root / "static", self.root / "template.html", self.root / "out", log=lines.append
+        ).build()
+        self.assertIn("Wrote build manifest for 5 files", lines)
+
+
+    def test_front_matter_placeholders(self):
+        self.touch(self.root / "template.html", "<title>{{ Title }}</title><time>{{ Date }}</time>{{ Tags }}|{{ Content }}")
+        self.touch(self.root / "content" / "blog" / "index.md", "---\ntitle: Blog\ndate: 2024-05-01\ntags: a, b\n---\nPosts\n")
+        self.assertEqual(
+            self.site.render_page("blog/index.md"),
+            "<title>Blog</title><time>2024-05-01</time>a, b|<div><p>Posts</p></div>",
+        )
+        # Pages without front matter still fill the standard placeholders
+        self.assertIn("<time></time>|", self.site.render_page("index.md"))
+        # The title is the first h1 the parser finds, not a "# " line in code
+        self.touch(self.root / "content" / "index.md", "```sh\n# install\n```\n\n# Real Title\n")
+        self.assertIn("<title>Real Title</title>", self.site.render_page("index.md"))
+
+    def test_placeholders_are_escaped(self):
+        self.touch(self.root / "template.html", '<title>{{ Title }}</title><meta content="{{ Description }}">{{ Content }}')
+        self.touch(self.root / "content" / "index.md", '---\ntitle: A <b> & C\ndescription: "x" > y\n---\n**Bold**\n')
+        self.assertEqual(
+            self.site.render_page("index.md"),
+            '<title>A &lt;b&gt; &amp; C</title><meta content="&quot;x&quot; &gt; y"><div><p><b>Bold</b></p></div>',
+        )
+
+    def test_metadata_reuses_build_manifest(self):
+        result = self.site.build()
+        self.assertEqual(result.metadata["blog/index.md"]["title"], "Blog")
+        # A fresh Site reads metadata for unchanged pages from the manifest without opening them
+        site = Site(self.root / "content", self.root / "static", self.root / "template.html", self.root / "docs")
+        with mock.patch("site_builder.read_metadata", side_effect=AssertionError("page was read")):
+            self.assertEqual(site.metadata()["index.md"]["title"], "Home")
+        self.touch(self.root / "content" / "index.md", "---\ntitle: New home\n---\nBody\n")
+        (self.root / "content" / "new.md").write_text("# New\n")
+        metadata = site.metadata()
+        self.assertEqual(list(metadata), ["blog/index.md", "index.md", "new.md"])
+        self.assertEqual(metadata["index.md"]["title"], "New home")
+        self.assertEqual(metadata["new.md"]["title"], "New")
+
+    def test_collections(self):
+        blog = self.root / "content" / "blog"
+        (blog / "first.md").write_text("---\ndate: 2024-01-01\ntags: news\n---\n# First\n")
+        (blog / "second.md").write_text("---\ndate: 2024-02-01\n---\n# Second\n")
+        site = Site(
+            self.root / "content", self.root / "static", self.root / "template.html", self.root / "docs",
+            collections=[Collection("blog")],
+        )
+        result = site.build()
+        self.assertEqual(list(result.timings)[3], "collections")
+        # blog/index.md is hand-written, so only the tag listing is generated
+        self.assertEqual(result.pages[-1], "blog/tags/news/index.html")
+        self.assertEqual(result.pages.count("blog/index.html"), 1)
+        html = (self.root / "docs" / "blog" / "tags" / "news" / "index.html").read_text()
+        self.assertIn("<title>Blog tagged news</title>", html)
+        self.assertIn('<a href="/blog/first.html">First</a><time>2024-01-01</time>', html)
+
+        # Unchanged listings are reused; an edited post re-renders them
+        self.assertEqual(site.build().changed, [])
+        self.touch(blog / "first.md", "---\ndate: 2024-01-01\ntags: news\n---\n# First, edited\n")
+        self.assertEqual(
+            sorted(site.build().changed),
+            ["blog/first.html", "blog/tags/news/index.html"],
+        )
+
+    def test_link_check(self):
+        (self.root / "content" / "lost.md").write_text("# Lost\n\n[Gone](/gone) [Home](/) [Style](/index.css)\n")
+        result = self.site.build()
+        self.assertEqual(result.broken_links, {"lost.html": ["/gone"]})
+        self.assertEqual(result.orphans, ["lost.html"])
+
+        # Only the links of the edited and new pages are re-indexed
+        self.touch(self.root / "content" / "index.md", "# Home\n\n[Blog](/blog) [Lost](/lost.html)\n")
+        (self.root / "content" / "gone.md").write_text("# Gone\n\n[Lost](lost.html)\n")
+        with mock.patch("linkcheck.link_target", wraps=linkcheck.link_target) as link_target:
+            result = self.site.build()
+        self.assertEqual(result.broken_links, {"lost.html": ["/gone"]})
+        self.assertEqual(result.orphans, ["gone.html"])
+        self.assertEqual(link_target.call_count, 3)
+
+    def test_search_index(self):
+        site = Site(
+            self.root / "content", self.root / "static", self.root / "template.html", self.root / "docs",
+            search=SearchIndex(),
+        )
+        result = site.build()
+        self.assertIn("search", result.timings)
+        self.assertEqual(result.search_stats["shards"], 3)
+        search = self.root / "docs" / "search"
+        self.assertEqual(json.loads((search / "po.json").read_text()), {"posts": [[0, 0, 1]]})
+        self.assertEqual(json.loads((search / "docs" / "0.json").read_text()), [["/blog", "Blog"], ["/", "Home"]])
+
+        # Unchanged pages keep their terms; an edited page is re-indexed
+        site.build()
+        self.touch(self.root / "content" / "index.md", "# Home\n\nNew posts\n")
+        site.build()
+        self.assertEqual(json.loads((search / "po.json").read_text()), {"posts": [[0, 0, 1], [1, 0, 2]]})
+
+    def test_search_urls_use_basepath(self):
+        site = Site(
+            self.root / "content", self.root / "static", self.root / "template.html", self.root / "docs",
+            basepath="/fan", search=SearchIndex(),
+        )
+        site.build()
+        docs = json.loads((self.root / "docs" / "search" / "docs" / "0.json").read_text())
+        self.assertEqual(docs, [["/fan/blog", "Blog"], ["/fan/", "Home"]])
+
+    def test_sitemap_feed_and_robots(self):
+        blog = self.root / "content" / "blog"
+        (blog / "post.md").write_text("---\ndate: 2024-01-02\ndescription: Hello\nauthor: Sam\n---\n# Post\n")
+        site = Site(
+            self.root / "content", self.root / "static", self.root / "template.html", self.root / "docs",
+            cache_dir=self.root / ".cache", collections=[Collection("blog")], site_url="https://example.com/fan",
+            author="Frodo",
+        )
+        result = site.build()
+        self.assertIn("sitemap", result.timings)
+        docs = self.root / "docs"
+        sitemap = (docs / "sitemap-1.xml").read_text()
+        for url in ("https://example.com/fan/blog/", "https://example.com/fan/blog/post.html", "https://example.com/fan/"):
+            self.assertIn(f"<loc>{url}</loc>", sitemap)
+        self.assertIn("<loc>https://example.com/fan/sitemap-1.xml</loc>", (docs / "sitemap.xml").read_text())
+        self.assertIn("Sitemap: https://example.com/fan/sitemap.xml", (docs / "robots.txt").read_text())
+        feed = (docs / "blog" / "feed.xml").read_text()
+        self.assertIn('<link href="https://example.com/fan/blog/post.html"/>', feed)
+        self.assertIn("<author><name>Frodo</name></author>\n<entry>", feed)
+        self.assertIn("<updated>2024-01-02T00:00:00Z</updated><author><name>Sam</name></author><summary>Hello</summary>", feed)
+        # Nothing changed, so the rebuild's output is byte-identical
+        self.assertEqual(site.build().changed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
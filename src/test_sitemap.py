@@ -0,0 +1,146 @@
+import os
+import tempfile
+import time
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from sitemap import SitemapWriter, date_timestamp, url_path, w3c_datetime, write_feed, write_robots
+
+NS = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9", "atom": "http://www.w3.org/2005/Atom"}
+
+
+class TestHelpers(unittest.TestCase):
+    def test_url_path(self):
+        self.assertEqual(url_path("index.html"), "/")
+        self.assertEqual(url_path("blog/tom/index.html"), "/blog/tom/")
+        self.assertEqual(url_path("contact.html"), "/contact.html")
+
+    def test_dates(self):
+        self.assertEqual(w3c_datetime(0), "1970-01-01T00:00:00Z")
+        self.assertEqual(date_timestamp("1970-01-02"), 86400.0)
+        self.assertEqual(date_timestamp("1970-01-02T10:00:00Z"), 86400.0 + 36000)
+        self.assertIsNone(date_timestamp("someday"))
+
+
+class TestSitemapWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.output = self.root / "docs"
+        self.output.mkdir()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def locs(self, name: str, tag: str = "url") -> list[str]:
+        tree = ET.parse(self.output / name)
+        return [element.text for element in tree.getroot().iterfind(f"sm:{tag}/sm:loc", NS)]
+
+    def test_splits_at_max_urls(self):
+        writer = SitemapWriter(str(self.output), "https://example.com/site/", max_urls=2)
+        for number in range(5):
+            writer.add(f"/p{number}/", lastmod=86400.0 * number)
+        self.assertEqual(writer.close(), ["sitemap-1.xml", "sitemap-2.xml", "sitemap-3.xml"])
+        self.assertEqual(writer.urls, 5)
+        self.assertEqual(self.locs("sitemap-2.xml"), ["https://example.com/site/p2/", "https://example.com/site/p3/"])
+        self.assertEqual(
+            self.locs("sitemap.xml", "sitemap"),
+            [f"https://example.com/site/sitemap-{number}.xml" for number in (1, 2, 3)],
+        )
+        index = (self.output / "sitemap.xml").read_text()
+        self.assertIn("<lastmod>1970-01-04T00:00:00Z</lastmod>", index)
+
+    def test_splits_at_max_bytes(self):
+        writer = SitemapWriter(str(self.output), "https://example.com", max_bytes=300)
+        for number in range(6):
+            writer.add(f"/page-{number}.html")
+        shards = writer.close()
+        self.assertGreater(len(shards), 1)
+        for name in shards:
+            self.assertLessEqual((self.output / name).stat().st_size, 300)
+        self.assertEqual(sum(len(self.locs(name)) for name in shards), 6)
+
+    def test_escapes_urls(self):
+        writer = SitemapWriter(str(self.output), "https://example.com")
+        writer.add("/a&b.html")
+        writer.close()
+        self.assertEqual(self.locs("sitemap-1.xml"), ["https://example.com/a&b.html"])
+
+    def test_unchanged_shards_are_kept(self):
+        cache = self.root / "cache"
+
+        def build(last: str):
+            for path in self.output.iterdir():
+                path.unlink()
+            writer = SitemapWriter(str(self.output), "https://example.com", max_urls=2, cache_dir=str(cache))
+            for path in ("/a", "/b", last):
+                writer.add(path)
+            writer.close()
+            return writer
+
+        build("/c")
+        cached = cache / "sitemap" / "sitemap-1.xml"
+        os.utime(cached, (1, 1))
+        writer = build("/d")
+        self.assertEqual(writer.unchanged, 1)
+        self.assertEqual(cached.stat().st_mtime, 1)
+        self.assertEqual(self.locs("sitemap-2.xml"), ["https://example.com/d"])
+        self.assertEqual(self.locs("sitemap-1.xml"), ["https://example.com/a", "https://example.com/b"])
+
+
+class TestFeedAndRobots(unittest.TestCase):
+    def test_write_feed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "feed.xml")
+            write_feed(path, "Blog & News", "https://example.com/blog/feed.xml", "https://example.com/blog", [
+                {"title": "New", "url": "https://example.com/blog/new", "updated": 86400.0, "summary": "Hi"},
+                {"title": "Old", "url": "https://example.com/blog/old", "updated": 0.0, "author": "Sam"},
+            ])
+            feed = ET.parse(path).getroot()
+        self.assertEqual(feed.find("atom:title", NS).text, "Blog & News")
+        self.assertEqual(feed.find("atom:updated", NS).text, "1970-01-02T00:00:00Z")
+        entries = feed.findall("atom:entry", NS)
+        self.assertEqual([entry.find("atom:id", NS).text for entry in entries],
+                         ["https://example.com/blog/new", "https://example.com/blog/old"])
+        self.assertEqual(entries[0].find("atom:summary", NS).text, "Hi")
+        self.assertIsNone(entries[1].find("atom:summary", NS))
+        # Atom needs an author: the feed title stands in when none is given
+        self.assertEqual(feed.find("atom:author/atom:name", NS).text, "Blog & News")
+        self.assertIsNone(entries[0].find("atom:author", NS))
+        self.assertEqual(entries[1].find("atom:author/atom:name", NS).text, "Sam")
+
+    def test_write_feed_quotes_in_urls(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "feed.xml")
+            site = 'https://example.com/"q"&a'
+            write_feed(path, "Blog", site + "/feed.xml", site, [
+                {"title": "Post", "url": site + "/it's", "updated": 0.0},
+            ])
+            feed = ET.parse(path).getroot()
+        self.assertEqual(feed.find("atom:link", NS).get("href"), site)
+        self.assertEqual(feed.find("atom:entry/atom:link", NS).get("href"), site + "/it's")
+        self.assertEqual(feed.find("atom:entry/atom:id", NS).text, site + "/it's")
+
+    def test_write_feed_author_and_no_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "feed.xml")
+            before = w3c_datetime(time.time())
+            write_feed(path, "Blog", "https://example.com/blog/feed.xml", "https://example.com/blog", [], author="Frodo")
+            feed = ET.parse(path).getroot()
+        self.assertEqual(feed.find("atom:author/atom:name", NS).text, "Frodo")
+        # An empty feed is dated by the build, not the epoch
+        self.assertGreaterEqual(feed.find("atom:updated", NS).text, before)
+
+    def test_write_robots(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "robots.txt")
+            self.assertTrue(write_robots(path, "https://example.com/sitemap.xml"))
+            self.assertIn("Sitemap: https://example.com/sitemap.xml\n", Path(path).read_text())
+            Path(path).write_text("User-agent: *\nDisallow: /\n")
+            self.assertFalse(write_robots(path, "https://example.com/sitemap.xml"))
+            self.assertEqual(Path(path).read_text(), "User-agent: *\nDisallow: /\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
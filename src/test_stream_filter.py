@@ -0,0 +1,135 @@
+import contextlib
+import io
+import unittest
+
+from block_markdown import markdown_to_html_node
+from stream_filter import (
+    filter_documents, iter_blocks, iter_length_prefixed, iter_nul_delimited, main, stream_document,
+)
+
+
+DOCUMENT = "# Title\n\nSome **bold** text\nover two lines\n\n\n- a\n- b\n\n```\ncode\n```\n"
+
+
+class TestStreamDocument(unittest.TestCase):
+    def test_matches_whole_document_rendering(self):
+        out = io.StringIO()
+        stream_document(io.StringIO(DOCUMENT), out)
+        self.assertEqual(out.getvalue(), markdown_to_html_node(DOCUMENT).to_html())
+
+    def test_output_starts_before_input_ends(self):
+        out = io.StringIO()
+        seen = []
+
+        def lines():
+            yield "# Title\n"
+            yield "\n"
+            # The first block has been written before the next line is read
+            seen.append(out.getvalue())
+            yield "more\n"
+
+        stream_document(lines(), out)
+        self.assertEqual(seen, ["<div><h1>Title</h1>"])
+
+    def test_iter_blocks(self):
+        self.assertEqual(list(iter_blocks(["a\n", "\n", "\n", "b\n", " \n", "c"])), ["a\n", "b\n", "c"])
+
+    def test_iter_blocks_keeps_nested_blank_lines(self):
+        lines = ["- a\n", "\n", "- b\n", "  ```\n", "\n", "  ```\n", "# Title\n", "text\n"]
+        self.assertEqual(list(iter_blocks(lines)), ["- a\n\n- b\n  ```\n\n  ```\n", "# Title\n", "text\n"])
+
+    def test_nested_document_matches_whole_document_rendering(self):
+        document = "- a\n\n- b\n  ```\n  x\n\n  y\n  ```\n> quote\n>\n> - item\n"
+        out = io.StringIO()
+        stream_document(io.StringIO(document), out)
+        self.assertEqual(out.getvalue(), markdown_to_html_node(document).to_html())
+
+    def test_references_defined_later(self):
+        document = "# Title\n\nSee [docs].\n\nText\n\n[docs]: /d\n\nAnd [docs] again.\n"
+        out = io.StringIO()
+        seen = []
+
+        def lines():
+            for line in document.splitlines(keepends=True):
+                seen.append(out.getvalue())
+                yield line
+
+        stream_document(lines(), out)
+        self.assertEqual(out.getvalue(), markdown_to_html_node(document).to_html())
+        self.assertIn('<a href="/d">docs</a>', out.getvalue())
+        # The title streams; the block with the undefined reference waits for the end
+        self.assertEqual(seen[-1], "<div><h1>Title</h1>")
+
+    def test_references_defined_earlier_stream(self):
+        out = io.StringIO()
+        seen = []
+
+        def lines():
+            yield "[docs]: /d\n"
+            yield "See [docs].\n"
+            yield "\n"
+            seen.append(out.getvalue())
+            yield "more\n"
+
+        stream_document(lines(), out)
+        self.assertEqual(seen, ['<div><p>See <a href="/d">docs</a>.</p>'])
+
+    def test_empty_document(self):
+        with self.assertRaises(ValueError):
+            stream_document(io.StringIO("\n\n"), io.StringIO())
+
+
+class TestMultiDocument(unittest.TestCase):
+    def test_nul_delimited(self):
+        stream = io.BytesIO(b"# One\x00two **2**\x00three")
+        self.assertEqual(list(iter_nul_delimited(stream)), [b"# One", b"two **2**", b"three"])
+        self.assertEqual(list(iter_nul_delimited(io.BytesIO(b"a\x00"))), [b"a"])
+
+    def test_nul_delimited_across_reads(self):
+        class Trickle(io.BytesIO):
+            def read1(self, size=-1):
+                return super().read1(3)
+
+        stream = Trickle(b"first doc\x00second\x00\x00x")
+        self.assertEqual(list(iter_nul_delimited(stream)), [b"first doc", b"second", b"", b"x"])
+
+    def test_length_prefixed(self):
+        stream = io.BytesIO(b"5\n# One3\nabc")
+        self.assertEqual(list(iter_length_prefixed(stream)), [b"# One", b"abc"])
+        with self.assertRaises(ValueError):
+            list(iter_length_prefixed(io.BytesIO(b"10\nshort")))
+        with self.assertRaises(ValueError):
+            list(iter_length_prefixed(io.BytesIO(b"x\n")))
+
+    def test_filter_nul(self):
+        out = io.BytesIO()
+        failures = filter_documents([b"# One", b"**two**"], out, "nul")
+        self.assertEqual(failures, 0)
+        self.assertEqual(out.getvalue(), b"<div><h1>One</h1></div>\x00<div><p><b>two</b></p></div>\x00")
+
+    def test_filter_length_prefixed_keeps_alignment_on_errors(self):
+        out = io.BytesIO()
+        err = io.StringIO()
+        failures = filter_documents([b"bad **bold", b"ok"], out, "length", err)
+        self.assertEqual(failures, 1)
+        self.assertEqual(out.getvalue(), b"0\n20\n<div><p>ok</p></div>")
+        self.assertTrue(err.getvalue().startswith("document 0:"))
+
+
+class TestMain(unittest.TestCase):
+    def test_rejects_bad_options(self):
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            self.assertEqual(main(["--bogus"]), 2)
+            self.assertEqual(main(["-0", "--length-prefixed"]), 2)
+        self.assertIn("unrecognized arguments: --bogus", err.getvalue())
+
+    def test_help(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(main(["--help"]), 0)
+        self.assertIn("--length-prefixed", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import unittest
+from enum import Enum
+
+import metrics
+import syntax
+from block_markdown import Block, markdown_to_html_node, text_to_children
+from htmlnode import LeafNode, ParentNode
+from inline_markdown import text_to_textnodes
+from textnode import TextNode, TextType, text_node_to_html_node
+
+
+class TableSyntax(syntax.BlockSyntax):
+    """Rows of | separated cells"""
+
+    name = "table"
+    triggers = "|"
+
+    def start(self, parser, line, pos, indent):
+        parser.open(Block(self))
+        return pos
+
+    def continue_line(self, block, line, pos):
+        stripped = line.lstrip(" ")
+        if not stripped.startswith("|"):
+            return None
+        return len(line) - len(stripped)
+
+    def to_html_node(self, block, children):
+        rows = []
+        for line in block.lines:
+            cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+            rows.append(ParentNode("tr", [ParentNode("td", text_to_children(cell)) for cell in cells]))
+        return ParentNode("table", rows)
+
+
+class DivSyntax(syntax.BlockSyntax):
+    """::: class ... ::: around any blocks"""
+
+    name = "div"
+    triggers = ":"
+    container = True
+
+    def start(self, parser, line, pos, indent):
+        if not line.startswith(":::", pos):
+            return None
+        block = Block(self)
+        block.css_class = line[pos + 3:].strip()
+        block.done = False
+        parser.open(block)
+        return len(line)
+
+    def continue_line(self, block, line, pos):
+        if block.done:
+            return None
+        if line[pos:].strip() == ":::":
+            block.done = True
+            return len(line)
+        return pos
+
+    def to_html_node(self, block, children):
+        return ParentNode("div", children or [LeafNode(None, "")], {"class": block.css_class})
+
+
+class MarkType(Enum):
+    STRIKE = "strike"
+
+
+class StrikeSyntax(syntax.InlineSyntax):
+    """~~struck out~~"""
+
+    triggers = "~"
+    text_type = MarkType.STRIKE
+
+    def match(self, text, pos):
+        if not text.startswith("~~", pos):
+            return None
+        end = text.find("~~", pos + 2)
+        if end == -1:
+            return None
+        return TextNode(text[pos + 2:end], MarkType.STRIKE), end + 2
+
+    def to_html_node(self, text_node):
+        return LeafNode("s", text_node.text)
+
+
+class CountingSyntax(syntax.BlockSyntax):
+    """Never starts a block, but counts how often it's asked"""
+
+    triggers = "%"
+
+    def __init__(self):
+        self.calls = 0
+
+    def start(self, parser, line, pos, indent):
+        self.calls += 1
+        return None
+
+
+class TestBlockSyntax(unittest.TestCase):
+    def register(self, block_syntax):
+        syntax.register_block(block_syntax)
+        self.addCleanup(syntax.unregister, block_syntax)
+
+    def assertRenders(self, md, html):
+        self.assertEqual(markdown_to_html_node(md).to_html(), "<div>" + html + "</div>")
+
+    def test_leaf_syntax(self):
+        self.register(TableSyntax())
+        self.assertRenders(
+            "Before\n\n| a | **b** |\n| c | d |\nAfter",
+            "<p>Before</p><table><tr><td>a</td><td><b>b</b></td></tr><tr><td>c</td><td>d</td></tr></table>"
+            "<p>After</p>",
+        )
+
+    def test_leaf_syntax_in_containers(self):
+        self.register(TableSyntax())
+        self.assertRenders(
+            "- item\n\n  | a |\n  | b |\n\n> | c |",
+            "<ul><li><p>item</p><table><tr><td>a</td></tr><tr><td>b</td></tr></table></li></ul>"
+            "<blockquote><table><tr><td>c</td></tr></table></blockquote>",
+        )
+
+    def test_container_syntax(self):
+        self.register(DivSyntax())
+        self.assertRenders(
+            "::: note\nSome _text_\n\n- a\n- b\n:::\nAfter",
+            '<div class="note"><p>Some <i>text</i></p><ul><li>a</li><li>b</li></ul></div><p>After</p>',
+        )
+
+    def test_counts_blocks_by_name(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        self.register(TableSyntax())
+        markdown_to_html_node("| a |\n\n| b |")
+        self.assertEqual(metrics.get("static_site_blocks_total", "table"), 2)
+
+    def test_unregister(self):
+        table = TableSyntax()
+        syntax.register_block(table)
+        syntax.unregister(table)
+        self.assertRenders("| a |", "<p>| a |</p>")
+
+    def test_only_tried_on_trigger(self):
+        counting = CountingSyntax()
+        self.register(counting)
+        self.assertRenders("# Title\n\nText with % inside\n\n- a\n\n% here", "<h1>Title</h1><p>Text with % inside</p>"
+                           "<ul><li>a</li></ul><p>% here</p>")
+        self.assertEqual(counting.calls, 1)
+
+    def test_needs_triggers(self):
+        with self.assertRaises(ValueError):
+            syntax.register_block(syntax.BlockSyntax())
+
+
+class TestInlineSyntax(unittest.TestCase):
+    def setUp(self):
+        self.strike = StrikeSyntax()
+        syntax.register_inline(self.strike)
+        self.addCleanup(syntax.unregister, self.strike)
+
+    def test_custom_text_type(self):
+        self.assertEqual(
+            text_to_textnodes("a ~~b~~ **c**"),
+            [
+                TextNode("a ", TextType.TEXT),
+                TextNode("b", MarkType.STRIKE),
+                TextNode(" ", TextType.TEXT),
+                TextNode("c", TextType.BOLD),
+            ],
+        )
+        self.assertEqual(text_node_to_html_node(TextNode("b", MarkType.STRIKE)).to_html(), "<s>b</s>")
+
+    def test_no_match_is_text(self):
+        self.assertEqual(text_to_textnodes("a ~ b ~~c"), [TextNode("a ~ b ~~c", TextType.TEXT)])
+
+    def test_renders(self):
+        self.assertEqual(markdown_to_html_node("~~gone~~ _here_").to_html(), "<div><p><s>gone</s> <i>here</i></p></div>")
+
+    def test_unregister(self):
+        syntax.unregister(self.strike)
+        self.assertEqual(text_to_textnodes("~~a~~"), [TextNode("~~a~~", TextType.TEXT)])
+        with self.assertRaises(ValueError):
+            text_node_to_html_node(TextNode("a", MarkType.STRIKE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from template import Template, apply_basepath, basepath_url
+
+
+class TestApplyBasepath(unittest.TestCase):
+    def test_root_basepath_is_noop(self):
+        html = '<a href="/blog">x</a>'
+        self.assertEqual(apply_basepath(html, "/"), html)
+
+    def test_prefixes_root_relative_urls(self):
+        html = '<a href="/blog">x</a><img src="/images/a.png">'
+        self.assertEqual(
+            apply_basepath(html, "/site"),
+            '<a href="/site/blog">x</a><img src="/site/images/a.png">',
+        )
+
+    def test_leaves_absolute_urls(self):
+        html = '<a href="https://example.com/">x</a>'
+        self.assertEqual(apply_basepath(html, "/site/"), html)
+
+    def test_basepath_url(self):
+        self.assertEqual(basepath_url("/blog/tom", "/site"), "/site/blog/tom")
+        self.assertEqual(basepath_url("/", "/site/"), "/site/")
+        self.assertEqual(basepath_url("/blog", "/"), "/blog")
+        self.assertEqual(basepath_url("https://example.com/", "/site/"), "https://example.com/")
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(
+            template.render({"Title": "Hi", "Content": "<p>x</p>"}),
+            "<title>Hi</title><main><p>x</p></main>",
+        )
+
+    def test_unknown_placeholder_left_in_place(self):
+        template = Template("{{ Title }} {{ Other }}")
+        self.assertEqual(template.render({"Title": "Hi"}), "Hi {{ Other }}")
+
+    def test_values_are_not_reinterpreted(self):
+        template = Template("{{ Title }}|{{ Content }}")
+        self.assertEqual(template.render({"Title": "{{ Content }}", "Content": "x"}), "{{ Content }}|x")
+
+    def test_compile_applies_manifest_and_basepath(self):
+        template = Template(
+            '<link href="/index.css" rel="stylesheet" />{{ Content }}',
+            basepath="/site/",
+            asset_manifest={"/index.css": "/index.abc.css"},
+        )
+        self.assertEqual(
+            template.render({"Content": "x"}),
+            '<link href="/site/index.abc.css" rel="stylesheet" />x',
+        )
+
+    def test_minify_at_compile_time(self):
+        source = "<html>\n  <body>\n    {{ Content }}\n  </body>\n</html>\n"
+        template = Template(source, minify=True)
+        self.assertEqual(template.source, "<html><body>{{ Content }}</body></html>")
+        self.assertEqual(template.minify_savings, len(source) - len(template.source))
+
+
+if __name__ == "__main__":
+    unittest.main()
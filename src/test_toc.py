@@ -0,0 +1,58 @@
+import unittest
+
+from block_markdown import markdown_to_html, markdown_to_html_node
+from htmlnode import LeafNode
+from toc import TableOfContents, slugify
+
+
+class TestTableOfContents(unittest.TestCase):
+    def test_ids_are_slugs_made_unique(self):
+        toc = TableOfContents()
+        self.assertEqual(toc.add(2, [LeafNode(None, "Getting "), LeafNode("b", "Started")]), "getting-started")
+        self.assertEqual(toc.add(2, [LeafNode(None, "Getting started")]), "getting-started-1")
+        self.assertEqual(toc.add(3, [LeafNode(None, "Getting started 1")]), "getting-started-1-1")
+        self.assertEqual(toc.add(3, [LeafNode(None, "¿?")]), "section")
+        self.assertEqual(toc.add(3, [LeafNode("img", "", {"src": "/a.png", "alt": "Logo"})]), "logo")
+
+    def test_nesting(self):
+        toc = TableOfContents()
+        for level, text in [(1, "Title"), (3, "Early"), (2, "A"), (3, "A1"), (5, "Deep"), (3, "A2"), (2, "B")]:
+            toc.add(level, [LeafNode(None, text)])
+        self.assertEqual(
+            toc.to_html(),
+            '<nav class="toc"><ul><li><a href="#early">Early</a></li><li><a href="#a">A</a><ul>'
+            '<li><a href="#a1">A1</a><ul><li><a href="#deep">Deep</a></li></ul></li><li><a href="#a2">A2</a></li>'
+            '</ul></li><li><a href="#b">B</a></li></ul></nav>',
+        )
+
+    def test_min_level(self):
+        toc = TableOfContents(min_level=1)
+        toc.add(1, [LeafNode(None, "Title")])
+        self.assertEqual(toc.to_html(), '<nav class="toc"><ul><li><a href="#title">Title</a></li></ul></nav>')
+        self.assertEqual(TableOfContents().to_html(), "")
+
+    def test_collected_while_parsing(self):
+        toc = TableOfContents()
+        html = markdown_to_html("# Doc\n\n## One **bold**\n\ntext\n\n## One bold", toc)
+        self.assertEqual(
+            html,
+            '<div><h1 id="doc">Doc</h1><h2 id="one-bold">One <b>bold</b></h2><p>text</p><h2 id="one-bold-1">One bold</h2></div>',
+        )
+        self.assertEqual(toc.entries, [(1, "doc", "Doc"), (2, "one-bold", "One bold"), (2, "one-bold-1", "One bold")])
+
+    def test_slugify(self):
+        self.assertEqual(slugify("Middle-earth & Beyond!"), "middle-earth-beyond")
+        self.assertEqual(slugify("  ?? "), "")
+
+    def test_title(self):
+        toc = TableOfContents()
+        markdown_to_html_node("```sh\n# install\n```\n\n## Intro\n\n# The _Real_ Title\n\n# Another", toc)
+        self.assertEqual(toc.title(), "The Real Title")
+        self.assertIsNone(TableOfContents().title())
+
+    def test_no_ids_without_toc(self):
+        self.assertEqual(markdown_to_html_node("## Plain").to_html(), "<div><h2>Plain</h2></div>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import tracing
+from block_markdown import markdown_to_html_node
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self):
+        tracing.disable()
+
+    def test_span_is_noop_when_disabled(self):
+        self.assertIs(tracing.span("anything"), tracing.NULL_SPAN)
+        with tracing.span("anything"):
+            pass
+        self.assertIsNone(tracing.get_tracer())
+
+    def test_records_complete_events(self):
+        tracer = tracing.enable()
+        with tracing.span("read", path="a.md"):
+            pass
+        self.assertEqual(len(tracer.events), 1)
+        event = tracer.events[0]
+        self.assertEqual(event["name"], "read")
+        self.assertEqual(event["ph"], "X")
+        self.assertEqual(event["pid"], os.getpid())
+        self.assertEqual(event["args"], {"path": "a.md"})
+        self.assertGreaterEqual(event["dur"], 0)
+
+    def test_records_parse_stages(self):
+        tracer = tracing.enable()
+        markdown_to_html_node("# Title\n\nSome **bold** text")
+        names = [event["name"] for event in tracer.events]
+        self.assertEqual(names.count("block parse"), 1)
+        self.assertEqual(names.count("inline parse"), 2)
+
+    def test_worker_threads_get_their_own_track(self):
+        tracer = tracing.enable()
+
+        def work():
+            with tracing.span("compress"):
+                pass
+
+        thread = threading.Thread(target=work, name="worker-1")
+        thread.start()
+        thread.join()
+        with tracing.span("page"):
+            pass
+        tids = {event["tid"] for event in tracer.events}
+        self.assertEqual(len(tids), 2)
+        self.assertIn("worker-1", tracer.thread_names.values())
+
+    def test_write_chrome_trace_format(self):
+        tracer = tracing.enable()
+        with tracing.span("to_html"):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            tracer.write(path)
+            with open(path) as f:
+                data = json.load(f)
+        phases = [event["ph"] for event in data["traceEvents"]]
+        self.assertIn("M", phases)
+        self.assertIn("X", phases)
+
+
+if __name__ == "__main__":
+    unittest.main()
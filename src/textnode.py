@@ -24,22 +24,32 @@ class TextNode:
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
 
+def _link_to_html_node(text_node):
+    if text_node.url is None:
+        raise ValueError("Link TextNode must have a URL")
+    return LeafNode("a", text_node.text, {"href": text_node.url})
+
+
+def _image_to_html_node(text_node):
+    if text_node.url is None:
+        raise ValueError("Image TextNode must have a URL")
+    return LeafNode("img", None, {"src": text_node.url, "alt": text_node.text})
+
+
+# Text type -> function making a TextNode's HTMLNode; syntax.register_inline()
+# adds the types of extensions
+TEXT_RENDERERS = {
+    TextType.TEXT: lambda text_node: LeafNode(None, text_node.text),
+    TextType.BOLD: lambda text_node: LeafNode("b", text_node.text),
+    TextType.ITALIC: lambda text_node: LeafNode("i", text_node.text),
+    TextType.CODE: lambda text_node: LeafNode("code", text_node.text),
+    TextType.LINK: _link_to_html_node,
+    TextType.IMAGE: _image_to_html_node,
+}
+
+
 def text_node_to_html_node(text_node):
-    if text_node.text_type == TextType.TEXT:
-        return LeafNode(None, text_node.text)
-    elif text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    elif text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    elif text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
-    elif text_node.text_type == TextType.LINK:
-        if text_node.url is None:
-            raise ValueError("Link TextNode must have a URL")
-        return LeafNode("a", text_node.text, {"href": text_node.url})
-    elif text_node.text_type == TextType.IMAGE:
-        if text_node.url is None:
-            raise ValueError("Image TextNode must have a URL")
-        return LeafNode("img", None, {"src": text_node.url, "alt": text_node.text})
-    else:
+    renderer = TEXT_RENDERERS.get(text_node.text_type)
+    if renderer is None:
         raise ValueError(f"Unsupported text type: {text_node.text_type}")
+    return renderer(text_node)
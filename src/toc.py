@@ -0,0 +1,97 @@
+import re
+
+from htmlnode import LeafNode, ParentNode
+
+
+# Headings from this level down are listed; h1 is the page title
+DEFAULT_MIN_LEVEL = 2
+
+SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(text: str) -> str:
+    """Lower-case text and collapse anything but letters and digits to "-"."""
+    return SLUG_PATTERN.sub("-", text.lower()).strip("-")
+
+
+def _plain_text(children) -> str:
+    # Heading children are the leaves text_node_to_html_node builds
+    parts = []
+    for child in children:
+        if child.tag == "img":
+            parts.append(child.props.get("alt", ""))
+        elif child.value:
+            parts.append(child.value)
+    return "".join(parts)
+
+
+class TableOfContents:
+    """
+    Collects a page's headings while its HTMLNode tree is built.
+
+    block_to_html_node calls add() for each heading as it creates it,
+    so ids and the table need no second pass over the tree. Ids are slugs
+    of the heading text, made unique within the page with "-1", "-2", ...
+    suffixes, so they only change when the headings before them do.
+    """
+
+    def __init__(self, min_level: int = DEFAULT_MIN_LEVEL):
+        self.min_level = min_level
+        # (level, id, text) of every heading, in document order
+        self.entries = []
+        self._used = set()
+
+    def add(self, level: int, children) -> str:
+        """
+        Record a heading and return its id.
+
+        Args:
+            level: Heading level, 1 to 6
+            children: The heading's inline HTMLNodes
+        """
+        text = _plain_text(children)
+        base = slugify(text) or "section"
+        slug = base
+        suffix = 0
+        while slug in self._used:
+            suffix += 1
+            slug = f"{base}-{suffix}"
+        self._used.add(slug)
+        self.entries.append((level, slug, text))
+        return slug
+
+    def title(self) -> str | None:
+        """Text of the first h1 with any text, the page's title, or None if there is none."""
+        for level, _, text in self.entries:
+            if level == 1 and text:
+                return text
+        return None
+
+    def to_html_node(self) -> ParentNode | None:
+        """Nested lists of links to the headings, or None if there are none to list."""
+        root = ParentNode("ul", [])
+        # [level, list] for the open lists, outermost first
+        stack = [[None, root]]
+        for level, slug, text in self.entries:
+            if level < self.min_level:
+                continue
+            while len(stack) > 1 and level < stack[-1][0]:
+                stack.pop()
+            current = stack[-1]
+            if current[0] is None or level < current[0]:
+                # Only the outermost list gets here with a shallower heading
+                current[0] = level
+            elif level > current[0] and current[1].children:
+                # A deeper heading opens a list inside the previous item
+                nested = ParentNode("ul", [])
+                current[1].children[-1].children.append(nested)
+                current = [level, nested]
+                stack.append(current)
+            current[1].children.append(ParentNode("li", [LeafNode("a", text, {"href": f"#{slug}"})]))
+        if not root.children:
+            return None
+        return ParentNode("nav", [root], {"class": "toc"})
+
+    def to_html(self) -> str:
+        node = self.to_html_node()
+        return node.to_html() if node is not None else ""
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+
+
+class _NullSpan:
+    """Context manager returned by span() while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        self.tracer.add_complete_event(self.name, self.start, end - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """
+    Records build stages as Chrome trace-event "complete" (ph: X) events.
+
+    Events carry the process id and native thread id, so spans recorded in
+    worker threads or processes show up as separate tracks in chrome://tracing
+    or Perfetto. Timestamps come from perf_counter, which is monotonic and
+    shared by every process on the machine, so event lists from several
+    workers can be merged with extend().
+    """
+
+    def __init__(self):
+        self.events = []
+        self.thread_names = {}
+
+    def span(self, name: str, **args) -> _Span:
+        """Return a context manager that records the enclosed block as one event."""
+        return _Span(self, name, args)
+
+    def add_complete_event(self, name: str, start_ns: int, duration_ns: int, args: dict = None):
+        tid = threading.get_native_id()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        event = {
+            "name": name,
+            "cat": "build",
+            "ph": "X",
+            "ts": start_ns / 1000,
+            "dur": duration_ns / 1000,
+            "pid": os.getpid(),
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        # list.append is atomic, so worker threads can record without a lock
+        self.events.append(event)
+
+    def extend(self, events: list[dict]):
+        """Merge events recorded by another tracer (e.g. in a worker process)."""
+        self.events.extend(events)
+
+    def to_json(self) -> dict:
+        pid = os.getpid()
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "static-site build"}},
+        ]
+        for tid, thread_name in self.thread_names.items():
+            metadata.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        return {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str):
+        """Write the trace in Chrome trace-event JSON format."""
+        # Only needed when a trace is written, so keep it off the import path
+        import json
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(), f)
+
+
+_tracer = None
+
+
+def enable() -> Tracer:
+    """Start recording spans for the rest of the process and return the tracer."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable():
+    """Stop recording spans."""
+    global _tracer
+    _tracer = None
+
+
+def get_tracer() -> Tracer | None:
+    return _tracer
+
+
+def span(name: str, **args):
+    """
+    Time the enclosed block as a named build stage.
+
+    While tracing is disabled this returns a shared no-op context manager, so
+    instrumented code pays one global lookup and an empty with-block.
+
+    Args:
+        name: Stage name shown in the trace viewer
+        **args: Extra details attached to the event (e.g. the page path)
+    """
+    if _tracer is None:
+        return NULL_SPAN
+    return _Span(_tracer, name, args)